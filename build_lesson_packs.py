@@ -16,12 +16,14 @@ Output:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
 import re
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 
 from md_library import load_md_clean_text
 from md_chunker import chunk_text
@@ -29,6 +31,10 @@ from md_chunker import chunk_text
 # ── Constante ─────────────────────────────────────────────────────────────────
 
 HEADING_RE = re.compile(r"^\s{0,3}(#{1,6})\s+(.+)$", re.MULTILINE)
+_WS_RE = re.compile(r"\s+")
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+# caractere permise în numele fișierului unui pack (restul se elimină)
+_SAFE_TITLE_RE = re.compile(r"[^a-zA-Z0-9ăâîșțĂÂÎȘȚ _\-]+")
 
 # "tasky" = mai degrabă exercițiu / fișă, nu poveste TTS
 TASK_MARKERS = [
@@ -36,6 +42,9 @@ TASK_MARKERS = [
     "încercuiește", "subliniază", "transcrie", "alcătuiește",
     "desenează", "măsoară", "compară", "alege varianta",
 ]
+# Toți markerii într-o singură trecere. Lookahead-ul (potrivire de lățime
+# zero) găsește și markerii suprapuși, ex. "scrie" din "transcrie".
+_TASK_RE = re.compile("(?=(" + "|".join(map(re.escape, TASK_MARKERS)) + "))")
 
 # FIX 2: titluri de secțiuni care NU sunt lecții reale — le sărim
 SKIP_TITLE_KEYWORDS = frozenset({
@@ -63,6 +72,20 @@ def _is_junk_title(title: str) -> bool:
     return any(kw in low for kw in SKIP_TITLE_KEYWORDS)
 
 
+def _scan_md(root: str | Path) -> Iterator[os.DirEntry]:
+    """Toate fișierele *.md de sub root (recursiv, fără a urma symlink-uri).
+
+    os.scandir întoarce tipul intrării din listarea directorului, deci nu
+    mai e nevoie de câte un stat() per fișier ca la Path.rglob.
+    """
+    with os.scandir(root) as it:
+        for e in it:
+            if e.is_dir(follow_symlinks=False):
+                yield from _scan_md(e.path)
+            elif e.name.endswith(".md") and e.is_file():
+                yield e
+
+
 def guess_subject_from_filename(name: str) -> str:
     """Fallback subiect dacă manual_index.json nu are intrare pentru fișier."""
     low = name.lower()
@@ -107,15 +130,19 @@ def split_into_sections(md_text: str) -> List[Section]:
 
 
 def is_task_heavy(text: str) -> bool:
-    low = text.lower()
-    hits = sum(1 for w in TASK_MARKERS if w in low)
-    return hits >= 3
+    """True dacă în text apar cel puțin 3 markeri distincți din TASK_MARKERS."""
+    found = set()
+    for m in _TASK_RE.finditer(text.lower()):
+        found.add(m.group(1))
+        if len(found) >= 3:
+            return True
+    return False
 
 
 def build_quiz_rule_based(clean_text: str, n: int = 3) -> List[Dict]:
     """Întrebări simple din propoziții: maschează un cuvânt."""
-    s = re.sub(r"\s+", " ", clean_text).strip()
-    sents = re.split(r"(?<=[.!?])\s+", s)
+    s = _WS_RE.sub(" ", clean_text).strip()
+    sents = _SENT_SPLIT_RE.split(s)
     sents = [x.strip() for x in sents if 25 <= len(x.strip()) <= 140]
     if not sents:
         return [{"q": "Spune pe scurt ce ai înțeles din lecție.", "type": "open", "a": "răspuns liber"}]
@@ -147,6 +174,16 @@ def _normalize_llm_exercise(ex: dict) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=8)
+def _full_clean_text(md_file: Path) -> str:
+    """Textul curățat al întregului manual, cu whitespace comprimat.
+
+    Fallback-ul secțiunilor prea scurte din build_lesson_pack; secțiunile unui
+    manual sunt procesate consecutiv, deci fișierul e parsat o singură dată.
+    """
+    return _WS_RE.sub(" ", load_md_clean_text(md_file)).strip()
+
+
 def build_lesson_pack(
     md_file: Path,
     sec: Section,
@@ -158,14 +195,14 @@ def build_lesson_pack(
     """Construiește un lesson pack JSON pentru o secțiune a unui manual."""
     # Curăță textul secțiunii pentru TTS (folosim load_md_clean_text pe fișierul complet,
     # dar chunkuim doar textul secțiunii curente pentru a nu amesteca lecțiile)
-    sec_raw_clean = re.sub(r"\s+", " ", sec.text).strip()
+    sec_raw_clean = _WS_RE.sub(" ", sec.text).strip()
     # Aplică sanitizarea de markdown pe secțiune (rapid, inline)
     from md_library import sanitize_markdown_for_tts
-    sec_clean = re.sub(r"\s+", " ", sanitize_markdown_for_tts(sec_raw_clean)).strip()
+    sec_clean = _WS_RE.sub(" ", sanitize_markdown_for_tts(sec_raw_clean)).strip()
 
     # Dacă secțiunea e prea mică sau sanitizată → fallback la fișierul complet
     if len(sec_clean) < 100:
-        sec_clean = re.sub(r"\s+", " ", load_md_clean_text(md_file)).strip()
+        sec_clean = _full_clean_text(md_file)
 
     chunks = chunk_text(sec_clean, max_chars=900)
     if not chunks:
@@ -254,7 +291,7 @@ def main():
     else:
         print("⚠️  manual_index.json nu a fost găsit — grade va fi null!")
 
-    md_files = sorted(manuals_dir.rglob("*.md"))
+    md_files = sorted(Path(e.path) for e in _scan_md(manuals_dir))
     if not md_files:
         print(f"N-am găsit .md în {manuals_dir}.")
         return
@@ -265,42 +302,50 @@ def main():
     skipped_junk = 0
     grade_resolved = 0
 
-    for md in md_files:
-        # ── FIX 1: grade + subject din index ─────────────────────────────────
-        meta_info = index_lookup.get(md.stem, {})
-        subject = meta_info.get("subject") or guess_subject_from_filename(md.name)
-        grade: Optional[int] = meta_info.get("grade")  # int sau None
-        if grade is not None:
-            grade_resolved += 1
-
-        raw = md.read_text(encoding="utf-8", errors="ignore")
-        sections = split_into_sections(raw)
-
-        # filtrează secțiuni prea scurte (< 200 chars)
-        sections = [s for s in sections if len(s.text.strip()) >= 200]
-
-        # ── FIX 2: filtrează titluri junk (cuprins, prezentare etc.) ─────────
-        valid = [s for s in sections if not _is_junk_title(s.title)]
-        if valid:
-            skipped_junk += len(sections) - len(valid)
-            sections = valid
-
-        # fallback: dacă tot e gol, ia cel puțin prima secțiune
-        if not sections:
-            sections = split_into_sections(raw)[:1]
-
-        for idx, sec in enumerate(sections, 1):
-            pack = build_lesson_pack(md, sec, subject=subject, grade=grade,
-                                     llm_client=llm_client)
-            safe_title = re.sub(
-                r"[^a-zA-Z0-9ăâîșțĂÂÎȘȚ _\-]+", "", sec.title
-            ).strip().replace(" ", "_")
-            out_name = f"{md.stem}__{idx:03d}__{safe_title[:80]}.json"
-            out_path = out_dir / out_name
-            out_path.write_text(
-                json.dumps(pack, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
-            packs.append((out_name, pack))
+    # ── Generare + ZIP într-o singură trecere ────────────────────────────────
+    # Fiecare pack e serializat o dată și scris atât ca fișier, cât și direct
+    # în arhivă — fără a reciti apoi lesson_packs/*.json de pe disc.
+    # compresslevel=1: mult mai rapid decât nivelul implicit (6), iar pe JSON
+    # text arhiva iese doar cu câteva procente mai mare.
+    zip_path = root / "lesson_packs.zip"
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED,
+                         compresslevel=1) as z:
+        for md in md_files:
+            # ── FIX 1: grade + subject din index ─────────────────────────────
+            meta_info = index_lookup.get(md.stem, {})
+            subject = meta_info.get("subject") or guess_subject_from_filename(md.name)
+            grade: Optional[int] = meta_info.get("grade")  # int sau None
+            if grade is not None:
+                grade_resolved += 1
+
+            with open(md, "rb") as f:
+                raw = f.read().decode("utf-8", errors="ignore")
+            sections = split_into_sections(raw)
+
+            # filtrează secțiuni prea scurte (< 200 chars)
+            sections = [s for s in sections if len(s.text.strip()) >= 200]
+
+            # ── FIX 2: filtrează titluri junk (cuprins, prezentare etc.) ─────
+            valid = [s for s in sections if not _is_junk_title(s.title)]
+            if valid:
+                skipped_junk += len(sections) - len(valid)
+                sections = valid
+
+            # fallback: dacă tot e gol, ia cel puțin prima secțiune
+            if not sections:
+                sections = split_into_sections(raw)[:1]
+
+            for idx, sec in enumerate(sections, 1):
+                pack = build_lesson_pack(md, sec, subject=subject, grade=grade,
+                                         llm_client=llm_client)
+                safe_title = _SAFE_TITLE_RE.sub("", sec.title).strip().replace(" ", "_")
+                out_name = f"{md.stem}__{idx:03d}__{safe_title[:80]}.json"
+                # compact (fără indent): fișiere mai mici, serializare și ZIP mai rapide
+                data = json.dumps(pack, ensure_ascii=False,
+                                  separators=(",", ":")).encode("utf-8")
+                (out_dir / out_name).write_bytes(data)
+                z.writestr(f"lesson_packs/{out_name}", data)
+                packs.append((out_name, pack))
 
     # ── Raport ───────────────────────────────────────────────────────────────
     grade_null  = sum(1 for _, p in packs if p["meta"]["grade"] is None)
@@ -312,12 +357,6 @@ def main():
     if args.llm:
         print(f"   Exerciții LLM:             {llm_used}/{len(packs)} pack-uri")
 
-    # ── ZIP ───────────────────────────────────────────────────────────────────
-    zip_path = root / "lesson_packs.zip"
-    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-        for p in sorted(out_dir.glob("*.json")):
-            z.write(p, arcname=f"lesson_packs/{p.name}")
-
     print(f"   Arhivă: {zip_path} ({zip_path.stat().st_size // 1024} KB)")
 
 
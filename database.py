@@ -1,11 +1,26 @@
 from __future__ import annotations
 
 import sqlite3
+import hashlib
 import json
+import queue
 import threading
+import time
+import unicodedata
 from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Iterator
+
+# Cheile histogramei de mastery pe niveluri (index = mastery_level 0-3)
+_LEVEL_KEYS = ("L0", "L1", "L2", "L3")
+
+
+def enunt_hash(enunt: str) -> str:
+    """Amprenta unui enunț pentru deduplicare: NFKC + lowercase + fără
+    spații la capete, apoi md5. "Cât face 2+2? " și "cât face 2+2?" → același hash."""
+    norm = unicodedata.normalize("NFKC", enunt or "").lower().strip()
+    return hashlib.md5(norm.encode("utf-8")).hexdigest()
 
 
 class Database:
@@ -18,16 +33,34 @@ class Database:
         "Educație Civică", "Religie", "Arte Vizuale", "Muzică",
     ]
 
+    # ── Tranzacții de scriere (BEGIN IMMEDIATE + retry) ──
+    BUSY_TIMEOUT_MS = 5000   # plafonul total de așteptare pe lock-ul SQLite
+    WRITE_TX_RETRIES = 5
+    OPTIMIZE_EVERY = 200     # PRAGMA optimize după atâtea scrieri (+ la close)
+    READ_POOL_SIZE = 4       # conexiuni read-only pentru get_* (dashboard, stele)
+    READ_POOL_TIMEOUT = 0.5  # s de așteptare după o conexiune din pool, apoi una temporară
+
     def __init__(self, db_path: str = "production.db"):
         self.db_path = db_path
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode=WAL")
+        # În WAL, NORMAL e sigur la crash (se pierde cel mult ultimul commit la
+        # o cădere de curent) și scutește un fsync la fiecare commit.
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
 
         # ── Threading: lock pentru scrieri concurente ─────────────────────────
         # Protejează față de _generate_exercises_background (thread daemon) care
         # scrie în DB simultan cu thread-ul UI. WAL permite citiri concurente.
         self._write_lock = threading.Lock()
+        self._writes_since_optimize = 0
+
+        # ── Cache get_user_stars: user_id → (versiune, rând) ─────────────────
+        # Versiunea e incrementată de scriitori (award_stars_bulk, update_streak);
+        # citirile repetate din UI nu mai fac SELECT cât timp nu s-a scris nimic.
+        self._stars_cache: dict[int, tuple[int, dict]] = {}
+        self._stars_ver: dict[int, int] = {}
 
         self._init_schema()
         self._seed_demo_data()
@@ -35,6 +68,7 @@ class Database:
         self._ensure_default_skills()
         self._ensure_lesson_numere_0_5()
         self._ensure_grade1_from_manual()
+        self._ro_pool = self._open_read_pool()
         print(f"Database: {db_path}")
 
     @property
@@ -55,6 +89,123 @@ class Database:
         """
         with self._write_lock:
             yield
+            self._note_write()
+
+    def _open_read_pool(self) -> Optional[queue.Queue]:
+        """Deschide READ_POOL_SIZE conexiuni read-only (mode=ro) pe același fișier.
+
+        Cu WAL, cititorii nu așteaptă după scriitor: dashboard-ul (QThread) și
+        refresh-urile de stele merg în paralel cu award_stars / update_user_skills
+        pe conexiunea principală (self._conn, singura care scrie).
+        Pentru ":memory:" nu există fișier partajat → citim tot pe self._conn.
+        """
+        if self.db_path == ":memory:" or self.db_path.startswith("file:"):
+            return None
+        pool: queue.Queue = queue.Queue()
+        try:
+            for _ in range(self.READ_POOL_SIZE):
+                pool.put(self._open_ro())
+        except sqlite3.Error as e:
+            print(f"Database: pool read-only indisponibil ({e}), citiri pe conexiunea principală")
+            while not pool.empty():
+                pool.get_nowait().close()
+            return None
+        return pool
+
+    def _open_ro(self) -> sqlite3.Connection:
+        """O conexiune read-only (mode=ro) nouă pe fișierul bazei."""
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        ro = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        ro.row_factory = sqlite3.Row
+        ro.execute(f"PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}")
+        return ro
+
+    @contextmanager
+    def _read(self):
+        """Împrumută o conexiune read-only din pool pentru un SELECT.
+
+        Dacă pool-ul e gol mai mult de READ_POOL_TIMEOUT secunde (toate
+        conexiunile ținute, de ex. de generatoare iter_* neconsumate sau de
+        un apel imbricat în același thread), nu mai așteptăm: deschidem o
+        conexiune read-only temporară, închisă la final.
+
+        Folosire:
+            with self._read() as conn:
+                rows = conn.execute(sql, params).fetchall()
+        """
+        pool = self._ro_pool
+        if pool is None:
+            yield self._conn
+            return
+        try:
+            ro = pool.get(timeout=self.READ_POOL_TIMEOUT)
+        except queue.Empty:
+            ro = None
+        if ro is None:
+            ro = self._open_ro()
+            try:
+                yield ro
+            finally:
+                ro.close()
+            return
+        try:
+            yield ro
+        finally:
+            if self._ro_pool is pool:
+                pool.put(ro)
+            else:               # close() a golit pool-ul între timp
+                ro.close()
+
+    def _note_write(self):
+        """Numără scrierile și rulează periodic PRAGMA optimize.
+
+        Ține statisticile planner-ului la zi pentru JOIN-urile user_skill/skills
+        și scanările pe progress pe măsură ce tabelele cresc. Se apelează cu
+        _write_lock deja luat.
+        """
+        self._writes_since_optimize += 1
+        if self._writes_since_optimize >= self.OPTIMIZE_EVERY:
+            self._writes_since_optimize = 0
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+
+    @contextmanager
+    def _write_tx(self):
+        """Tranzacție de scriere explicită cu BEGIN IMMEDIATE.
+
+        Lock-ul de scriere SQLite e luat la început (nu la primul UPDATE), deci
+        nu mai apare upgrade-ul SHARED → RESERVED care dă SQLITE_BUSY între mai
+        multe instanțe ale aplicației. Dacă baza e blocată, reîncercăm BEGIN cu
+        backoff exponențial, plafonat la BUSY_TIMEOUT_MS în total.
+
+        Folosire:
+            with self._write_tx():
+                self._conn.execute(sql, params)
+            # COMMIT automat la ieșire, ROLLBACK la excepție
+        """
+        with self._write_lock:
+            if self._conn.in_transaction:
+                self._conn.commit()
+            deadline = time.monotonic() + self.BUSY_TIMEOUT_MS / 1000.0
+            for attempt in range(self.WRITE_TX_RETRIES):
+                try:
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    break
+                except sqlite3.OperationalError as e:
+                    remaining = deadline - time.monotonic()
+                    if ("locked" not in str(e) and "busy" not in str(e)) \
+                            or attempt == self.WRITE_TX_RETRIES - 1 or remaining <= 0:
+                        raise
+                    time.sleep(min(0.02 * 2 ** attempt, remaining))
+            try:
+                yield
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            self._note_write()
 
 
     # ───────────────────────────────────────────────────────────────────
@@ -219,6 +370,11 @@ class Database:
             # ITS v2: tier 4 "Boss Fight" + sursa examen real
             "ALTER TABLE exercises ADD COLUMN difficulty_tier INTEGER DEFAULT 1",
             "ALTER TABLE exercises ADD COLUMN source_exam TEXT",
+            # deduplicare la add_exercises_bulk: md5 peste enunțul normalizat;
+            # rândurile vechi rămân NULL (NULL-urile nu se ciocnesc în UNIQUE)
+            "ALTER TABLE exercises ADD COLUMN enunt_hash TEXT",
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_exercises_enunt_hash "
+            "ON exercises(lesson_id, phase, enunt_hash)",
         ]
         for sql in migrations:
             try:
@@ -1400,6 +1556,39 @@ class Database:
         rows = self._conn.execute(q, params).fetchall()
         return [dict(r) for r in rows]
 
+    def iter_lessons(self, grade: int = None, subject: str = None,
+                     by_subject: bool = False) -> Iterator[dict]:
+        """Ca get_lessons, dar dă rândurile pe rând direct din cursor (fără
+        fetchall): memoria rămâne constantă indiferent câte lecții are baza.
+        by_subject=True ordonează întâi pe materie (loturi pe același manual).
+        """
+        q = "SELECT * FROM lessons WHERE 1=1"
+        params = []
+        if grade is not None:
+            q += " AND grade=?"
+            params.append(int(grade))
+        if subject:
+            q += " AND subject=?"
+            params.append(subject)
+        q += (" ORDER BY subject ASC, grade ASC, unit ASC, order_in_unit ASC, id ASC"
+              if by_subject else
+              " ORDER BY grade ASC, unit ASC, order_in_unit ASC, id ASC")
+        with self._read() as conn:
+            for r in conn.execute(q, params):
+                yield dict(r)
+
+    def count_lessons(self, grade: int = None, subject: str = None) -> int:
+        q = "SELECT COUNT(*) FROM lessons WHERE 1=1"
+        params = []
+        if grade is not None:
+            q += " AND grade=?"
+            params.append(int(grade))
+        if subject:
+            q += " AND subject=?"
+            params.append(subject)
+        with self._read() as conn:
+            return conn.execute(q, params).fetchone()[0]
+
     def get_lesson(self, lesson_id: int) -> Optional[dict]:
         row = self._conn.execute("SELECT * FROM lessons WHERE id=?", (lesson_id,)).fetchone()
         return dict(row) if row else None
@@ -1426,6 +1615,68 @@ class Database:
         )
         return int(cur.lastrowid)
 
+    def add_exercises_bulk(self, rows: Iterable[tuple]) -> int:
+        """Inserează mai multe exerciții într-o singură tranzacție.
+
+        Fiecare rând are ordinea parametrilor din add_exercise:
+        (lesson_id, enunt, raspuns, phase, type, choices, hint1, hint2, hint3,
+        explicatie, dificultate). Un BEGIN IMMEDIATE, un executemany și un
+        singur commit — un fsync per lot, nu per exercițiu.
+
+        Enunțurile care există deja pentru aceeași (lecție, fază) — după
+        enunt_hash, inclusiv rândurile vechi fără hash — sau care se repetă în
+        lot sunt sărite. Returnează numărul de rânduri inserate efectiv.
+        """
+        params = [
+            (
+                int(lid), type_, phase, enunt, raspuns,
+                json.dumps(choices) if choices else None,
+                h1, h2, h3, expl, int(dif or 1), enunt_hash(enunt),
+            )
+            for (lid, enunt, raspuns, phase, type_, choices,
+                 h1, h2, h3, expl, dif) in rows
+        ]
+        if not params:
+            return 0
+        with self._write_tx():
+            return self.insert_new_exercises(self._BULK_EXERCISE_COLUMNS, params)
+
+    _BULK_EXERCISE_COLUMNS = ("lesson_id", "type", "phase", "enunt", "raspuns", "choices",
+                              "hint1", "hint2", "hint3", "explicatie", "dificultate",
+                              "enunt_hash")
+
+    def insert_new_exercises(self, columns: tuple[str, ...], params: list[tuple]) -> int:
+        """Inserează în exercises doar rândurile cu enunț nou pentru (lecție, fază).
+
+        NU deschide și nu închide tranzacția: se apelează dintr-o tranzacție
+        deja deschisă (add_exercises_bulk, importurile din scripturi).
+        `columns` numește coloanele din `params` și trebuie să conțină
+        lesson_id, phase și enunt_hash. Dedup-ul citește enunțurile existente
+        (o interogare per (lecție, fază)) și acoperă și rândurile vechi cu
+        enunt_hash NULL, pe care indexul unic nu le prinde. Returnează
+        numărul de rânduri inserate.
+        """
+        i_lid, i_phase, i_hash = (columns.index(c) for c in ("lesson_id", "phase", "enunt_hash"))
+        seen: set[tuple[int, str, str]] = set()
+        for lid, phase in {(p[i_lid], p[i_phase]) for p in params}:
+            for h, enunt in self._conn.execute(
+                    "SELECT enunt_hash, enunt FROM exercises WHERE lesson_id=? AND phase=?",
+                    (lid, phase)):
+                seen.add((lid, phase, h or enunt_hash(enunt)))
+        fresh = []
+        for p in params:
+            key = (p[i_lid], p[i_phase], p[i_hash])
+            if key not in seen:
+                seen.add(key)
+                fresh.append(p)
+        if fresh:
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO exercises ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})",
+                fresh,
+            )
+        return len(fresh)
+
     # Coduri-răspuns din import defectuos (single-char, truncate, coduri textbook)
     _BAD_RASPUNS = frozenset({
         "w", "m", "t", "f", "a", "b", "c", "d",   # single-letter codes
@@ -1480,6 +1731,88 @@ class Database:
             out.append(d)
         return out
 
+    def get_exercise_counts_by_phase(self, lesson_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+        """Numărul de exerciții utilizabile per lecție și fază: {lesson_id: {phase: n}}.
+
+        Un singur GROUP BY (pe loturi de 900 id-uri, sub limita de parametri
+        SQLite) în loc de get_exercises × faze doar ca să numărăm. Răspunsurile
+        goale și codurile din _BAD_RASPUNS nu se numără, ca în get_exercises.
+        Lecțiile fără niciun exercițiu apar cu dict gol.
+        """
+        ids = [int(i) for i in lesson_ids]
+        out: dict[int, dict[str, int]] = {i: {} for i in ids}
+        bad = sorted(self._BAD_RASPUNS)
+        with self._read() as conn:
+            for start in range(0, len(ids), 900):
+                chunk = ids[start:start + 900]
+                rows = conn.execute(
+                    f"""SELECT lesson_id, phase, COUNT(*) FROM exercises
+                        WHERE lesson_id IN ({",".join("?" * len(chunk))})
+                          AND TRIM(COALESCE(raspuns, '')) <> ''
+                          AND TRIM(raspuns) NOT IN ({",".join("?" * len(bad))})
+                        GROUP BY lesson_id, phase""",
+                    (*chunk, *bad),
+                ).fetchall()
+                for lid, phase, n in rows:
+                    out[lid][phase] = n
+        return out
+
+    def iter_sparse_phases(self, target_map: dict[str, int], grade: int = None,
+                           subject: str = None, by_subject: bool = False
+                           ) -> Iterator[tuple[dict, dict[str, int]]]:
+        """Lecțiile care au cel puțin o fază sub țintă, într-un singur SELECT.
+
+        target_map: {phase: câte exerciții trebuie să aibă}. Dă perechi
+        (lecție, {phase: câte are}) în ordinea din iter_lessons, cu numărul
+        pentru TOATE fazele din target_map (și cele deja complete). Lecțiile
+        complete nu ies deloc din SQLite, iar restul vin pe rând din cursor.
+        Numărătoarea e cea din get_exercise_counts_by_phase (fără răspunsuri
+        goale / _BAD_RASPUNS).
+        """
+        if not target_map:
+            return
+        bad = sorted(self._BAD_RASPUNS)
+        where, params = "", []
+        if grade is not None:
+            where += " AND l.grade=?"
+            params.append(int(grade))
+        if subject:
+            where += " AND l.subject=?"
+            params.append(subject)
+        q = f"""
+            WITH ph(phase, target) AS (VALUES {",".join(["(?,?)"] * len(target_map))}),
+            cnt AS (
+                SELECT lesson_id, phase, COUNT(*) AS n FROM exercises
+                WHERE TRIM(COALESCE(raspuns, '')) <> ''
+                  AND TRIM(raspuns) NOT IN ({",".join("?" * len(bad))})
+                GROUP BY lesson_id, phase
+            ),
+            grid AS (
+                SELECT l.id AS lesson_id, ph.phase, ph.target,
+                       COALESCE(c.n, 0) AS have
+                FROM lessons l CROSS JOIN ph
+                LEFT JOIN cnt c ON c.lesson_id = l.id AND c.phase = ph.phase
+                WHERE 1=1{where}
+            )
+            SELECT l.*, g.phase AS _phase, g.have AS _have
+            FROM grid g JOIN lessons l ON l.id = g.lesson_id
+            WHERE g.lesson_id IN (SELECT lesson_id FROM grid WHERE have < target)
+            ORDER BY {"l.subject ASC, " if by_subject else ""}l.grade ASC,
+                     l.unit ASC, l.order_in_unit ASC, l.id ASC"""
+        args = [x for item in target_map.items() for x in item] + bad + params
+        cur: Optional[tuple[dict, dict[str, int]]] = None
+        with self._read() as conn:
+            for r in conn.execute(q, args):
+                d = dict(r)
+                phase, have = d.pop("_phase"), d.pop("_have")
+                if cur is None or cur[0]["id"] != d["id"]:
+                    if cur is not None:
+                        yield cur
+                    cur = (d, {})
+                cur[1][phase] = have
+        if cur is not None:
+            yield cur
+
     # ── Error bank / Spaced repetition ───────────────────────────────────────
 
     def mark_exercise_wrong(self, user_id: int, exercise_id: int) -> None:
@@ -1863,43 +2196,69 @@ class Database:
             "strong_skills": [ ... ],
           }
         """
-        rows = self._conn.execute(
-            """SELECT us.skill_code, us.mastery, us.mastery_level,
-                      s.name, s.subject, s.grade
-               FROM user_skill us JOIN skills s ON s.code=us.skill_code
-               WHERE us.user_id=?
-               ORDER BY s.grade ASC, us.mastery ASC""",
-            (int(user_id),)
-        ).fetchall()
+        uid = int(user_id)
 
-        by_grade: dict[int, dict] = {}
-        weak: list[dict] = []
-        strong: list[dict] = []
-
-        for row in rows:
-            g = int(row["grade"] or 1)
-            lvl = int(row["mastery_level"] or 0)
-            if g not in by_grade:
-                by_grade[g] = {"L0": 0, "L1": 0, "L2": 0, "L3": 0}
-            by_grade[g][f"L{lvl}"] += 1
-
-            d = {
-                "code":          row["skill_code"],
-                "name":          row["name"],
-                "mastery_level": lvl,
-                "mastery":       float(row["mastery"] or 0.0),
-                "subject":       row["subject"],
-                "grade":         g,
-            }
-            if lvl == 0 or float(row["mastery"] or 0) < 0.60:
-                weak.append(d)
-            elif lvl >= 2:
-                strong.append(d)
+        with self._read() as conn:
+            # Histograma pe niveluri vine direct dintr-un GROUP BY (nu din rânduri).
+            by_grade: dict[int, dict] = {}
+            for g, lvl, n in conn.execute(
+                """SELECT CAST(COALESCE(NULLIF(s.grade, 0), 1) AS INTEGER) AS g,
+                          CAST(COALESCE(us.mastery_level, 0) AS INTEGER) AS lvl,
+                          COUNT(*)
+                   FROM user_skill us JOIN skills s ON s.code=us.skill_code
+                   WHERE us.user_id=?
+                   GROUP BY g, lvl
+                   ORDER BY g ASC""",
+                (uid,)
+            ):
+                if g not in by_grade:
+                    by_grade[g] = {"L0": 0, "L1": 0, "L2": 0, "L3": 0}
+                by_grade[g][_LEVEL_KEYS[lvl]] += n
+
+            # Coerciile (NULL → 0, tip numeric) se fac în SQL, nu per rând în Python.
+            # Cursorul e parcurs o singură dată, fără fetchall: păstrăm doar primele
+            # 10 skill-uri slabe / puternice și ne oprim când ambele liste sunt pline.
+            cur = conn.execute(
+                """SELECT us.skill_code,
+                          CAST(COALESCE(us.mastery, 0.0) AS REAL)      AS mastery,
+                          CAST(COALESCE(us.mastery_level, 0) AS INTEGER) AS mastery_level,
+                          s.name, s.subject,
+                          CAST(COALESCE(NULLIF(s.grade, 0), 1) AS INTEGER) AS grade
+                   FROM user_skill us JOIN skills s ON s.code=us.skill_code
+                   WHERE us.user_id=?
+                   ORDER BY s.grade ASC, us.mastery ASC""",
+                (uid,)
+            )
+
+            weak: list[dict] = []
+            strong: list[dict] = []
+
+            for row in cur:
+                lvl = row["mastery_level"]
+                mastery = row["mastery"]
+                if lvl == 0 or mastery < 0.60:
+                    bucket = weak
+                elif lvl >= 2:
+                    bucket = strong
+                else:
+                    continue
+                if len(bucket) < 10:
+                    bucket.append({
+                        "code":          row["skill_code"],
+                        "name":          row["name"],
+                        "mastery_level": lvl,
+                        "mastery":       mastery,
+                        "subject":       row["subject"],
+                        "grade":         row["grade"],
+                    })
+                elif len(weak) >= 10 and len(strong) >= 10:
+                    break
+            cur.close()
 
         return {
             "by_grade":     by_grade,
-            "weak_skills":  weak[:10],
-            "strong_skills": strong[:10],
+            "weak_skills":  weak,
+            "strong_skills": strong,
         }
 
     # ───────────────────────────────────────────────────────────────────
@@ -1908,46 +2267,49 @@ class Database:
 
     @staticmethod
     def score_to_stars(score: float) -> int:
-        """Converteste scorul (0..1) in 1-3 stele."""
-        if score >= 0.9:
-            return 3
-        if score >= 0.7:
-            return 2
-        if score >= 0.5:
-            return 1
-        return 0
+        """Converteste scorul (0..1) in 1-3 stele (praguri 0.5 / 0.7 / 0.9)."""
+        return (score >= 0.5) + (score >= 0.7) + (score >= 0.9)
 
     def award_stars(self, user_id: int, lesson_id: int, score: float) -> int:
         """
         Calculeaza stelee pentru aceasta sesiune si actualizeaza progresul.
         Returneaza numarul de stele acordate (0-3).
         """
-        stars = self.score_to_stars(score)
-        if stars == 0:
-            return 0
-        # Stele in progress (pastram max)
-        row = self._conn.execute(
-            "SELECT stars FROM progress WHERE user_id=? AND lesson_id=?",
-            (int(user_id), int(lesson_id))
-        ).fetchone()
-        if row is None:
-            return stars  # update_progress inca nu a rulat
-        old_stars = int(row["stars"] or 0)
-        new_stars = max(old_stars, stars)
-        self._conn.execute(
-            "UPDATE progress SET stars=? WHERE user_id=? AND lesson_id=?",
-            (new_stars, int(user_id), int(lesson_id))
-        )
-        # Totalul de stele al userului (recalculeaza din progress)
-        total = self._conn.execute(
-            "SELECT SUM(stars) FROM progress WHERE user_id=?",
-            (int(user_id),)
-        ).fetchone()[0] or 0
-        self._conn.execute(
-            "UPDATE users SET total_stars=? WHERE id=?",
-            (int(total), int(user_id))
-        )
-        self._conn.commit()
+        return self.award_stars_bulk(user_id, [(lesson_id, score)])[0]
+
+    def award_stars_bulk(self, user_id: int,
+                         results: Iterable[tuple[int, float]]) -> list[int]:
+        """
+        Acorda stele pentru mai multe (lesson_id, score) intr-o singura tranzactie.
+
+        Un singur BEGIN IMMEDIATE, un executemany pe progress (pastram max),
+        un UPDATE agregat pe users si un singur commit — deci un singur fsync
+        la finalul lectiei, indiferent cate scoruri se inregistreaza.
+        Returneaza stelele acordate pentru fiecare intrare, in ordine.
+        """
+        uid = int(user_id)
+        results = [(int(lid), float(score)) for lid, score in results]
+        stars = [self.score_to_stars(score) for _, score in results]
+        rows = [(s, uid, lid) for (lid, _), s in zip(results, stars) if s > 0]
+        if not rows:
+            return stars
+
+        with self._write_tx():
+            # Stele in progress (pastram max); randurile lipsa = update_progress
+            # inca nu a rulat, deci UPDATE-ul nu le atinge.
+            self._conn.executemany(
+                "UPDATE progress SET stars=MAX(COALESCE(stars, 0), ?) "
+                "WHERE user_id=? AND lesson_id=?",
+                rows,
+            )
+            # Totalul de stele al userului (recalculeaza din progress)
+            self._conn.execute(
+                "UPDATE users SET total_stars="
+                "(SELECT COALESCE(SUM(stars), 0) FROM progress WHERE user_id=?) "
+                "WHERE id=?",
+                (uid, uid),
+            )
+        self._bump_stars_version(uid)
         return stars
 
     def update_streak(self, user_id: int) -> int:
@@ -1956,43 +2318,57 @@ class Database:
         Returneaza streak-ul curent (numarul de zile consecutive).
         """
         today = datetime.now().strftime("%Y-%m-%d")
-        row = self._conn.execute(
-            "SELECT streak_days, streak_last_date FROM users WHERE id=?",
-            (int(user_id),)
-        ).fetchone()
-        if row is None:
-            return 0
-        streak = int(row["streak_days"] or 0)
-        last_date = row["streak_last_date"] or ""
-        if last_date == today:
-            return streak  # deja actualizat azi
-        # Verifica daca este ziua de dupa
-        from datetime import timedelta
-        yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-        if last_date == yesterday:
-            streak += 1
-        else:
-            streak = 1  # reset streak
-        self._conn.execute(
-            "UPDATE users SET streak_days=?, streak_last_date=? WHERE id=?",
-            (streak, today, int(user_id))
-        )
-        self._conn.commit()
+        # Citirea si scrierea in aceeasi tranzactie IMMEDIATE: doua instante
+        # nu pot incrementa streak-ul de doua ori in aceeasi zi.
+        with self._write_tx():
+            row = self._conn.execute(
+                "SELECT streak_days, streak_last_date FROM users WHERE id=?",
+                (int(user_id),)
+            ).fetchone()
+            if row is None:
+                return 0
+            streak = int(row["streak_days"] or 0)
+            last_date = row["streak_last_date"] or ""
+            if last_date == today:
+                return streak  # deja actualizat azi
+            # Verifica daca este ziua de dupa
+            yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+            if last_date == yesterday:
+                streak += 1
+            else:
+                streak = 1  # reset streak
+            self._conn.execute(
+                "UPDATE users SET streak_days=?, streak_last_date=? WHERE id=?",
+                (streak, today, int(user_id))
+            )
+        self._bump_stars_version(int(user_id))
         return streak
 
+    def _bump_stars_version(self, user_id: int):
+        """Invalidează intrarea din cache-ul get_user_stars pentru acest user."""
+        self._stars_ver[user_id] = self._stars_ver.get(user_id, 0) + 1
+
     def get_user_stars(self, user_id: int) -> dict:
         """Returneaza totalul de stele si streak-ul pentru un user."""
-        row = self._conn.execute(
-            "SELECT total_stars, streak_days, streak_last_date FROM users WHERE id=?",
-            (int(user_id),)
-        ).fetchone()
+        uid = int(user_id)
+        ver = self._stars_ver.get(uid, 0)
+        cached = self._stars_cache.get(uid)
+        if cached is not None and cached[0] == ver:
+            return dict(cached[1])
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT total_stars, streak_days, streak_last_date FROM users WHERE id=?",
+                (uid,)
+            ).fetchone()
         if row is None:
             return {"total_stars": 0, "streak_days": 0}
-        return {
+        result = {
             "total_stars": int(row["total_stars"] or 0),
             "streak_days": int(row["streak_days"] or 0),
             "streak_last_date": row["streak_last_date"] or "",
         }
+        self._stars_cache[uid] = (ver, result)
+        return dict(result)
 
     def get_dashboard_data(self, user_id: int) -> dict:
         """
@@ -2000,24 +2376,25 @@ class Database:
         Apelat din _DashWorker (QThread) pentru a nu bloca thread-ul principal Qt.
         """
         uid = int(user_id)
-        sessions = self._conn.execute(
-            "SELECT s.score, s.duration_s, s.started_at, s.lesson_id, l.subject "
-            "FROM sessions s JOIN lessons l ON l.id = s.lesson_id "
-            "WHERE s.user_id = ? ORDER BY s.started_at",
-            (uid,)
-        ).fetchall()
-        progress = self._conn.execute(
-            "SELECT p.lesson_id, p.best_score, p.passed, l.subject "
-            "FROM progress p JOIN lessons l ON l.id = p.lesson_id "
-            "WHERE p.user_id = ?",
-            (uid,)
-        ).fetchall()
-        skills = self._conn.execute(
-            "SELECT us.skill_code, us.mastery, us.avg_time, us.skill_streak, s.name "
-            "FROM user_skill us LEFT JOIN skills s ON s.code = us.skill_code "
-            "WHERE us.user_id = ? ORDER BY us.mastery DESC",
-            (uid,)
-        ).fetchall()
+        with self._read() as conn:
+            sessions = conn.execute(
+                "SELECT s.score, s.duration_s, s.started_at, s.lesson_id, l.subject "
+                "FROM sessions s JOIN lessons l ON l.id = s.lesson_id "
+                "WHERE s.user_id = ? ORDER BY s.started_at",
+                (uid,)
+            ).fetchall()
+            progress = conn.execute(
+                "SELECT p.lesson_id, p.best_score, p.passed, l.subject "
+                "FROM progress p JOIN lessons l ON l.id = p.lesson_id "
+                "WHERE p.user_id = ?",
+                (uid,)
+            ).fetchall()
+            skills = conn.execute(
+                "SELECT us.skill_code, us.mastery, us.avg_time, us.skill_streak, s.name "
+                "FROM user_skill us LEFT JOIN skills s ON s.code = us.skill_code "
+                "WHERE us.user_id = ? ORDER BY us.mastery DESC",
+                (uid,)
+            ).fetchall()
         return {
             "sessions": [dict(r) for r in sessions],
             "progress": [dict(r) for r in progress],
@@ -2117,7 +2494,16 @@ class Database:
         self._conn.commit()
 
     def close(self):
+        pool, self._ro_pool = self._ro_pool, None
+        while pool is not None and not pool.empty():
+            try:
+                pool.get_nowait().close()
+            except Exception:
+                pass
         try:
+            # Re-planifică statisticile învechite: următoarea pornire are deja
+            # planuri de interogare corecte pentru tabelele care au crescut.
+            self._conn.execute("PRAGMA optimize")
             self._conn.commit()
             self._conn.close()
         except Exception:
@@ -12,14 +12,381 @@ Necesită: pip install requests
           Model: ollama pull deepseek-r1:7b
 """
 
+import asyncio
+import concurrent.futures
+import functools
+import hashlib
 import json
+import math
 import re
+import sqlite3
 import time
 import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
 from typing import Optional, Callable, Generator
 
-# Elimină blocurile <think>...</think> pe care deepseek-r1 le adaugă uneori
-_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None       # type: ignore[assignment]
+    HTTPAdapter = None    # type: ignore[assignment]
+
+# orjson (opțional): parsare NDJSON în C, direct din bytes
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# aiohttp e opțional (requirements-optional.txt) — doar pentru aask_many
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None        # type: ignore[assignment]
+
+# Elimină blocurile <think>...</think> pe care deepseek-r1 le adaugă uneori.
+# Corpul e limitat la 8000 caractere: un <think> neînchis nu mai scanează până la EOF.
+_THINK_RE = re.compile(r"<think>[\s\S]{0,8000}?</think>", re.IGNORECASE)
+
+# JSON-ul de exerciții: întâi dintr-un bloc ```json ... ```, altfel primul array de obiecte
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\[.*\])\s*```", re.DOTALL)
+_JSON_ARRAY_RE = re.compile(r"(\[\s*\{.*\}\s*\])", re.DOTALL)
+
+_NORM_WS_RE = re.compile(r"\s+")
+
+
+def _normalize(s: str) -> str:
+    """Formă canonică pentru cheile de cache: fără diacritice, lowercase,
+    spații comprimate. " Adunarea  " și "adunarea" → aceeași cheie.
+
+    Restul caracterelor rămân neatinse: operatorii, semnele și cifrele
+    ("7+2" vs "7-2", "x²" vs "x2") schimbă răspunsul, deci și cheia.
+    NFD (nu NFKD) separă doar diacriticele, fără descompuneri de compatibilitate.
+    """
+    s = unicodedata.normalize("NFD", s)
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    return _NORM_WS_RE.sub(" ", s).strip()
+
+
+def _iter_ndjson(resp, chunk_size: int = 8192):
+    """
+    Parcurge un răspuns Ollama în streaming (un obiect JSON pe linie).
+
+    Citește cu raw.read1() (urllib3 ≥ 2: întoarce ce e deja sosit, fără să
+    aștepte chunk_size octeți), taie liniile direct în bytearray și le dă la
+    _loads — fără decodare UTF-8 per linie în Python. Liniile invalide sunt
+    sărite. Cu urllib3 vechi (fără read1) cade pe iter_lines().
+    """
+    read1 = getattr(resp.raw, "read1", None)
+    if read1 is None:
+        for line in resp.iter_lines(chunk_size=chunk_size, decode_unicode=False):
+            if line:
+                try:
+                    yield _loads(line)
+                except ValueError:
+                    pass
+        return
+
+    buf = bytearray()
+    while True:
+        chunk = read1(chunk_size, decode_content=True)
+        if not chunk:
+            break
+        buf += chunk
+        start = 0
+        while (idx := buf.find(b"\n", start)) != -1:
+            line = buf[start:idx]
+            start = idx + 1
+            if line.strip():
+                try:
+                    yield _loads(bytes(line))
+                except ValueError:
+                    pass
+        del buf[:start]
+    if buf.strip():
+        try:
+            yield _loads(bytes(buf))
+        except ValueError:
+            pass
+
+
+class _ArrayItemScanner:
+    """
+    Scanare incrementală a unui JSON care sosește pe bucăți (streaming Ollama).
+
+    feed() întoarce textul fiecărui obiect aflat DIRECT într-un array, imediat
+    ce acolada lui se închide — [{...}, {...}] sau {"x": [{...}]} — fără să
+    aștepte restul răspunsului. Ține cont de stringuri și escape-uri, deci
+    acoladele din enunțuri nu încurcă numărătoarea.
+    """
+
+    __slots__ = ("_stack", "_in_str", "_esc", "_depth", "_parts")
+
+    def __init__(self):
+        self._stack: list[str] = []     # containerele deschise: "[" / "{"
+        self._in_str = False
+        self._esc = False
+        self._depth: Optional[int] = None   # adâncimea elementului în curs
+        self._parts: list[str] = []         # bucățile lui din feed-uri anterioare
+
+    def feed(self, text: str) -> list[str]:
+        out: list[str] = []
+        stack = self._stack
+        seg = 0 if self._depth is not None else -1
+        for i, ch in enumerate(text):
+            if self._in_str:
+                if self._esc:
+                    self._esc = False
+                elif ch == "\\":
+                    self._esc = True
+                elif ch == '"':
+                    self._in_str = False
+            elif ch == '"':
+                self._in_str = True
+            elif ch == "{" or ch == "[":
+                if ch == "{" and self._depth is None and stack and stack[-1] == "[":
+                    self._depth = len(stack)
+                    seg = i
+                stack.append(ch)
+            elif ch == "}" or ch == "]":
+                if stack:
+                    stack.pop()
+                if self._depth is not None and len(stack) == self._depth:
+                    self._parts.append(text[seg:i + 1])
+                    out.append("".join(self._parts))
+                    self._parts.clear()
+                    self._depth = None
+                    seg = -1
+        if self._depth is not None:
+            self._parts.append(text[seg:])
+        return out
+
+
+# ─── System prompts ──────────────────────────────────────────────────────────
+# Partea fixă e constantă la nivel de modul și vine PRIMA; ce variază (clasa,
+# contextul) se adaugă la final. Ollama refolosește KV-cache-ul pentru prefixul
+# identic byte cu byte, deci prefill-ul se face o singură dată pe tip de apel.
+
+_SYS_CHECK_ANSWER = (
+    "Ești profesor blând pentru copii din România.\n"
+    "Verifică dacă răspunsul elevului este corect sau echivalent cu cel așteptat.\n"
+    "Răspunde EXACT în formatul:\n"
+    "  CORECT | <feedback scurt, max 1-2 propoziții, încurajator>\n"
+    "sau:\n"
+    "  GRESIT | <ce era greșit și care este răspunsul corect>\n"
+    "NU adăuga alt text în afara acestui format.\n"
+)
+
+_SYS_EXERCISES = (
+    "Ești expert în pedagogie pentru copii din România.\n"
+    "Generezi exerciții clare, potrivite vârstei, în limba română.\n"
+    "RĂSPUNZI DOAR CU JSON VALID, fără explicații sau text suplimentar.\n"
+)
+
+_PHASE_DIFFICULTY = {
+    "pretest": "ușoare (dificultate 1-2), să testăm cunoștințe anterioare",
+    "practice": "progresive (dificultate 1-3), pentru exersare",
+    "posttest": "moderate (dificultate 2-3), să testăm ce s-a învățat"
+}
+
+_SYS_EXPLAIN = (
+    "Ești un profesor prietenos și răbdător pentru copii din România.\n"
+    "Explici conceptele simplu, cu exemple din viața de zi cu zi, cu entuziasm.\n"
+    "Ești scurt (max 3-4 propoziții) și folosești cuvinte simple.\n"
+    "Uneori folosești emoji pentru a fi mai prietenos.\n"
+)
+
+_SYS_MOTIVATION = (
+    "Ești un mentor pozitiv pentru copii. "
+    "Răspunzi în 1-2 propoziții, entuziast și încurajator."
+)
+
+_SYS_FREE_QUESTION = (
+    "Ești un profesor virtual pentru un copil din România.\n"
+    "Ești prietenos, răbdător și explici simplu.\n"
+    "Răspunde scurt (3-5 propoziții max), în română, simplu.\n"
+)
+
+
+# Numerale românești (fără diacritice, după _norm_answer) pentru check_answer
+_RO_NUMBERS = {
+    "zero": 0, "unu": 1, "una": 1, "doi": 2, "doua": 2, "trei": 3,
+    "patru": 4, "cinci": 5, "sase": 6, "sapte": 7, "opt": 8,
+    "noua": 9, "zece": 10,
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _content_hash(text: str) -> str:
+    """Hash scurt (8 hex) al textului lecției, pentru cheile de cache ale exercițiilor."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=4).hexdigest()
+
+
+def _norm_answer(s: str) -> str:
+    """Forma de comparație pentru răspunsuri scurte: fără diacritice, lowercase,
+    spații comprimate, fără punctuația de final (" Capitala." → "capitala")."""
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    return _NORM_WS_RE.sub(" ", s).strip(" .!?")
+
+
+def _as_number(s: str) -> Optional[float]:
+    """"7" / "7,0" / "sapte" → 7.0; altfel None. Primește text deja normalizat.
+
+    "nan", "inf" și alte valori nefinite nu sunt răspunsuri numerice → None.
+    """
+    if s in _RO_NUMBERS:
+        return float(_RO_NUMBERS[s])
+    try:
+        x = float(s.replace(",", "."))
+    except ValueError:
+        return None
+    return x if math.isfinite(x) else None
+
+
+def _same_number(a: float, b: float) -> bool:
+    """Egalitate de răspunsuri numerice: exactă pentru întregi (1001 ≠ 1000),
+    cu o toleranță absolută mică doar dacă vreo valoare are zecimale."""
+    if a.is_integer() and b.is_integer():
+        return a == b
+    return math.isclose(a, b, rel_tol=0.0, abs_tol=1e-6)
+
+
+# ─── Cache în memorie (L1) ───────────────────────────────────────────────────
+
+class _BoundedCache:
+    """
+    LRU în memorie cu plafon pe număr de intrări și pe dimensiune (octeți UTF-8).
+    Un răspuns cu exerciții are 4-8 KB; fără evicție, o sesiune lungă crește
+    nelimitat. Stă în fața cache-ului SQLite (L2).
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_items: int = 2048):
+        self.max_bytes = max_bytes
+        self.max_items = max_items
+        self.total_bytes = 0
+        self._data: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            self._data.move_to_end(key)
+            return item[0]
+
+    def set(self, key: str, value: str):
+        size = len(key.encode("utf-8")) + len(value.encode("utf-8"))
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._data[key] = (value, size)
+            self.total_bytes += size
+            while self._data and (self.total_bytes > self.max_bytes
+                                  or len(self._data) > self.max_items):
+                _, (_, evicted) = self._data.popitem(last=False)
+                self.total_bytes -= evicted
+
+    def discard_prefix(self, prefix: str = None):
+        """Șterge cheile cu prefixul dat (None = tot)."""
+        with self._lock:
+            if prefix is None:
+                self._data.clear()
+                self.total_bytes = 0
+                return
+            for k in [k for k in self._data if k.startswith(prefix)]:
+                self.total_bytes -= self._data.pop(k)[1]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ─── Cache persistent ────────────────────────────────────────────────────────
+
+class _PromptCache:
+    """
+    Cache persistent (SQLite) pentru răspunsurile modelului.
+
+    Supraviețuiește restartului: o lecție / fază / conținut identic nu mai
+    consumă tokeni la repornire. Intrările expiră după `ttl` secunde și sunt
+    etichetate cu `cfg_ver` — invalidate() fără prefix crește versiunea și
+    toate răspunsurile vechi devin invizibile.
+    """
+
+    def __init__(self, path, ttl: float, cfg_ver: int = 1):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error as e:
+            print(f"⚠️  DeepSeek: cache persistent indisponibil ({e}), folosesc memoria")
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key     TEXT PRIMARY KEY,
+                value   BLOB,
+                created REAL,
+                model   TEXT,
+                cfg_ver INT
+            );
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                id      INTEGER PRIMARY KEY CHECK (id = 1),
+                cfg_ver INT NOT NULL
+            );
+        """)
+        row = self._conn.execute("SELECT cfg_ver FROM cache_meta WHERE id=1").fetchone()
+        self.cfg_ver = max(cfg_ver, row[0] if row else 0)
+        self._conn.execute("INSERT OR REPLACE INTO cache_meta (id, cfg_ver) VALUES (1, ?)",
+                           (self.cfg_ver,))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key=? AND cfg_ver=? AND (? - created) < ?",
+                (key, self.cfg_ver, time.time(), self.ttl),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, model: str = ""):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, model, cfg_ver) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, time.time(), model, self.cfg_ver),
+            )
+            self._conn.commit()
+
+    def invalidate(self, prefix: str = None):
+        """Fără prefix: crește cfg_ver (invalidează tot). Cu prefix: șterge cheile."""
+        with self._lock:
+            if prefix is None:
+                self.cfg_ver += 1
+                self._conn.execute("UPDATE cache_meta SET cfg_ver=? WHERE id=1",
+                                   (self.cfg_ver,))
+                self._conn.execute("DELETE FROM cache WHERE cfg_ver < ?", (self.cfg_ver,))
+            else:
+                self._conn.execute("DELETE FROM cache WHERE substr(key, 1, ?) = ?",
+                                   (len(prefix), prefix))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE cfg_ver=?", (self.cfg_ver,)
+            ).fetchone()[0]
 
 
 # ─── Client principal ────────────────────────────────────────────────────────
@@ -54,75 +421,243 @@ class DeepSeekClient:
     OLLAMA_URL = "http://localhost:11434"
     TIMEOUT_QUICK = 15  # Secunde pentru răspuns scurt
     TIMEOUT_LONG  = 60  # Secunde pentru generare exerciții
-
-    def __init__(self, model: str = None, url: str = None):
+    CACHE_PATH = Path(__file__).parent / "deepseek_cache.db"
+    CACHE_TTL = 30 * 24 * 3600   # 30 de zile
+    CACHE_CONFIG_VERSION = 1     # crește-l ca să invalidezi toate răspunsurile
+    STREAM_FLUSH_CHARS = 16      # ask_stream: caractere acumulate per callback
+    AVAILABLE_TTL_OK = 60        # secunde până la re-verificare când Ollama răspunde
+    AVAILABLE_TTL_DOWN = 10      # ... și când nu răspunde
+    MAX_TOKENS = 1024            # num_predict implicit pentru ask / ask_collect
+    THINK_TOKEN_RESERVE = 512    # modele de raționament (r1): tokeni pentru <think>
+    KEEP_ALIVE = "10m"           # modelul rămâne încărcat între apeluri (fără reload)
+    HTTP_POOL_SIZE = 16          # conexiuni keep-alive păstrate (≥ workerii concurenți)
+
+    def __init__(self, model: str = None, url: str = None,
+                 cache_path: str = None):
         self.model = model or self.MODEL
         self.url = (url or self.OLLAMA_URL).rstrip("/")
-        self._available = None  # Lazy check
+        # Disponibilitate re-verificată periodic (nu o singură dată la pornire)
+        self._available_until: float = 0.0     # time.monotonic() până la re-probe
+        self._available_cached: bool = False
+        self._available_report: Optional[tuple] = None   # ultima stare afișată
+        self._probe_lock = threading.Lock()
+        self._probing = False                   # re-verificare în fundal în curs
         self._call_count = 0
         self._total_tokens = 0
 
+        # Opțiuni de generare, construite o singură dată (nu la fiecare apel)
+        self._base_opts = {"temperature": 0.7, "top_p": 0.9, "num_predict": self.MAX_TOKENS}
+        self._base_opts_short = self._base_opts | {"num_predict": 512}
+
         # Circuit breaker: pauză după timeout-uri consecutive
         self._consecutive_timeouts = 0
-        self._cooldown_until: float = 0.0   # timestamp până când nu mai încercăm
-
-        # Cache simplu în memorie
-        self._cache: dict[str, str] = {}
+        self._cooldown_until: float = 0.0   # time.monotonic() până când nu mai încercăm
+        # Setat = breaker închis (se poate apela). Thread-urile care așteaptă
+        # cooldown-ul fac _breaker_closed.wait() și pornesc imediat la reset.
+        self._breaker_closed = threading.Event()
+        self._breaker_closed.set()
+        self._breaker_lock = threading.Lock()
+        self._breaker_timer: Optional[threading.Timer] = None
+
+        # Exerciții per apel pentru generarea în loturi (AIMD: +1 la succes,
+        # /2 la eșec); persistă între lecții — vezi generate_exercises_batch.py
+        self._adaptive_batch = 3
+
+        # Cache pe două niveluri: LRU în memorie (L1) + SQLite persistent (L2);
+        # cheia include modelul
+        self._mem_cache = _BoundedCache()
+        self._cache = _PromptCache(cache_path or self.CACHE_PATH,
+                                   ttl=self.CACHE_TTL,
+                                   cfg_ver=self.CACHE_CONFIG_VERSION)
         self.USE_CACHE = True
 
+        # Pool mic de thread-uri pentru ask_stream (nu un thread nou per apel).
+        # Workerii nu sunt daemon: close() oprește stream-urile în curs
+        # (_closing), altfel ieșirea din aplicație ar aștepta generarea.
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="deepseek")
+        self._closing = threading.Event()
+
+        # Sesiune HTTP partajată: keep-alive către Ollama (fără handshake TCP
+        # la fiecare apel ask / check_answer)
+        self._session = self._make_session(self.HTTP_POOL_SIZE)
+
     # ── Helpers ───────────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _make_session(pool_size: int = 8):
+        """requests.Session cu un pool de conexiuni reutilizabile.
+
+        pool_size trebuie să acopere thread-urile care apelează simultan
+        (generate_exercises_batch --concurrency): peste plafon, urllib3
+        închide conexiunea la returnare și următorul apel refă handshake-ul.
+        """
+        if requests is None:
+            return None
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                              max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[str]:
+        if not cache_key or not self.USE_CACHE:
+            return None
+        key = f"{self.model}|{cache_key}"
+        value = self._mem_cache.get(key)
+        if value is None:
+            value = self._cache.get(key)
+            if value is not None:
+                self._mem_cache.set(key, value)
+        return value
+
+    def _cache_set(self, cache_key: Optional[str], response: str):
+        if cache_key and self.USE_CACHE and response:
+            key = f"{self.model}|{cache_key}"
+            self._mem_cache.set(key, response)
+            self._cache.set(key, response, self.model)
+
+    @staticmethod
+    def _norm_key(prompt: str, system: Optional[str], force_json: bool) -> str:
+        """Cheie de cache pe textul normalizat (system + prompt) — prinde variante
+        de spațiere / majuscule / diacritice. Folosită doar când apelantul a
+        cerut cache (cache_key dat); apelurile fără cache_key nu se memorează."""
+        text = _normalize(system or "") + "|" + _normalize(prompt)
+        if force_json:
+            text += "|json"
+        return "norm_" + hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _is_reasoning_model(self) -> bool:
+        """deepseek-r1 emite un bloc <think> înaintea răspunsului propriu-zis."""
+        return "r1" in self.model.lower()
+
+    def _token_budget(self, answer_tokens: int) -> int:
+        """Plafon num_predict pentru un răspuns de ~answer_tokens tokeni,
+        plus rezerva pentru <think> la modelele de raționament."""
+        if self._is_reasoning_model():
+            return answer_tokens + self.THINK_TOKEN_RESERVE
+        return answer_tokens
+
+    def _gen_options(self, max_tokens: int = None, stop: list[str] = None) -> dict:
+        """Opțiunile de generare; refolosește dict-ul de bază când nu diferă."""
+        if (max_tokens is None or max_tokens == self.MAX_TOKENS) and not stop:
+            return self._base_opts
+        opts = self._base_opts | {"num_predict": max_tokens or self.MAX_TOKENS}
+        if stop:
+            opts["stop"] = stop
+        return opts
+
+    def invalidate(self, prefix: str = None):
+        """
+        Invalidează cache-ul persistent.
+        prefix=None → toate răspunsurile (crește cfg_ver);
+        altfel șterge cheile care încep cu prefix (ex: "ex_" = exercițiile).
+        """
+        full_prefix = None if prefix is None else f"{self.model}|{prefix}"
+        self._mem_cache.discard_prefix(full_prefix)
+        self._cache.invalidate(full_prefix)
+
     @staticmethod
     def _strip_think(text: str) -> str:
         """Elimină blocurile <think>...</think> din răspunsurile deepseek-r1."""
-        return _THINK_RE.sub("", text).strip()
+        if "<think>" not in text:   # cazul comun: fără regex deloc
+            return text.strip()
+        text = _THINK_RE.sub("", text)
+        # <think> imbricat sau bloc > 8000 caractere: rămâne un </think> orfan —
+        # tăiem totul până la ultimul
+        end = text.rfind("</think>")
+        if end >= 0:
+            text = text[end + len("</think>"):]
+        return text.strip()
 
     # ── Disponibilitate ───────────────────────────────────────────────────────
 
     @property
     def available(self) -> bool:
-        """Verifică dacă Ollama rulează și modelul e disponibil."""
+        """Verifică dacă Ollama rulează și modelul e disponibil.
+
+        Doar prima verificare e sincronă (la pornire). După expirarea TTL-ului
+        re-verificarea rulează într-un thread de fundal, iar până termină se
+        întoarce ultima stare cunoscută — `available` e citit și din thread-ul
+        Qt, care nu trebuie să aștepte GET-ul de 3s.
+        """
         # Circuit breaker: în cooldown după timeout-uri repetate
-        if self._cooldown_until and time.time() < self._cooldown_until:
+        now = time.monotonic()
+        if self._cooldown_until and now < self._cooldown_until:
             return False
-        if self._available is None:
-            self._available = self._check_available()
-        return self._available
+        if now >= self._available_until:
+            if self._available_report is None:
+                self._refresh_available()
+            else:
+                self._start_background_probe()
+        return self._available_cached
+
+    def _start_background_probe(self):
+        with self._probe_lock:
+            if self._probing or self._closing.is_set():
+                return
+            self._probing = True
 
-    def _check_available(self) -> bool:
+        def _probe():
+            try:
+                self._refresh_available()
+            finally:
+                with self._probe_lock:
+                    self._probing = False
+
+        threading.Thread(target=_probe, name="deepseek-probe", daemon=True).start()
+
+    def _refresh_available(self):
+        """Rulează _check_available și actualizează starea din cache. Mesajele
+        se afișează doar când starea se schimbă, nu la fiecare re-verificare."""
+        ok, lines = self._check_available()
+        report = (ok, lines[:1])
+        if report != self._available_report:
+            self._available_report = report
+            for line in lines:
+                print(line)
+        self._available_cached = ok
+        # Disponibil → re-verificăm rar; indisponibil → re-verificăm curând
+        self._available_until = time.monotonic() + (
+            self.AVAILABLE_TTL_OK if ok else self.AVAILABLE_TTL_DOWN)
+
+    def _check_available(self) -> tuple[bool, list[str]]:
+        """(disponibil, mesaje de afișat). Prima linie identifică starea."""
+        if self._session is None:
+            return False, ["⚠️  DeepSeek: lipsește pachetul requests (pip install requests)"]
         try:
-            import requests
-            r = requests.get(f"{self.url}/api/tags", timeout=3)
+            r = self._session.get(f"{self.url}/api/tags", timeout=3)
             if r.status_code != 200:
-                print("⚠️  DeepSeek: Ollama nu răspunde")
-                return False
+                return False, ["⚠️  DeepSeek: Ollama nu răspunde"]
 
-            models = [m["name"] for m in r.json().get("models", [])]
+            models = [m["name"] for m in _loads(r.content).get("models", [])]
             if not any(self.model in m for m in models):
-                print(f"⚠️  DeepSeek: Modelul '{self.model}' nu e instalat.")
-                print(f"    Disponibile: {models}")
-                print(f"    Rulează: ollama pull {self.model}")
+                lines = [f"⚠️  DeepSeek: Modelul '{self.model}' nu e instalat.",
+                         f"    Disponibile: {models}",
+                         f"    Rulează: ollama pull {self.model}"]
                 # Încearcă alt model deepseek
                 for m in models:
                     if "deepseek" in m.lower() or "llama" in m.lower():
                         self.model = m
-                        print(f"    Folosesc: {self.model}")
-                        return True
-                return False
+                        lines.append(f"    Folosesc: {self.model}")
+                        return True, lines
+                return False, lines
 
-            print(f"✅ DeepSeek: {self.model} disponibil")
-            return True
+            return True, [f"✅ DeepSeek: {self.model} disponibil"]
 
         except Exception as e:
-            print(f"⚠️  DeepSeek: Ollama nu rulează ({e})")
-            print("    Pornește cu: ollama serve")
-            return False
+            # detaliile excepției pe linia a doua: prima rămâne stabilă între probe
+            return False, ["⚠️  DeepSeek: Ollama nu rulează",
+                           f"    ({e})",
+                           "    Pornește cu: ollama serve"]
 
     # ── API principal ─────────────────────────────────────────────────────────
 
     def ask(self, prompt: str, system: str = None,
             cache_key: str = None, timeout: int = None,
-            _force_json: bool = False) -> Optional[str]:
+            _force_json: bool = False, max_tokens: int = None,
+            stop: list[str] = None) -> Optional[str]:
         """
         Trimite o întrebare și returnează răspunsul complet.
 
@@ -131,6 +666,8 @@ class DeepSeekClient:
             system: Instrucțiune de sistem (opțional)
             cache_key: Cheie pentru cache (None = nu cache)
             timeout: Timeout în secunde
+            max_tokens: Plafon num_predict (None = MAX_TOKENS)
+            stop: Secvențe de oprire (opțional)
 
         Returns:
             Răspunsul ca string, sau None la eroare
@@ -138,21 +675,22 @@ class DeepSeekClient:
         if not self.available:
             return None
 
-        # Verifică cache
-        if cache_key and self.USE_CACHE and cache_key in self._cache:
-            return self._cache[cache_key]
+        # Verifică cache: întâi cheia normalizată, apoi cache_key-ul explicit
+        norm_key = (self._norm_key(prompt, system, _force_json)
+                    if cache_key and self.USE_CACHE else None)
+        cached = self._cache_get(norm_key)
+        if cached is None:
+            cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            import requests
             payload = {
                 "model": self.model,
                 "prompt": prompt,
                 "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "num_predict": 1024,
-                }
+                "keep_alive": self.KEEP_ALIVE,
+                "options": self._gen_options(max_tokens, stop)
             }
             if system:
                 payload["system"] = system
@@ -160,9 +698,10 @@ class DeepSeekClient:
                 payload["format"] = "json"   # Ollama returnează JSON valid garantat
 
             t_start = time.time()
-            r = requests.post(
+            r = self._session.post(
                 f"{self.url}/api/generate",
-                json=payload,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=timeout or self.TIMEOUT_QUICK
             )
             t_end = time.time()
@@ -171,7 +710,7 @@ class DeepSeekClient:
                 print(f"❌ DeepSeek: HTTP {r.status_code}")
                 return None
 
-            data = r.json()
+            data = _loads(r.content)   # orjson direct din bytes (fără decode + json stdlib)
             response = self._strip_think(data.get("response", ""))
 
             # Statistici
@@ -182,8 +721,8 @@ class DeepSeekClient:
             print(f"🤖 DeepSeek: {len(response)} chars, {tokens} tokens, {t_end-t_start:.1f}s")
 
             # Salvează în cache
-            if cache_key and self.USE_CACHE:
-                self._cache[cache_key] = response
+            self._cache_set(norm_key, response)
+            self._cache_set(cache_key, response)
 
             return response
 
@@ -194,7 +733,7 @@ class DeepSeekClient:
             if "timeout" in err_str or "timed out" in err_str or "read timeout" in err_str:
                 self._consecutive_timeouts += 1
                 if self._consecutive_timeouts >= 2:
-                    self._cooldown_until = time.time() + 300   # 5 min
+                    self._trip_breaker(300)   # 5 min
                     print(f"⏸️  DeepSeek: {self._consecutive_timeouts} timeout-uri consecutive "
                           f"— pauză 5 minute (Ollama supraîncărcat)")
             else:
@@ -203,7 +742,8 @@ class DeepSeekClient:
 
     def ask_collect(self, prompt: str, system: str = None,
                     cache_key: str = None,
-                    _force_json: bool = False) -> Optional[str]:
+                    _force_json: bool = False,
+                    max_tokens: int = None) -> Optional[str]:
         """
         Varianta streaming a lui ask(): colectează răspunsul token cu token.
         Avantaj față de ask(): NU există read timeout (timeout=(15, None)).
@@ -215,47 +755,26 @@ class DeepSeekClient:
         if not self.available:
             return None
 
-        if cache_key and self.USE_CACHE and cache_key in self._cache:
-            return self._cache[cache_key]
+        norm_key = (self._norm_key(prompt, system, _force_json)
+                    if cache_key and self.USE_CACHE else None)
+        cached = self._cache_get(norm_key)
+        if cached is None:
+            cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
 
         try:
-            import requests, json as _json
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": True,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "num_predict": 1024,
-                },
-            }
-            if system:
-                payload["system"] = system
-            if _force_json:
-                payload["format"] = "json"
-
             t_start = time.time()
             chunks: list[str] = []
 
-            with requests.post(
-                f"{self.url}/api/generate",
-                json=payload,
-                stream=True,
-                timeout=(15, None),   # 15s connect, fără timeout pe read
-            ) as r:
+            with self._post_stream(prompt, system, _force_json, max_tokens) as r:
                 if r.status_code != 200:
                     print(f"❌ DeepSeek collect: HTTP {r.status_code}")
                     return None
-                for line in r.iter_lines():
-                    if line:
-                        try:
-                            data = _json.loads(line)
-                            chunks.append(data.get("response", ""))
-                            if data.get("done"):
-                                break
-                        except Exception:
-                            pass
+                for data in _iter_ndjson(r):
+                    chunks.append(data.get("response", ""))
+                    if data.get("done"):
+                        break
 
             t_end = time.time()
             response = self._strip_think("".join(chunks))
@@ -264,28 +783,78 @@ class DeepSeekClient:
             self._consecutive_timeouts = 0
             print(f"🤖 DeepSeek: {len(response)} chars, {t_end - t_start:.1f}s (streaming)")
 
-            if cache_key and self.USE_CACHE and response:
-                self._cache[cache_key] = response
+            self._cache_set(norm_key, response)
+            self._cache_set(cache_key, response)
 
             return response or None
 
         except Exception as e:
             print(f"❌ DeepSeek: Eroare collect: {e}")
-            err_str = str(e).lower()
-            if "timeout" in err_str or "connect" in err_str:
-                self._consecutive_timeouts += 1
-                if self._consecutive_timeouts >= 2:
-                    self._cooldown_until = time.time() + 300
-                    print(f"⏸️  DeepSeek: {self._consecutive_timeouts} erori — pauză 5 minute")
-            else:
-                self._consecutive_timeouts = 0
+            self._note_stream_error(e)
             return None
 
+    def _post_stream(self, prompt: str, system: Optional[str],
+                     _force_json: bool, max_tokens: Optional[int]):
+        """POST /api/generate cu stream=True. Apelantul închide răspunsul (with)."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": self.KEEP_ALIVE,
+            "options": self._gen_options(max_tokens),
+        }
+        if system:
+            payload["system"] = system
+        if _force_json:
+            payload["format"] = "json"
+        return self._session.post(
+            f"{self.url}/api/generate",
+            data=_dumps(payload),
+            headers=_JSON_HEADERS,
+            stream=True,
+            timeout=(15, None),   # 15s connect, fără timeout pe read
+        )
+
+    def _note_stream_error(self, e: Exception):
+        """Circuit breaker pentru apelurile streaming: erori de conexiune /
+        timeout consecutive → pauză 5 minute; alte erori resetează contorul."""
+        err_str = str(e).lower()
+        if "timeout" in err_str or "connect" in err_str:
+            self._consecutive_timeouts += 1
+            if self._consecutive_timeouts >= 2:
+                self._trip_breaker(300)
+                print(f"⏸️  DeepSeek: {self._consecutive_timeouts} erori — pauză 5 minute")
+        else:
+            self._consecutive_timeouts = 0
+
+    def _trip_breaker(self, seconds: float):
+        """Deschide circuit breaker-ul pentru `seconds`; un Timer îl închide la
+        loc. Dacă e deja deschis, nu prelungim pauza (mai mulți workeri pot
+        raporta același episod de supraîncărcare)."""
+        with self._breaker_lock:
+            if not self._breaker_closed.is_set():
+                return
+            self._cooldown_until = time.monotonic() + seconds
+            self._breaker_closed.clear()
+            self._breaker_timer = threading.Timer(seconds, self._reset_breaker)
+            self._breaker_timer.daemon = True
+            self._breaker_timer.start()
+
+    def _reset_breaker(self):
+        """Închide breaker-ul: contorul pe zero și re-verificarea lui Ollama
+        la următorul apel; trezește toți cei care așteaptă pe _breaker_closed."""
+        with self._breaker_lock:
+            self._consecutive_timeouts = 0
+            self._cooldown_until = 0.0
+            self._available_until = 0.0
+            self._breaker_timer = None
+            self._breaker_closed.set()
+
     def ask_stream(self, prompt: str, callback: Callable[[str], None],
                    system: str = None, on_done: Callable = None):
         """
         Streaming: apelează callback pentru fiecare chunk de text.
-        Rulează în thread separat (non-blocking).
+        Rulează pe pool-ul de thread-uri al clientului (non-blocking).
 
         Args:
             prompt: Mesajul
@@ -295,44 +864,131 @@ class DeepSeekClient:
         """
         def _stream_thread():
             try:
-                import requests
                 payload = {
                     "model": self.model,
                     "prompt": prompt,
                     "stream": True,
-                    "options": {"temperature": 0.7, "num_predict": 512}
+                    "keep_alive": self.KEEP_ALIVE,
+                    "options": self._base_opts_short
                 }
                 if system:
                     payload["system"] = system
 
-                with requests.post(
+                with self._session.post(
                     f"{self.url}/api/generate",
-                    json=payload,
+                    data=_dumps(payload),
+                    headers=_JSON_HEADERS,
                     stream=True,
                     timeout=self.TIMEOUT_LONG
                 ) as r:
-                    for line in r.iter_lines():
-                        if line:
-                            chunk = json.loads(line)
-                            token = chunk.get("response", "")
-                            if token:
-                                callback(token)
-                            if chunk.get("done"):
-                                break
+                    # Tokenii sunt grupați în bucăți de ≥ STREAM_FLUSH_CHARS caractere
+                    # înainte de callback — mai puține treceri în thread-ul UI.
+                    pending: list[str] = []
+                    pending_len = 0
+                    for chunk in _iter_ndjson(r):
+                        if self._closing.is_set():
+                            return      # aplicația se închide: renunțăm la generare
+                        token = chunk.get("response", "")
+                        if token:
+                            pending.append(token)
+                            pending_len += len(token)
+                            if pending_len >= self.STREAM_FLUSH_CHARS:
+                                callback("".join(pending))
+                                pending.clear()
+                                pending_len = 0
+                        if chunk.get("done"):
+                            break
+                    if pending:
+                        callback("".join(pending))
 
             except Exception as e:
                 print(f"❌ DeepSeek stream: {e}")
             finally:
-                if on_done:
+                # după close() UI-ul care a cerut stream-ul e deja distrus
+                if on_done and not self._closing.is_set():
                     on_done()
 
-        if not self.available:
+        if self._closing.is_set() or not self.available:
             if on_done:
                 on_done()
             return
 
-        t = threading.Thread(target=_stream_thread, daemon=True)
-        t.start()
+        self._executor.submit(_stream_thread)
+
+    # ── API async (generare în paralel, offline) ──────────────────────────────
+
+    async def _aask(self, session, prompt: str, system: str = None,
+                    _force_json: bool = False,
+                    max_tokens: int = None) -> Optional[str]:
+        """Un singur POST /api/generate pe o sesiune aiohttp deja deschisă."""
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": self.KEEP_ALIVE,
+            "options": self._gen_options(max_tokens)
+        }
+        if system:
+            payload["system"] = system
+        if _force_json:
+            payload["format"] = "json"
+
+        try:
+            t_start = time.time()
+            async with session.post(f"{self.url}/api/generate", data=_dumps(payload),
+                                    headers=_JSON_HEADERS) as r:
+                if r.status != 200:
+                    print(f"❌ DeepSeek async: HTTP {r.status}")
+                    return None
+                data = await r.json(content_type=None)
+            response = self._strip_think(data.get("response", ""))
+
+            self._call_count += 1
+            self._consecutive_timeouts = 0
+            tokens = data.get("eval_count", 0)
+            self._total_tokens += tokens
+            print(f"🤖 DeepSeek: {len(response)} chars, {tokens} tokens, "
+                  f"{time.time() - t_start:.1f}s (async)")
+            return response
+        except Exception as e:
+            print(f"❌ DeepSeek async: Eroare: {e}")
+            return None
+
+    async def aask_many(self, prompts: list[tuple[str, str]],
+                        _force_json: bool = False,
+                        max_tokens: int = None) -> list[Optional[str]]:
+        """
+        Trimite mai multe (prompt, system) în paralel și returnează răspunsurile
+        în aceeași ordine (None la eroare).
+
+        Ollama procesează cereri simultane doar dacă serverul are sloturi:
+        pornește-l cu OLLAMA_NUM_PARALLEL=4 (sau mai mult). Chiar și cu un
+        singur slot se suprapun rețeaua, parsarea JSON și prefill-ul.
+        Fără aiohttp instalat, cade pe ask() sincron, pe rând.
+        """
+        if not prompts:
+            return []
+        if not self.available:
+            return [None] * len(prompts)
+
+        if aiohttp is None:
+            return [
+                await asyncio.to_thread(self.ask, prompt, system=system,
+                                        timeout=self.TIMEOUT_LONG,
+                                        _force_json=_force_json,
+                                        max_tokens=max_tokens)
+                for prompt, system in prompts
+            ]
+
+        connector = aiohttp.TCPConnector(limit=8, limit_per_host=8,
+                                         keepalive_timeout=90)
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=15)
+        async with aiohttp.ClientSession(connector=connector,
+                                         timeout=timeout) as session:
+            return list(await asyncio.gather(*[
+                self._aask(session, prompt, system, _force_json, max_tokens)
+                for prompt, system in prompts
+            ]))
 
     # ── Metode specializate (utilizate de lesson_engine) ─────────────────────
 
@@ -346,32 +1002,24 @@ class DeepSeekClient:
         Returns:
             (is_correct: bool, feedback: str)
         """
-        # Verificare rapidă înainte de LLM
-        if raspuns_elev.strip().lower() == raspuns_corect.strip().lower():
+        # Verificare rapidă înainte de LLM: text normalizat (diacritice,
+        # majuscule, punctuație finală) — fiecare potrivire aici evită un apel
+        elev, corect = _norm_answer(raspuns_elev), _norm_answer(raspuns_corect)
+        if elev == corect:
             return True, "Corect! Bravo! 🌟"
 
-        # Verificare numerică
-        try:
-            if float(raspuns_elev.strip()) == float(raspuns_corect.strip()):
-                return True, "Corect! 🌟"
-        except ValueError:
-            pass
+        # Verificare numerică: cifre, zecimale cu virgulă, numerale ("șapte")
+        a, b = _as_number(elev), _as_number(corect)
+        if a is not None and b is not None and _same_number(a, b):
+            return True, "Corect! 🌟"
 
         if not self.available:
             # Fallback simplu fără LLM
-            is_correct = raspuns_elev.strip().lower() == raspuns_corect.strip().lower()
+            is_correct = elev == corect
             feedback = "Corect! 🎉" if is_correct else f"Nu e corect. Răspunsul corect: {raspuns_corect}"
             return is_correct, feedback
 
-        system = (
-            f"Ești profesor blând pentru copii de clasa {grade} din România.\n"
-            "Verifică dacă răspunsul elevului este corect sau echivalent cu cel așteptat.\n"
-            "Răspunde EXACT în formatul:\n"
-            "  CORECT | <feedback scurt, max 1-2 propoziții, încurajator>\n"
-            "sau:\n"
-            "  GRESIT | <ce era greșit și care este răspunsul corect>\n"
-            "NU adăuga alt text în afara acestui format."
-        )
+        system = _SYS_CHECK_ANSWER + f"Elevul este în clasa {grade}."
 
         prompt = f"""Exercițiu: {enunt}
 Răspuns corect: {raspuns_corect}
@@ -379,10 +1027,13 @@ Răspuns elev: {raspuns_elev}
 
 Este răspunsul elevului corect?"""
 
-        response = self.ask(prompt, system=system, timeout=10)
+        # Verdictul are ~20 tokeni; oprirea timpurie taie divagațiile
+        stop = None if self._is_reasoning_model() else ["</s>", "\n\n\n"]
+        response = self.ask(prompt, system=system, timeout=10,
+                            max_tokens=self._token_budget(64), stop=stop)
 
         if not response:
-            is_correct = raspuns_elev.strip().lower() == raspuns_corect.strip().lower()
+            is_correct = elev == corect
             feedback = "Corect! 🎉" if is_correct else f"Răspunsul corect este: {raspuns_corect}"
             return is_correct, feedback
 
@@ -404,11 +1055,11 @@ Este răspunsul elevului corect?"""
         return is_correct, feedback
 
     # Răspunsuri generice pe care LLM le produce când nu are context bun
-    _GENERIC_INVALID = {
+    _GENERIC_INVALID = frozenset({
         "da", "nu", "da.", "nu.", "corect", "incorect",
         "raspuns", "răspuns", "...", "—", "-", "?", "!",
         "adevărat", "fals", "adevarat", "fals.", "true", "false",
-    }
+    })
 
     @staticmethod
     def _validate_exercise(ex: dict) -> bool:
@@ -417,70 +1068,59 @@ Este răspunsul elevului corect?"""
         Filtrează: enunțuri prea scurte, răspunsuri generice/invalide,
         răspunsuri-întrebări (LLM confuz), dificultate out-of-range.
         """
+        if not isinstance(ex, dict):
+            return False
         enunt   = (ex.get("enunt")   or "").strip()
         raspuns = (ex.get("raspuns") or "").strip()
 
-        # Enunț prea scurt — nu e o întrebare reală
-        if len(enunt) < 15:
-            return False
-
-        # Răspuns absent sau prea lung (LLM a pus explicație în loc de răspuns)
-        if not raspuns or len(raspuns) > 120:
-            return False
-
-        # LLM a generat o întrebare ca răspuns
-        if raspuns.endswith("?"):
-            return False
-
-        # Răspuns generic fără valoare pedagogică
-        if raspuns.lower() in DeepSeekClient._GENERIC_INVALID:
+        # Enunț prea scurt (nu e o întrebare reală); răspuns absent sau prea lung
+        # (explicație în loc de răspuns); întrebare ca răspuns (LLM confuz);
+        # răspuns generic fără valoare pedagogică
+        if (len(enunt) < 15
+                or not raspuns or len(raspuns) > 120
+                or raspuns[-1] == "?"
+                or raspuns.lower() in DeepSeekClient._GENERIC_INVALID):
             return False
 
         # Dificultate — normalizează în loc să respingem
-        try:
-            d = int(ex.get("dificultate") or 1)
-            ex["dificultate"] = max(1, min(3, d))
-        except (ValueError, TypeError):
-            ex["dificultate"] = 1
+        d = ex.get("dificultate")
+        if type(d) is not int:
+            try:
+                d = int(d or 1)
+            except (ValueError, TypeError):
+                d = 1
+        ex["dificultate"] = 1 if d < 1 else (3 if d > 3 else d)
 
         return True
 
-    def generate_exercises(self, lesson_title: str, grade: int,
-                           subject: str, theory: str = "",
-                           count: int = 5, phase: str = "practice",
-                           chunk_context: str = "",
-                           streaming: bool = False) -> list[dict]:
-        """
-        Generează exerciții noi pentru o lecție.
-        RULAT OFFLINE (la setup), nu în timp real.
+    def _exercise_request(self, lesson_title: str, grade: int,
+                          subject: str, theory: str = "",
+                          count: int = 5, phase: str = "practice",
+                          chunk_context: str = "",
+                          batch: int = 0) -> tuple[str, str, str]:
+        """Construiește (system, prompt, cache_key) pentru generate_exercises.
 
-        Returns:
-            list of dicts cu: enunt, raspuns, hint1, hint2, hint3, explicatie, dificultate
+        batch > 0 (numărul lotului din generate_exercises_batch) intră în cheie:
+        loturile succesive ale aceleiași lecții/faze au același prompt, dar
+        trebuie să primească exerciții diferite, nu răspunsul din cache.
         """
-        if not self.available:
-            print("⚠️  DeepSeek indisponibil, nu pot genera exerciții")
-            return []
+        system = _SYS_EXERCISES + f"Elevii sunt în clasa {grade}."
 
-        system = f"""Ești expert în pedagogie pentru copii de clasa {grade} din România.
-Generezi exerciții clare, potrivite vârstei, în limba română.
-RĂSPUNZI DOAR CU JSON VALID, fără explicații sau text suplimentar."""
-
-        difficulty_desc = {
-            "pretest": "ușoare (dificultate 1-2), să testăm cunoștințe anterioare",
-            "practice": "progresive (dificultate 1-3), pentru exersare",
-            "posttest": "moderate (dificultate 2-3), să testăm ce s-a învățat"
-        }.get(phase, "moderate")
+        difficulty_desc = _PHASE_DIFFICULTY.get(phase, "moderate")
 
         # Use chunk_context if provided (actual textbook text), else fall back to theory
         content_for_prompt = (chunk_context or theory or "")[:600]
 
-        prompt = f"""Generează {count} exerciții {difficulty_desc} pentru:
-- Materie: {subject}
+        # Contextul comun (materie, clasă, text) vine primul, ce ține de cerere
+        # (lecție, fază, număr) după: lecțiile aceleiași materii care folosesc
+        # același text din manual au un prefix identic → KV-cache reutilizat.
+        prompt = f"""- Materie: {subject}
 - Clasa: {grade}
-- Lecție: {lesson_title}
 - Text lecție (folosește-l pentru a crea exerciții RELEVANTE):
 {content_for_prompt if content_for_prompt else "N/A"}
 
+Generează {count} exerciții {difficulty_desc} pentru lecția: {lesson_title}
+
 REGULI IMPORTANTE:
 1. Exercițiile trebuie să fie ÎNTREBĂRI la care copilul răspunde (NU soluții gata-scrise)
 2. Răspunsul trebuie să fie scurt (1-5 cuvinte) pentru a putea fi verificat automat
@@ -503,47 +1143,376 @@ Format JSON array:
 IMPORTANT: Răspunde NUMAI cu JSON-ul, fără ```json sau altceva."""
 
         # Cache key includes content hash so different lessons get different exercises
-        import hashlib
-        content_hash = hashlib.md5(content_for_prompt.encode()).hexdigest()[:8]
+        content_hash = _content_hash(content_for_prompt)
         ck = f"ex_{lesson_title}_{phase}_{count}_{content_hash}"
+        if batch:
+            ck += f"_b{batch}"
+        return system, prompt, ck
+
+    def _parse_exercises(self, response: str, lesson_title: str) -> list[dict]:
+        """Parsează + validează JSON-ul de exerciții întors de model."""
+        try:
+            stripped = response.strip()
+            if stripped[:1] == "[":
+                # format=json: răspunsul e deja array-ul — fără scanare regex
+                try:
+                    raw = _loads(stripped)
+                except ValueError:
+                    raw = None
+            else:
+                raw = None
+            if raw is None:
+                # Extrage array-ul JSON (eventual din markdown) într-o singură trecere
+                m = _JSON_FENCE_RE.search(response) or _JSON_ARRAY_RE.search(response)
+                clean = m.group(1) if m else response
+                raw = _loads(clean.strip())
+            if not isinstance(raw, list):
+                print(f"❌ DeepSeek: JSON returnat nu e o listă")
+                return []
+            return self._filter_exercises(raw, lesson_title)
+
+        except ValueError as e:   # json.JSONDecodeError / orjson.JSONDecodeError
+            print(f"❌ DeepSeek: JSON invalid: {e}")
+            print(f"   Răspuns brut: {response[:200]}...")
+            return []
+
+    def _filter_exercises(self, raw: list, lesson_title: str) -> list[dict]:
+        """Păstrează doar exercițiile care trec _validate_exercise (cu raport)."""
+        exercises = [e for e in raw if self._validate_exercise(e)]
+        skipped = len(raw) - len(exercises)
+        if skipped:
+            print(f"⚠️  DeepSeek: {skipped}/{len(raw)} exerciții respinse (răspunsuri invalide)")
+        if len(exercises) < len(raw) * 0.5:
+            print(f"⚠️  DeepSeek: Mai puțin de 50% din exerciții au trecut validarea")
+        print(f"✅ DeepSeek: {len(exercises)} exerciții valide generate pentru '{lesson_title}'")
+        return exercises
+
+    def generate_exercises(self, lesson_title: str, grade: int,
+                           subject: str, theory: str = "",
+                           count: int = 5, phase: str = "practice",
+                           chunk_context: str = "",
+                           streaming: bool = False) -> list[dict]:
+        """
+        Generează exerciții noi pentru o lecție.
+        RULAT OFFLINE (la setup), nu în timp real.
+
+        Returns:
+            list of dicts cu: enunt, raspuns, hint1, hint2, hint3, explicatie, dificultate
+        """
+        if not self.available:
+            print("⚠️  DeepSeek indisponibil, nu pot genera exerciții")
+            return []
+
+        system, prompt, ck = self._exercise_request(
+            lesson_title, grade, subject, theory, count, phase, chunk_context)
         if streaming:
-            response = self.ask_collect(prompt, system=system, cache_key=ck, _force_json=True)
+            response = self.ask_collect(prompt, system=system, cache_key=ck,
+                                        _force_json=True, max_tokens=2048)
         else:
             response = self.ask(prompt, system=system,
                                cache_key=ck, timeout=self.TIMEOUT_LONG,
-                               _force_json=True)
+                               _force_json=True, max_tokens=2048)
 
         if not response:
             return []
+        return self._parse_exercises(response, lesson_title)
+
+    def iter_exercises(self, lesson_title: str, grade: int,
+                       subject: str, theory: str = "",
+                       count: int = 5, phase: str = "practice",
+                       chunk_context: str = "",
+                       batch: int = 0) -> Generator[dict, None, None]:
+        """
+        Ca generate_exercises(streaming=True), dar dă fiecare exercițiu valid
+        imediat ce obiectul lui JSON s-a închis în stream (_ArrayItemScanner),
+        nu după ce s-a adunat și parsat tot răspunsul. Răspunsul complet se
+        salvează în cache sub aceeași cheie ca la generate_exercises
+        (plus numărul lotului `batch`, dacă e dat).
+        """
+        if not self.available:
+            print("⚠️  DeepSeek indisponibil, nu pot genera exerciții")
+            return
+
+        system, prompt, ck = self._exercise_request(
+            lesson_title, grade, subject, theory, count, phase, chunk_context, batch)
+        cached = self._cache_get(ck)
+        if cached is not None:
+            yield from self._parse_exercises(cached, lesson_title)
+            return
 
+        scanner = _ArrayItemScanner()
+        chunks: list[str] = []
+        head = ""          # textul dinaintea JSON-ului (eventual <think>...</think>)
+        started = False
+        valid = total = 0
+        t_start = time.time()
         try:
-            # Curăță răspunsul dacă are markdown
-            clean = response.strip()
-            if clean.startswith("```"):
-                clean = clean.split("```")[1]
-                if clean.startswith("json"):
-                    clean = clean[4:]
-            if "```" in clean:
-                clean = clean.split("```")[0]
-
-            raw = json.loads(clean.strip())
-            if not isinstance(raw, list):
-                print(f"❌ DeepSeek: JSON returnat nu e o listă")
-                return []
+            with self._post_stream(prompt, system, True, max(2048, 200 * count)) as r:
+                if r.status_code != 200:
+                    print(f"❌ DeepSeek collect: HTTP {r.status_code}")
+                    return
+                for data in _iter_ndjson(r):
+                    piece = data.get("response", "")
+                    chunks.append(piece)
+                    if not started:
+                        head += piece
+                        if head.lstrip().startswith("<") and "</think>" not in head:
+                            if not data.get("done"):
+                                continue
+                        end = head.rfind("</think>")
+                        piece = head[end + len("</think>"):] if end >= 0 else head
+                        started = True
+                    for text in scanner.feed(piece):
+                        total += 1
+                        try:
+                            ex = _loads(text)
+                        except ValueError:
+                            continue
+                        if self._validate_exercise(ex):
+                            valid += 1
+                            yield ex
+                    if data.get("done"):
+                        break
+        except Exception as e:
+            print(f"❌ DeepSeek: Eroare collect: {e}")
+            self._note_stream_error(e)
+            return
 
-            exercises = [e for e in raw if self._validate_exercise(e)]
-            skipped = len(raw) - len(exercises)
-            if skipped:
-                print(f"⚠️  DeepSeek: {skipped}/{len(raw)} exerciții respinse (răspunsuri invalide)")
-            if len(exercises) < len(raw) * 0.5:
-                print(f"⚠️  DeepSeek: Mai puțin de 50% din exerciții au trecut validarea")
-            print(f"✅ DeepSeek: {len(exercises)} exerciții valide generate pentru '{lesson_title}'")
-            return exercises
+        self._call_count += 1
+        self._consecutive_timeouts = 0
+        print(f"🤖 DeepSeek: {valid}/{total} exerciții valide pentru '{lesson_title}', "
+              f"{time.time() - t_start:.1f}s (streaming)")
+        response = self._strip_think("".join(chunks))
+        if valid:
+            self._cache_set(ck, response)
+
+    def generate_exercises_parallel(self, lessons: list[dict], count: int = 5,
+                                    phase: str = "practice") -> list[list[dict]]:
+        """
+        Ca generate_exercises, dar pentru mai multe lecții deodată, prin aask_many.
+        Fiecare dict din `lessons` are cheile lui generate_exercises
+        (title, grade, subject, theory, opțional chunk_context).
+        Returnează câte o listă de exerciții per lecție, în aceeași ordine.
+        """
+        if not lessons:
+            return []
+        if not self.available:
+            print("⚠️  DeepSeek indisponibil, nu pot genera exerciții")
+            return [[] for _ in lessons]
+
+        reqs = [
+            self._exercise_request(
+                l["title"], l["grade"], l["subject"], l.get("theory", ""),
+                count, phase, l.get("chunk_context", ""))
+            for l in lessons
+        ]
+        responses: list[Optional[str]] = [self._cache_get(ck) for _, _, ck in reqs]
+        pending = [i for i, r in enumerate(responses) if r is None]
+        if pending:
+            fresh = asyncio.run(self.aask_many(
+                [(reqs[i][1], reqs[i][0]) for i in pending],
+                _force_json=True, max_tokens=2048))
+            for i, resp in zip(pending, fresh):
+                responses[i] = resp
+                self._cache_set(reqs[i][2], resp)
+
+        return [
+            self._parse_exercises(resp, l["title"]) if resp else []
+            for l, resp in zip(lessons, responses)
+        ]
+
+    def generate_exercises_batch(self, lessons: list[dict], count: int = 5,
+                                 phase: str = "practice") -> list[list[dict]]:
+        """
+        Ca generate_exercises_parallel, dar într-un SINGUR apel Ollama:
+        toate lecțiile intră într-un prompt, iar modelul întoarce un obiect
+        JSON {"L1": [...], "L2": [...]} (format=json). Un singur prefill și
+        un singur round-trip pentru tot lotul — potrivit pentru seeding offline.
 
-        except json.JSONDecodeError as e:
-            print(f"❌ DeepSeek: JSON invalid: {e}")
-            print(f"   Răspuns brut: {response[:200]}...")
+        Lecțiile deja în cache nu mai intră în prompt; rezultatul fiecărei
+        lecții se salvează sub cheia ei, deci generate_exercises îl regăsește.
+        """
+        if not lessons:
             return []
+        if not self.available:
+            print("⚠️  DeepSeek indisponibil, nu pot genera exerciții")
+            return [[] for _ in lessons]
+
+        reqs = [
+            self._exercise_request(
+                l["title"], l["grade"], l["subject"], l.get("theory", ""),
+                count, phase, l.get("chunk_context", ""))
+            for l in lessons
+        ]
+        results: list[Optional[list[dict]]] = [None] * len(lessons)
+        pending: list[int] = []
+        for i, (_, _, ck) in enumerate(reqs):
+            cached = self._cache_get(ck)
+            if cached is not None:
+                results[i] = self._parse_exercises(cached, lessons[i]["title"])
+            else:
+                pending.append(i)
+
+        if pending:
+            items = [
+                {
+                    "id": f"L{n}",
+                    "lectie": lessons[i]["title"],
+                    "materie": lessons[i]["subject"],
+                    "clasa": lessons[i]["grade"],
+                    "text": (lessons[i].get("chunk_context")
+                             or lessons[i].get("theory") or "")[:600] or "N/A",
+                }
+                for n, i in enumerate(pending, 1)
+            ]
+            difficulty_desc = _PHASE_DIFFICULTY.get(phase, "moderate")
+            prompt = f"""Generează câte {count} exerciții {difficulty_desc} pentru FIECARE lecție de mai jos.
+
+Lecții (JSON):
+{_dumps(items).decode()}
+
+REGULI IMPORTANTE:
+1. Exercițiile trebuie să fie ÎNTREBĂRI la care copilul răspunde (NU soluții gata-scrise)
+2. Răspunsul trebuie să fie scurt (1-5 cuvinte) pentru a putea fi verificat automat
+3. Bazează exercițiile pe textul fiecărei lecții, nu inventa conținut
+4. Adaptat vârstei clasei lecției — propoziții simple, cuvinte cunoscute
+
+Format JSON: un obiect cu câte o cheie pentru fiecare "id" de lecție:
+{{
+  "L1": [
+    {{
+      "enunt": "întrebarea / cerința pentru elev",
+      "raspuns": "raspunsul corect (scurt, 1-5 cuvinte)",
+      "hint1": "indiciu vag",
+      "hint2": "indiciu mai clar",
+      "hint3": "aproape raspunsul",
+      "explicatie": "explicatie daca raspunde gresit",
+      "dificultate": 1
+    }}
+  ]
+}}
+
+IMPORTANT: Răspunde NUMAI cu JSON-ul, fără ```json sau altceva."""
+
+            response = self.ask_collect(
+                prompt, system=_SYS_EXERCISES, _force_json=True,
+                max_tokens=min(2048 * len(pending), 8192))
+            try:
+                data = _loads(response) if response else {}
+            except ValueError as e:   # json.JSONDecodeError / orjson.JSONDecodeError
+                print(f"❌ DeepSeek: JSON invalid (lot): {e}")
+                data = {}
+            if not isinstance(data, dict):
+                print("❌ DeepSeek: JSON returnat (lot) nu e un obiect")
+                data = {}
+
+            for n, i in enumerate(pending, 1):
+                raw = data.get(f"L{n}")
+                if not isinstance(raw, list):
+                    results[i] = []
+                    continue
+                results[i] = self._filter_exercises(raw, lessons[i]["title"])
+                if results[i]:
+                    self._cache_set(reqs[i][2], _dumps(results[i]).decode())
+
+        return results
+
+    def generate_exercises_multiphase(self, lesson_title: str, grade: int,
+                                      subject: str, theory: str = "",
+                                      counts: dict[str, int] = None,
+                                      chunk_context: str = "") -> dict[str, list[dict]]:
+        """
+        Exercițiile pentru mai multe faze ale ACELEIAȘI lecții într-un singur
+        apel: modelul întoarce {"pretest": [...], "practice": [...], ...}
+        (format=json). Textul lecției și instrucțiunile trec o singură dată
+        prin prefill, nu o dată per fază.
+
+        counts: {fază: câte exerciții}; implicit {"pretest": 3, "practice": 8,
+        "posttest": 5}. Fiecare fază se salvează în cache sub cheia lui
+        generate_exercises, deci fazele deja generate nu mai intră în prompt.
+        """
+        if counts is None:
+            counts = {"pretest": 3, "practice": 8, "posttest": 5}
+        counts = {ph: n for ph, n in counts.items() if n > 0}
+        if not counts:
+            return {}
+        if not self.available:
+            print("⚠️  DeepSeek indisponibil, nu pot genera exerciții")
+            return {ph: [] for ph in counts}
+
+        results: dict[str, list[dict]] = {}
+        keys: dict[str, str] = {}
+        for ph, n in counts.items():
+            _, _, ck = self._exercise_request(
+                lesson_title, grade, subject, theory, n, ph, chunk_context)
+            keys[ph] = ck
+            cached = self._cache_get(ck)
+            if cached is not None:
+                results[ph] = self._parse_exercises(cached, lesson_title)
+
+        pending = [ph for ph in counts if ph not in results]
+        if not pending:
+            return results
+
+        content = (chunk_context or theory or "")[:600]
+        buckets = "\n".join(
+            f'- "{ph}": {counts[ph]} exerciții {_PHASE_DIFFICULTY.get(ph, "moderate")}'
+            for ph in pending)
+        prompt = f"""- Materie: {subject}
+- Clasa: {grade}
+- Text lecție (folosește-l pentru a crea exerciții RELEVANTE):
+{content if content else "N/A"}
+
+Generează exerciții pentru lecția: {lesson_title}, grupate pe faze:
+{buckets}
+
+REGULI IMPORTANTE:
+1. Exercițiile trebuie să fie ÎNTREBĂRI la care copilul răspunde (NU soluții gata-scrise)
+2. Răspunsul trebuie să fie scurt (1-5 cuvinte) pentru a putea fi verificat automat
+3. Bazează exercițiile pe textul de mai sus, nu inventa conținut
+4. Adaptat vârstei clasei {grade} — propoziții simple, cuvinte cunoscute
+5. Nu repeta aceeași întrebare în faze diferite
+
+Format JSON: un obiect cu câte o cheie pentru fiecare fază:
+{{
+  "{pending[0]}": [
+    {{
+      "enunt": "întrebarea / cerința pentru elev",
+      "raspuns": "raspunsul corect (scurt, 1-5 cuvinte)",
+      "hint1": "indiciu vag",
+      "hint2": "indiciu mai clar",
+      "hint3": "aproape raspunsul",
+      "explicatie": "explicatie daca raspunde gresit",
+      "dificultate": 1
+    }}
+  ]
+}}
+
+IMPORTANT: Răspunde NUMAI cu JSON-ul, fără ```json sau altceva."""
+
+        total = sum(counts[ph] for ph in pending)
+        response = self.ask_collect(
+            prompt, system=_SYS_EXERCISES + f"Elevii sunt în clasa {grade}.",
+            _force_json=True, max_tokens=min(400 * total + 512, 8192))
+        try:
+            data = _loads(response) if response else {}
+        except ValueError as e:   # json.JSONDecodeError / orjson.JSONDecodeError
+            print(f"❌ DeepSeek: JSON invalid (multi-fază): {e}")
+            data = {}
+        if not isinstance(data, dict):
+            print("❌ DeepSeek: JSON returnat (multi-fază) nu e un obiect")
+            data = {}
+
+        for ph in pending:
+            raw = data.get(ph)
+            if not isinstance(raw, list):
+                results[ph] = []
+                continue
+            results[ph] = self._filter_exercises(raw, lesson_title)
+            if results[ph]:
+                self._cache_set(keys[ph], _dumps(results[ph]).decode())
+
+        return results
 
     def explain_for_student(self, concept: str, grade: int,
                             student_question: str = "") -> str:
@@ -551,10 +1520,7 @@ IMPORTANT: Răspunde NUMAI cu JSON-ul, fără ```json sau altceva."""
         Generează o explicație personalizată pentru un elev.
         Apelat când elevul nu înțelege ceva.
         """
-        system = f"""Ești un profesor prietenos și răbdător pentru copii de clasa {grade} din România.
-Explici conceptele simplu, cu exemple din viața de zi cu zi, cu entuziasm.
-Ești scurt (max 3-4 propoziții) și folosești cuvinte simple.
-Uneori folosești emoji pentru a fi mai prietenos."""
+        system = _SYS_EXPLAIN + f"Elevul este în clasa {grade}."
 
         prompt = f"""Conceptul de explicat: {concept}
 {"Întrebarea elevului: " + student_question if student_question else ""}
@@ -564,7 +1530,7 @@ Explică acest concept simplu, pentru clasa {grade}."""
         response = self.ask(
             prompt, system=system,
             cache_key=f"explain_{concept[:30]}_{grade}" if not student_question else None,
-            timeout=15
+            timeout=15, max_tokens=self._token_budget(256)
         )
         return response or f"Hai să mai citim împreună lecția despre {concept}!"
 
@@ -580,12 +1546,13 @@ Explică acest concept simplu, pentru clasa {grade}."""
             else:
                 return f"Nu te descuraja, {student_name}! Hai să mai exersăm! 📚"
 
-        system = "Ești un mentor pozitiv pentru copii. Răspunzi în 1-2 propoziții, entuziast și încurajator."
+        system = _SYS_MOTIVATION
 
         prompt = f"""Elevul {student_name} (clasa {grade}, {subject}) a obținut scorul {score:.0f}%.
 Scrie un mesaj motivațional scurt, personalizat, în română."""
 
-        response = self.ask(prompt, system=system, timeout=8)
+        response = self.ask(prompt, system=system, timeout=8,
+                            max_tokens=self._token_budget(96))
         return response or f"Bine, {student_name}! Continuă să lucrezi! 💪"
 
     def answer_free_question(self, question: str, subject: str,
@@ -593,10 +1560,9 @@ Scrie un mesaj motivațional scurt, personalizat, în română."""
         """
         Răspunde la o întrebare spontană a elevului în timpul lecției.
         """
-        system = f"""Ești un profesor virtual pentru un copil de clasa {grade} din România.
-Ești prietenos, răbdător și explici simplu.
-Contextul lecției: {subject} - {lesson_context[:200] if lesson_context else "N/A"}
-Răspunde scurt (3-5 propoziții max), în română, simplu."""
+        system = (_SYS_FREE_QUESTION + f"Elevul este în clasa {grade}.\n"
+                  f"Contextul lecției: {subject} - "
+                  f"{lesson_context[:200] if lesson_context else 'N/A'}")
 
         response = self.ask(question, system=system, timeout=20)
         return response or "E o întrebare bună! Hai să mai citim lecția împreună și să găsim răspunsul!"
@@ -611,6 +1577,19 @@ Răspunde scurt (3-5 propoziții max), în română, simplu."""
             "model": self.model,
         }
 
+    def close(self):
+        """Oprește pool-ul de stream-uri fără să aștepte generările în curs:
+        cererile încă neîncepute se anulează, cele active se opresc la
+        următorul chunk. Apelat din MainWindow.closeEvent."""
+        self._closing.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._breaker_lock:
+            if self._breaker_timer is not None:
+                self._breaker_timer.cancel()
+                self._breaker_timer = None
+        if self._session is not None:
+            self._session.close()
+
 
 # ─── Test standalone ─────────────────────────────────────────────────────────
 
@@ -5,36 +5,86 @@ Descarca modelul vosk roman (mic, ~45 MB) pentru recunoastere vocala offline.
 
 Rulare:
     python download_vosk_model.py
+    python download_vosk_model.py --sha256 <hash>   # verifica arhiva descarcata
 """
 import sys
 import io
+import hashlib
+import argparse
 import urllib.request
 import zipfile
 from pathlib import Path
 
+try:
+    from blake3 import blake3 as _hasher   # mai rapid, opțional
+except ImportError:
+    _hasher = hashlib.sha256
+
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 
 MODEL_URL  = "https://alphacephei.com/vosk/models/vosk-model-small-ro-0.8.zip"
 MODEL_NAME = "vosk-model-small-ro-0.8"
+MODEL_SHA256: str | None = None   # hash-ul fixat al arhivei (sau --sha256)
 DEST_DIR   = Path(__file__).parent
+CHUNK_SIZE = 1 << 20   # 1 MiB per citire/scriere
+
 
+def download_with_progress(url: str, dest: Path,
+                           expected_sha256: str | None = None) -> str:
+    """Descarcă în streaming (bucăți de 1 MiB) și calculează hash-ul din mers —
+    fără a doua trecere peste fișier. Returnează digest-ul hex.
 
-def download_with_progress(url: str, dest: Path):
+    Cu expected_sha256, digest-ul (sha256) se compară înainte ca fișierul
+    parțial să devină `dest`; la nepotrivire .part se șterge și se ridică
+    ValueError."""
     print(f"Descarcare: {url}")
     print(f"Destinatie: {dest}")
 
-    def reporthook(count, block_size, total_size):
-        if total_size > 0:
-            pct = min(100, count * block_size * 100 // total_size)
-            mb  = count * block_size / 1_000_000
-            sys.stdout.write(f"\r  {pct:3d}%  {mb:.1f} MB")
-            sys.stdout.flush()
-
-    urllib.request.urlretrieve(url, dest, reporthook=reporthook)
+    hasher = hashlib.sha256() if expected_sha256 else _hasher()
+    part = dest.with_name(dest.name + ".part")
+    done = 0
+    with urllib.request.urlopen(url, timeout=30) as r, open(part, "wb") as f:
+        total = int(r.headers.get("Content-Length") or 0)
+        while True:
+            chunk = r.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            f.write(chunk)
+            hasher.update(chunk)
+            done += len(chunk)
+            if total > 0:
+                pct = min(100, done * 100 // total)
+                sys.stdout.write(f"\r  {pct:3d}%  {done / 1_000_000:.1f} MB")
+                sys.stdout.flush()
     print()
+    digest = hasher.hexdigest()
+    print(f"{hasher.name}: {digest}")
+    if expected_sha256 and digest != expected_sha256.strip().lower():
+        part.unlink(missing_ok=True)
+        raise ValueError(f"sha256 nepotrivit: asteptat {expected_sha256}, primit {digest}")
+    part.replace(dest)   # fișierul final apare doar după o descărcare completă (și verificată)
+    return digest
+
+
+def extract_missing(zip_path: Path, dest_dir: Path):
+    """Dezarhivează doar fișierele care lipsesc sau au altă dimensiune —
+    o a doua rulare peste un model deja extras e aproape instantanee."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        for info in zf.infolist():
+            target = dest_dir / info.filename
+            if info.is_dir():
+                continue
+            if target.exists() and target.stat().st_size == info.file_size:
+                continue
+            zf.extract(info, dest_dir)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Descarca modelul vosk roman")
+    parser.add_argument("--sha256", default=MODEL_SHA256,
+                        help="hash-ul sha256 asteptat al arhivei .zip")
+    args = parser.parse_args()
+
     out_dir = DEST_DIR / MODEL_NAME
     if out_dir.exists() and (out_dir / "am").exists():
         print(f"Modelul exista deja: {out_dir}")
@@ -43,7 +93,7 @@ def main():
     zip_path = DEST_DIR / (MODEL_NAME + ".zip")
     if not zip_path.exists():
         try:
-            download_with_progress(MODEL_URL, zip_path)
+            download_with_progress(MODEL_URL, zip_path, args.sha256)
         except Exception as e:
             print(f"Eroare la descarcare: {e}")
             print("Descarca manual de la:")
@@ -52,8 +102,7 @@ def main():
             sys.exit(1)
 
     print("Dezarhivare...")
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(DEST_DIR)
+    extract_missing(zip_path, DEST_DIR)
     zip_path.unlink()
 
     if (out_dir / "am").exists():
@@ -2,9 +2,19 @@
 # Citește configurarea ElevenLabs din .env (suportă pool de chei multiple)
 # Adaugă/modifică cheile în .env: ELEVENLABS_KEY_1, ELEVENLABS_KEY_2, ...
 
+import functools
 import os
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
+# KEY=valoare, cu valoare opțional între ghilimele și comentariu inline (# ...)
+_ENV_RE = re.compile(
+    r"^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"
+    r"(?:\"(.*?)\"|'(.*?)'|([^#\n]*?))[ \t]*(?:#.*)?$",
+    re.MULTILINE,
+)
+
 # ── Încarcă .env dacă python-dotenv e disponibil ─────────────────────────────
 try:
     from dotenv import load_dotenv
@@ -13,18 +23,16 @@ except ImportError:
     # Fără python-dotenv: parsăm manual .env (fără dependință extra)
     _env_path = Path(__file__).parent / ".env"
     if _env_path.exists():
-        for _line in _env_path.read_text(encoding="utf-8").splitlines():
-            _line = _line.strip()
-            if _line and not _line.startswith("#") and "=" in _line:
-                _k, _, _v = _line.partition("=")
-                if _k.strip() not in os.environ:   # nu suprascrie variabile deja setate
-                    os.environ[_k.strip()] = _v.strip()
-
+        for _m in _ENV_RE.finditer(_env_path.read_text(encoding="utf-8")):
+            _v = next(g for g in _m.groups()[1:] if g is not None)
+            os.environ.setdefault(_m.group(1), _v.strip())   # nu suprascrie variabile deja setate
 
-def _get_el_keys() -> list[str]:
+@functools.cache
+def _get_el_keys() -> tuple[str, ...]:
     """Returnează toate cheile ElevenLabs non-goale definite în .env.
 
     Scanează KEY_1..KEY_10 și tolerează goluri (nu se oprește la primul slot gol).
+    Rezultatul e memorat; după modificarea os.environ folosește Settings.refresh().
     """
     keys: list[str] = []
     for i in range(1, 11):   # KEY_1 … KEY_10, tolerant la goluri
@@ -35,14 +43,42 @@ def _get_el_keys() -> list[str]:
     old_key = os.environ.get("ELEVENLABS_API_KEY", "").strip()
     if old_key and old_key not in keys:
         keys.append(old_key)
-    return keys
+    return tuple(keys)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Configurarea ElevenLabs, citită o singură dată din mediu."""
+    keys:          tuple[str, ...] = field(repr=False)   # nu apar în loguri
+    voice:         str
+    model:         str
+    cache_dir:     str
+    low_threshold: int
+
+    @classmethod
+    def load(cls) -> "Settings":
+        return cls(
+            keys=_get_el_keys(),
+            voice=os.environ.get("ELEVENLABS_VOICE_NAME", "Jessica"),
+            model=os.environ.get("ELEVENLABS_MODEL", "eleven_multilingual_v2"),
+            cache_dir=os.environ.get("ELEVENLABS_CACHE_DIR", "tts_cache"),
+            low_threshold=int(os.environ.get("ELEVENLABS_LOW_THRESHOLD", "500")),
+        )
+
+    @classmethod
+    def refresh(cls) -> "Settings":
+        """Recitește os.environ explicit (golește cache-ul cheilor)."""
+        _get_el_keys.cache_clear()
+        return cls.load()
+
 
+SETTINGS = Settings.load()
 
 # ── Variabile publice (importate de tts_engine.py) ───────────────────────────
-ELEVENLABS_API_KEYS: list[str] = _get_el_keys()
+ELEVENLABS_API_KEYS: list[str] = list(SETTINGS.keys)
 ELEVENLABS_API_KEY:  str       = ELEVENLABS_API_KEYS[0] if ELEVENLABS_API_KEYS else ""  # backward-compat
 
-ELEVENLABS_VOICE_NAME:   str = os.environ.get("ELEVENLABS_VOICE_NAME", "Jessica")
-ELEVENLABS_MODEL:        str = os.environ.get("ELEVENLABS_MODEL", "eleven_multilingual_v2")
-ELEVENLABS_CACHE_DIR:    str = os.environ.get("ELEVENLABS_CACHE_DIR", "tts_cache")
-ELEVENLABS_LOW_THRESHOLD: int = int(os.environ.get("ELEVENLABS_LOW_THRESHOLD", "500"))
+ELEVENLABS_VOICE_NAME:   str = SETTINGS.voice
+ELEVENLABS_MODEL:        str = SETTINGS.model
+ELEVENLABS_CACHE_DIR:    str = SETTINGS.cache_dir
+ELEVENLABS_LOW_THRESHOLD: int = SETTINGS.low_threshold
@@ -18,14 +18,22 @@ Imbunatatiri fata de versiunea anterioara:
 """
 from __future__ import annotations
 
+import functools
 import math
 import random
+import threading
+from collections import OrderedDict
 from typing import Optional
 
-from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, pyqtSlot
+import numpy as np
+
+from PyQt6.QtCore import (
+    Qt, QObject, QThreadPool, QTimer, QRect, QRectF, QPointF, QVariantAnimation,
+    QSequentialAnimationGroup, pyqtSignal, pyqtSlot
+)
 from PyQt6.QtGui import (
-    QPainter, QColor, QPen, QBrush, QPainterPath,
-    QFont, QRadialGradient, QLinearGradient, QConicalGradient
+    QPainter, QColor, QPen, QBrush, QPainterPath, QPainterPathStroker, QImage,
+    QFont, QRadialGradient, QLinearGradient, QConicalGradient, QPixmap
 )
 from PyQt6.QtWidgets import QWidget, QSizePolicy
 
@@ -44,16 +52,77 @@ EMOTION_PALETTE = {
 }
 
 EMOTION_FACE = {
-    "idle":        {"smile": 0.10, "brow_raise": 0.0,  "brow_angle":  0, "eye_open": 1.00, "blush": False, "pupil": (0, 0)},
-    "happy":       {"smile": 0.92, "brow_raise": 0.45, "brow_angle":  5, "eye_open": 1.10, "blush": True,  "pupil": (0,-1)},
-    "talking":     {"smile": 0.30, "brow_raise": 0.10, "brow_angle":  0, "eye_open": 1.00, "blush": False, "pupil": (0, 0)},
-    "thinking":    {"smile": 0.00, "brow_raise": 0.60, "brow_angle": 12, "eye_open": 0.85, "blush": False, "pupil":(-2,-3)},
-    "encouraging": {"smile": 0.65, "brow_raise": 0.30, "brow_angle":  5, "eye_open": 1.10, "blush": True,  "pupil": (0, 0)},
-    "sad":         {"smile":-0.75, "brow_raise":-0.35, "brow_angle": -9, "eye_open": 0.75, "blush": False, "pupil": (0, 2)},
-    "excited":     {"smile": 1.00, "brow_raise": 0.85, "brow_angle":  8, "eye_open": 1.30, "blush": True,  "pupil": (0,-2)},
-    "focused":     {"smile": 0.15, "brow_raise":-0.10, "brow_angle": -3, "eye_open": 1.00, "blush": False, "pupil": (0, 0)},
+    "idle":        {"smile": 0.10, "brow_raise": 0.0,  "brow_angle":  0, "eye_open": 1.00, "blush": False, "iris": (0, 0)},
+    "happy":       {"smile": 0.92, "brow_raise": 0.45, "brow_angle":  5, "eye_open": 1.10, "blush": True,  "iris": (0,-1)},
+    "talking":     {"smile": 0.30, "brow_raise": 0.10, "brow_angle":  0, "eye_open": 1.00, "blush": False, "iris": (0, 0)},
+    "thinking":    {"smile": 0.00, "brow_raise": 0.60, "brow_angle": 12, "eye_open": 0.85, "blush": False, "iris":(-1,-2)},
+    "encouraging": {"smile": 0.65, "brow_raise": 0.30, "brow_angle":  5, "eye_open": 1.10, "blush": True,  "iris": (0, 0)},
+    "sad":         {"smile":-0.75, "brow_raise":-0.35, "brow_angle": -9, "eye_open": 0.75, "blush": False, "iris": (0, 1)},
+    "excited":     {"smile": 1.00, "brow_raise": 0.85, "brow_angle":  8, "eye_open": 1.30, "blush": True,  "iris": (0,-1)},
+    "focused":     {"smile": 0.15, "brow_raise":-0.10, "brow_angle": -3, "eye_open": 1.00, "blush": False, "iris": (0, 0)},
 }
 
+# Aceleasi valori ca vectori float32 in ordine fixa: tranzitia dintre emotii
+# devine o singura operatie vectoriala in loc de o bucla pe chei de dict.
+# Privirea ("iris") e deplasarea intreaga a irisului in px, scrisa explicit
+# per emotie: irisul cade mereu pe pixeli intregi, deci gradientii lui se
+# deseneaza identic intre cadre. Valorile sunt vechile pupil * 0.5 rotunjite
+# in afara lui zero, ca nicio privire (ex. happy in sus) sa nu dispara.
+SMILE, BROW_RAISE, BROW_ANGLE, EYE_OPEN, IRIS_OX, IRIS_OY = range(6)
+EMOTION_VEC = {
+    name: np.array([d["smile"], d["brow_raise"], d["brow_angle"], d["eye_open"],
+                    d["iris"][0], d["iris"][1]], dtype=np.float32)
+    for name, d in EMOTION_FACE.items()
+}
+EMOTION_BLUSH = {name: d["blush"] for name, d in EMOTION_FACE.items()}
+
+# Genele superioare: 7 unghiuri fixe (20°..140°) -> (cos, sin, |sin|) calculate o data
+_LASH_ANGLES = [math.radians(20 + i * 20) for i in range(7)]
+_LASH_TRIG   = [(math.cos(a), math.sin(a), abs(math.sin(a))) for a in _LASH_ANGLES]
+
+
+# Deschiderea gurii la vorbire: 0.5 + 0.5*sin(faza), tabelat. 4 perioade in 64
+# de pasi (~0.39 rad/pas), deci tabelul se reia fara salt la capat.
+_MOUTH_LUT_SIZE = 64
+_MOUTH_SIN_LUT  = [0.5 + 0.5 * math.sin(2 * math.pi * 4 * i / _MOUTH_LUT_SIZE)
+                   for i in range(_MOUTH_LUT_SIZE)]
+
+
+@functools.lru_cache(maxsize=128)
+def _brow_trig(angle_deg: float) -> tuple[float, float]:
+    """(cos, sin) pentru unghiul sprancenei; unghiul vine rotunjit la 0.1°."""
+    a = math.radians(angle_deg)
+    return math.cos(a), math.sin(a)
+
+
+@functools.lru_cache(maxsize=64)
+def _upper_lip_path(cx: int, my: int, mw: int, curve: int, is_open: bool) -> QPainterPath:
+    """Buza superioara cu Cupid's bow (comuna gurii deschise si inchise).
+    Calea returnata e partajata din cache — nu se modifica."""
+    upper = QPainterPath()
+    upper.moveTo(cx - mw + 2, my)
+    upper.cubicTo(cx - mw * 0.5, my - 5 - curve,
+                  cx - mw * 0.15, my - 8 - curve, cx, my - 7 - curve)
+    upper.cubicTo(cx + mw * 0.15, my - 8 - curve,
+                  cx + mw * 0.5, my - 5 - curve, cx + mw - 2, my)
+    if is_open:
+        upper.quadTo(cx, my - curve + 2, cx - mw + 2, my)
+    else:
+        upper.lineTo(cx, my - curve * 0.3)
+    upper.closeSubpath()
+    return upper
+
+
+def _centered(grad: QRadialGradient, x: float, y: float,
+              radius: Optional[float] = None) -> QBrush:
+    """Muta un gradient radial pre-construit in (x, y) si intoarce pensula."""
+    grad.setCenter(x, y)
+    grad.setFocalPoint(x, y)
+    if radius is not None:
+        grad.setRadius(radius)
+    return QBrush(grad)
+
+
 # ─── Culori piele ────────────────────────────────────────────────────────────
 SKIN_BASE     = QColor(255, 213, 170)   # bej cald
 SKIN_HIGHLIGHT= QColor(255, 235, 205)   # luminos
@@ -73,47 +142,139 @@ HAIR_BASE     = QColor( 70,  40,  10)   # par baza
 HAIR_LIGHT    = QColor(120,  75,  30)   # par suvita luminoasa
 HAIR_DARK     = QColor( 40,  20,   5)   # par umbra
 
+# ─── Culori de detaliu (construite o singura data, nu la fiecare cadru) ──────
+TRANSPARENT   = QColor(  0,   0,   0,   0)
+SKIN_MID      = QColor(230, 175, 120)        # ton intermediar fata
+SHADE_WARM    = QColor(180, 110,  70,  55)   # umbra sub nas
+SHADE_CHIN    = QColor(180, 110,  70,  40)   # umbra barbie
+SHADE_SIDE    = QColor(160, 100,  60,  50)   # umbra mandibula
+SOCKET_IN     = QColor(160, 100,  60,   0)   # umbra orbita: centru
+SOCKET_MID    = QColor(140,  80,  40,  30)
+SOCKET_OUT    = QColor(120,  60,  20,  60)
+SCLERA_LINE   = QColor(160, 120,  90, 180)   # contur sclera
+PUPIL_CENTER  = QColor( 35,  25,  15)        # centru pupila
+GLINT_BIG     = QColor(255, 255, 255, 220)   # sclipire primara
+GLINT_SMALL   = QColor(255, 255, 255, 140)   # sclipire secundara
+LID_COLOR     = QColor( 60,  35,  20, 200)   # pleoapa superioara
+LASH_COLOR    = QColor( 50,  30,  15, 180)   # gene
+LID_LOW       = QColor(160, 110,  80,  80)   # pleoapa inferioara
+NOSE_BRIDGE_HL= QColor(255, 230, 200,  90)   # highlight bridge nas
+NOSE_TIP_HL   = QColor(255, 240, 220, 100)   # highlight varf nas
+CAVITY_COLOR  = QColor( 60,  20,  20)        # interior gura
+TEETH_COLOR   = QColor(248, 246, 240)        # dinti
+TEETH_LINE    = QColor(200, 195, 185, 120)   # linie intre dinti
+LIP_HL_LOW    = QColor(240, 170, 160, 120)   # highlight buza inferioara
+BLUSH_CENTER  = QColor(SKIN_BLUSH.red(), SKIN_BLUSH.green(), SKIN_BLUSH.blue(), 90)
+
+
+class _StaticLayerSignals(QObject):
+    """Puntea worker -> GUI: QImage-ul unui strat static e gata."""
+    ready = pyqtSignal(object, object)   # (cheie tema, QImage)
+
 
 class FaceAvatarWidget(QWidget):
     """Avatar realist animat - QPainter."""
 
     WIDGET_W = 220
     WIDGET_H = 270
+    TICK_MS  = 33                      # cadru de referinta (~30 FPS)
+    TRANSITION_MS  = 9 * TICK_MS       # tranzitie emotie
+    BLINK_CLOSE_MS = 4 * TICK_MS       # inchidere pleoape
+    BLINK_OPEN_MS  = 6 * TICK_MS       # redeschidere
+    BROW_PIX_W, BROW_PIX_H = 48, 20
+    MOUTH_PIX_W, MOUTH_PIX_H = 70, 50
+    MOUTH_CACHE_MAX = 100
+    SKIN_IMG_W, SKIN_IMG_H = 160, 180
 
     def __init__(self, tts=None, parent=None):
         super().__init__(parent)
         self.setFixedSize(self.WIDGET_W, self.WIDGET_H)
         self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        # Stratul static acopera tot widget-ul -> Qt nu mai sterge fundalul
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
         self.tts = tts
 
+        # Zonele animate (pentru update() pe regiune si sarit componente)
+        cx, cy = self.WIDGET_W // 2, self.WIDGET_H // 2 - 5
+        self._brows_rect = QRect(cx - 42, cy - 56, 84, 28)
+        self._eyes_rect  = QRect(cx - 50, cy - 34, 100, 44)
+        self._nose_rect  = QRect(cx - 14, cy - 10, 28, 34)
+        self._mouth_rect = QRect(cx - 35, cy + 17, 70, 50)
+        self._blush_rect = QRect(cx - 66, cy + 8, 132, 28)
+        self._build_static_paths(cx, cy)
+        self._build_pens()
+
         self._emotion  = "idle"
-        self._face     = dict(EMOTION_FACE["idle"])
-        self._prev_face    = dict(self._face)
-        self._target_face  = dict(self._face)
-        self._transition_t = 1.0     # 0..1, 1=done
+        self._face_vec     = EMOTION_VEC["idle"].copy()
+        self._prev_vec     = self._face_vec
+        self._target_vec   = self._face_vec
+        self._blush        = EMOTION_BLUSH["idle"]
+        self._prev_blush   = self._blush
+        self._target_blush = self._blush
 
         # Clipit
         self._blink_state  = 1.0     # 1=deschis, 0=inchis
-        self._is_blinking  = False
-        self._blink_frame  = 0
-        self._blink_frames = 0
-        self._next_blink   = random.randint(18, 55)
-        self._blink_count  = 0
+        # Generator pseudo-aleator propriu (clipit, tremur gura); `random`
+        # e folosit o singura data, doar pentru samanta
+        self._rng_state    = random.getrandbits(64)
 
         # Gura
         self._mouth_open   = 0.0
         self._talking      = False
-        self._mouth_phase  = 0.0
+        self._mouth_idx    = 0
 
         # Tema
         self._bg_color     = "#e8f4fd"
         self._border_color = "#2980b9"
         self._label_text   = "Pregatit"
 
-        # Timere
-        self._anim_timer = QTimer(self)
-        self._anim_timer.timeout.connect(self._tick)
-        self._anim_timer.start(33)   # ~30 FPS
+        # Strat static (fundal, gat, par, urechi, fata, eticheta) pre-randat,
+        # cate unul per tema de emotie (max. 8) -> schimbarea emotiei nu mai
+        # redeseneaza nimic dupa prima aparitie a temei
+        self._static_cache: dict[tuple, QPixmap] = {}
+        # Fundaluri (gradient vertical) per culoare de fundal
+        self._bg_cache: dict[tuple, QImage] = {}
+        # Gradientul pielii pre-rasterizat (per dpr)
+        self._skin_images: dict[float, QImage] = {}
+        # Straturile statice se deseneaza pe QImage (permis si in alte thread-uri);
+        # lock-ul serializeaza worker-ul cu eventualul randat sincron din paintEvent
+        self._static_lock = threading.Lock()
+        self._static_signals = _StaticLayerSignals(self)
+        self._static_signals.ready.connect(self._on_static_ready)
+        # Sprancene pre-randate: (ridicare cuantizata, unghi, dpr) -> QPixmap
+        self._brow_cache: dict[tuple, QPixmap] = {}
+        # Guri pre-randate: (deschidere, zambet cuantizate, dpr) -> QPixmap, LRU
+        self._mouth_cache: OrderedDict[tuple, QPixmap] = OrderedDict()
+        self._prerender_static_layers()
+
+        # Animatii: driver-ul de animatie Qt ne apeleaza doar cat timp ceva
+        # chiar se misca; in rest widget-ul nu primeste niciun cadru
+        self._transition_anim = QVariantAnimation(self)
+        self._transition_anim.setStartValue(0.0)
+        self._transition_anim.setEndValue(1.0)
+        self._transition_anim.setDuration(self.TRANSITION_MS)
+        self._transition_anim.valueChanged.connect(self._on_transition)
+
+        blink_close = QVariantAnimation(self)
+        blink_close.setStartValue(1.0)
+        blink_close.setEndValue(0.0)
+        blink_close.setDuration(self.BLINK_CLOSE_MS)
+        blink_open = QVariantAnimation(self)
+        blink_open.setStartValue(0.0)
+        blink_open.setEndValue(1.0)
+        blink_open.setDuration(self.BLINK_OPEN_MS)
+        self._blink_anim = QSequentialAnimationGroup(self)
+        for anim in (blink_close, blink_open):
+            anim.valueChanged.connect(self._on_blink)
+            self._blink_anim.addAnimation(anim)
+        self._blink_anim.finished.connect(self._schedule_blink)
+
+        # Urmatorul clipit: pauza aleatoare intre doua clipiri
+        self._blink_timer = QTimer(self)
+        self._blink_timer.setSingleShot(True)
+        self._blink_timer.timeout.connect(self._blink_anim.start)
+        self._schedule_blink()
 
         self._mouth_timer = QTimer(self)
         self._mouth_timer.timeout.connect(self._animate_mouth)
@@ -137,9 +298,12 @@ class FaceAvatarWidget(QWidget):
         self._label_text   = pal["label"]
         self._border_color = pal["border"]
         self._bg_color     = pal["bg"]
-        self._prev_face    = dict(self._face)
-        self._target_face  = dict(EMOTION_FACE[emotion])
-        self._transition_t = 0.0
+        self._prev_vec     = self._face_vec
+        self._target_vec   = EMOTION_VEC[emotion]
+        self._prev_blush   = self._blush
+        self._target_blush = EMOTION_BLUSH[emotion]
+        self._transition_anim.stop()
+        self._transition_anim.start()
         if emotion == "talking":
             self._start_talking()
         elif self._talking:
@@ -161,7 +325,7 @@ class FaceAvatarWidget(QWidget):
 
     def _start_talking(self):
         self._talking = True
-        self._mouth_phase = 0.0
+        self._mouth_idx = 0
         if not self._mouth_timer.isActive():
             self._mouth_timer.start(75)
 
@@ -169,49 +333,38 @@ class FaceAvatarWidget(QWidget):
         self._talking = False
         self._mouth_timer.stop()
         self._mouth_open = 0.0
+        self.update(self._mouth_rect)   # gura trebuie redesenata inchisa
 
-    # ── Tick animatie ─────────────────────────────────────────────────────
+    # ── Animatie ──────────────────────────────────────────────────────────
 
-    def _tick(self):
+    def _on_transition(self, value):
         # Tranzitie emotie (ease-in-out)
-        if self._transition_t < 1.0:
-            self._transition_t = min(1.0, self._transition_t + 0.12)
-            t = self._ease_inout(self._transition_t)
-            for key in self._target_face:
-                pv = self._prev_face.get(key, self._target_face[key])
-                tv = self._target_face[key]
-                if isinstance(tv, (int, float)):
-                    self._face[key] = pv + (tv - pv) * t
-                else:
-                    self._face[key] = tv if t > 0.5 else pv
-
-        # Clipit
-        if not self._is_blinking:
-            self._blink_count += 1
-            if self._blink_count >= self._next_blink:
-                self._is_blinking = True
-                self._blink_frames = 0
-                self._next_blink   = random.randint(18, 55)
-                self._blink_count  = 0
-        else:
-            self._blink_frames += 1
-            total = 10
-            half  = 4
-            if self._blink_frames <= half:
-                self._blink_state = 1.0 - self._blink_frames / half
-            elif self._blink_frames <= total:
-                self._blink_state = (self._blink_frames - half) / (total - half)
-            else:
-                self._blink_state = 1.0
-                self._is_blinking = False
-
-        self.update()
+        t = self._ease_inout(value)
+        self._face_vec = self._prev_vec + (self._target_vec - self._prev_vec) * t
+        self._blush = self._target_blush if t > 0.5 else self._prev_blush
+        self.update()   # se misca toata fata (si poate tema)
+
+    def _on_blink(self, value):
+        self._blink_state = value
+        self.update(self._eyes_rect)
+
+    def _schedule_blink(self):
+        self._blink_state = 1.0
+        self._blink_timer.start((18 + self._next_rand() % 38) * self.TICK_MS)
+
+    def _next_rand(self) -> int:
+        """LCG pe 64 biti (constantele lui Knuth/PCG) -> 30 biti pseudo-aleatori.
+        Suficient pentru clipit si tremurul gurii, fara starea lui `random`."""
+        self._rng_state = (self._rng_state * 6364136223846793005
+                           + 1442695040888963407) & 0xFFFFFFFFFFFFFFFF
+        return (self._rng_state >> 33) & 0x3FFFFFFF
 
     def _animate_mouth(self):
-        self._mouth_phase += 0.38
-        base  = 0.5 + 0.5 * math.sin(self._mouth_phase)
-        noise = random.uniform(-0.12, 0.12)
+        self._mouth_idx = (self._mouth_idx + 1) & (_MOUTH_LUT_SIZE - 1)
+        base  = _MOUTH_SIN_LUT[self._mouth_idx]
+        noise = ((self._next_rand() & 0xFF) - 128) * 0.001   # ~[-0.12, 0.12]
         self._mouth_open = max(0.0, min(1.0, base + noise))
+        self.update(self._mouth_rect)
 
     @staticmethod
     def _ease_inout(t: float) -> float:
@@ -219,39 +372,277 @@ class FaceAvatarWidget(QWidget):
 
     # ── Paint ─────────────────────────────────────────────────────────────
 
-    def paintEvent(self, _event):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.RenderHint.Antialiasing)
-        p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
-
+    def paintEvent(self, event):
         W, H = self.width(), self.height()
         cx   = W // 2
         cy   = H // 2 - 5
 
-        # Fundal
-        bg = QLinearGradient(0, 0, 0, H)
-        bg.setColorAt(0, QColor(self._bg_color).lighter(108))
-        bg.setColorAt(1, QColor(self._bg_color).darker(105))
-        p.fillRect(0, 0, W, H, QBrush(bg))
-
-        cfg = self._face
-
-        # Ordine desenare (back-to-front)
-        self._draw_neck_shoulders(p, cx, cy)
-        self._draw_hair_back(p, cx, cy)
-        self._draw_ears(p, cx, cy)
-        self._draw_face_base(p, cx, cy)
-        self._draw_face_shading(p, cx, cy)
-        self._draw_hair_front(p, cx, cy)
-        self._draw_eyebrows(p, cx, cy, cfg)
-        self._draw_eyes(p, cx, cy, cfg)
-        self._draw_nose(p, cx, cy)
-        self._draw_mouth(p, cx, cy, cfg)
-        if cfg.get("blush"):
+        key = (W, H, self.devicePixelRatioF(),
+               self._bg_color, self._border_color, self._label_text)
+        static = self._static_cache.get(key)
+        if static is None:
+            # Worker-ul n-a terminat (sau alt dpr): randam sincron
+            static = QPixmap.fromImage(self._render_static_image(key))
+            self._static_cache[key] = static
+
+        p = QPainter(self)
+        p.drawPixmap(0, 0, static)
+        p.setRenderHint(QPainter.RenderHint.Antialiasing)
+        p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        # O singura conversie numpy -> list[float] pe cadru: componentele
+        # citesc apoi floats Python simple, fara scalari numpy sau dict.get
+        cfg = self._face_vec.tolist()
+        dirty = event.region()
+
+        # Doar trasaturile animate se redeseneaza, si doar cele din regiunea murdara
+        if dirty.intersects(self._brows_rect):
+            self._draw_eyebrows(p, cx, cy, cfg)
+        if dirty.intersects(self._eyes_rect):
+            self._draw_eyes(p, cx, cy, cfg)
+        if dirty.intersects(self._nose_rect):
+            self._draw_nose(p, cx, cy)
+        if dirty.intersects(self._mouth_rect):
+            self._draw_mouth(p, cx, cy, cfg)
+        if self._blush and dirty.intersects(self._blush_rect):
             self._draw_blush(p, cx, cy)
-        self._draw_label(p, W, H)
         p.end()
 
+    def _new_pixmap(self, w: int, h: int) -> QPixmap:
+        """QPixmap transparent de w x h pixeli logici, la rezolutia ecranului."""
+        dpr = self.devicePixelRatioF()
+        pix = QPixmap(round(w * dpr), round(h * dpr))
+        pix.setDevicePixelRatio(dpr)
+        pix.fill(Qt.GlobalColor.transparent)
+        return pix
+
+    @staticmethod
+    def _new_image(w: int, h: int, dpr: float) -> QImage:
+        """Ca _new_pixmap, dar QImage — se poate desena si in afara thread-ului GUI."""
+        img = QImage(round(w * dpr), round(h * dpr), QImage.Format.Format_ARGB32_Premultiplied)
+        img.setDevicePixelRatio(dpr)
+        img.fill(Qt.GlobalColor.transparent)
+        return img
+
+    def _prerender_static_layers(self):
+        """Pregateste in fundal straturile statice ale tuturor temelor, ca
+        primul cadru (si fiecare schimbare de emotie) sa fie doar un blit."""
+        W, H, dpr = self.WIDGET_W, self.WIDGET_H, self.devicePixelRatioF()
+        keys = [(W, H, dpr, pal["bg"], pal["border"], pal["label"])
+                for pal in EMOTION_PALETTE.values()]
+
+        def job():
+            for key in keys:
+                if key in self._static_cache:
+                    continue
+                img = self._render_static_image(key)
+                try:
+                    self._static_signals.ready.emit(key, img)
+                except RuntimeError:   # widget-ul a fost distrus intre timp
+                    return
+
+        QThreadPool.globalInstance().start(job)
+
+    @pyqtSlot(object, object)
+    def _on_static_ready(self, key, img):
+        if key not in self._static_cache:
+            self._static_cache[key] = QPixmap.fromImage(img)
+
+    def _background(self, W: int, H: int, bg_color: str, dpr: float) -> QImage:
+        """Gradientul de fundal al unei teme, rasterizat o singura data."""
+        key = (bg_color, W, H, dpr)
+        img = self._bg_cache.get(key)
+        if img is None:
+            img = self._new_image(W, H, dpr)
+            p = QPainter(img)
+            bg = QLinearGradient(0, 0, 0, H)
+            bg.setColorAt(0, QColor(bg_color).lighter(108))
+            bg.setColorAt(1, QColor(bg_color).darker(105))
+            p.fillRect(0, 0, W, H, QBrush(bg))
+            p.end()
+            self._bg_cache[key] = img
+        return img
+
+    def _render_static_image(self, key: tuple) -> QImage:
+        """Randeaza straturile care nu depind de animatie pentru o tema.
+        Nu atinge starea curenta a widget-ului (tema vine din cheie), deci
+        poate rula si pe un worker."""
+        W, H, dpr, bg_color, border_color, label_text = key
+        cx, cy = W // 2, H // 2 - 5
+        with self._static_lock:
+            img = self._new_image(W, H, dpr)
+            p = QPainter(img)
+            p.setRenderHint(QPainter.RenderHint.Antialiasing)
+            p.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+            # Fundal
+            p.drawImage(0, 0, self._background(W, H, bg_color, dpr))
+
+            # Ordine desenare (back-to-front)
+            self._draw_neck_shoulders(p, cx, cy)
+            self._draw_hair_back(p, cx, cy)
+            self._draw_ears(p, cx, cy)
+            self._draw_face_base(p, cx, cy, border_color)
+            self._draw_face_shading(p, cx, cy)
+            self._draw_hair_front(p, cx, cy)
+            self._draw_label(p, W, H, border_color, label_text)
+            p.end()
+        return img
+
+    # ── Geometrie pre-construita ──────────────────────────────────────────
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        W, H = self.width(), self.height()
+        if (W // 2, H // 2 - 5) != self._paths_center:
+            self._build_static_paths(W // 2, H // 2 - 5)
+            self._static_cache.clear()
+
+    def _build_static_paths(self, cx: int, cy: int):
+        """Construieste o singura data contururile fixe (depind doar de cx, cy)."""
+        self._paths_center = (cx, cy)
+
+        # Umeri
+        neck_w = 34
+        shoulder_y = cy + 82 + 35 - 8
+        spath = QPainterPath()
+        spath.moveTo(cx - neck_w // 2 - 2, shoulder_y)
+        spath.cubicTo(cx - 50, shoulder_y + 5, cx - 70, shoulder_y + 20, cx - 90, shoulder_y + 28)
+        spath.lineTo(cx + 90, shoulder_y + 28)
+        spath.cubicTo(cx + 70, shoulder_y + 20, cx + 50, shoulder_y + 5, cx + neck_w // 2 + 2, shoulder_y)
+        spath.closeSubpath()
+        self._shoulders_path = spath
+
+        # Par spate: calota + bucle laterale
+        hpath = QPainterPath()
+        hpath.moveTo(cx - 78, cy + 15)
+        hpath.cubicTo(cx - 82, cy - 20, cx - 75, cy - 92, cx, cy - 100)
+        hpath.cubicTo(cx + 75, cy - 92, cx + 82, cy - 20, cx + 78, cy + 15)
+        hpath.closeSubpath()
+        self._hair_back_path = hpath
+        self._hair_loop_paths = []
+        for side in (-1, 1):
+            lpath = QPainterPath()
+            bx = cx + side * 74
+            lpath.moveTo(bx, cy - 10)
+            lpath.cubicTo(bx + side * 12, cy - 30, bx + side * 15, cy + 10, bx, cy + 30)
+            lpath.cubicTo(bx - side * 5, cy + 15, bx - side * 5, cy, bx, cy - 10)
+            self._hair_loop_paths.append(lpath)
+
+        # Urechi: detaliu interior (antehelix)
+        self._ear_paths = {}
+        for side in (-1, 1):
+            ex = cx + side * 72
+            ey = cy + 8
+            inner = QPainterPath()
+            inner.moveTo(ex + side * 2, ey - 10)
+            inner.cubicTo(ex + side * 5, ey, ex + side * 4, ey + 10, ex + side * 2, ey + 14)
+            self._ear_paths[side] = inner
+
+        # Fata
+        rx, ry = 72, 85
+        fpath = QPainterPath()
+        fpath.moveTo(cx, cy - ry)
+        fpath.cubicTo(cx + rx + 8, cy - ry, cx + rx, cy + ry * 0.3, cx + rx * 0.65, cy + ry)
+        fpath.cubicTo(cx + rx * 0.3, cy + ry + 10, cx - rx * 0.3, cy + ry + 10, cx - rx * 0.65, cy + ry)
+        fpath.cubicTo(cx - rx, cy + ry * 0.3, cx - rx - 8, cy - ry, cx, cy - ry)
+        fpath.closeSubpath()
+        self._face_path = fpath
+
+        # Freza + suvite de lumina
+        freza = QPainterPath()
+        freza.moveTo(cx - 72, cy - ry * 0.5)
+        freza.cubicTo(cx - 60, cy - ry - 18, cx - 20, cy - ry - 22, cx, cy - ry - 16)
+        freza.cubicTo(cx + 20, cy - ry - 22, cx + 60, cy - ry - 18, cx + 72, cy - ry * 0.5)
+        freza.cubicTo(cx + 55, cy - ry - 8, cx + 30, cy - ry - 12, cx + 10, cy - ry - 6)
+        freza.cubicTo(cx - 10, cy - ry - 12, cx - 40, cy - ry - 8, cx - 72, cy - ry * 0.5)
+        freza.closeSubpath()
+        self._freza_path = freza
+        self._hair_strand_paths = []
+        for dx in [-20, 0, 20]:
+            sx = cx + dx
+            sy = cy - ry - 15
+            strand = QPainterPath()
+            strand.moveTo(sx, sy)
+            strand.cubicTo(sx + 5, sy - 8, sx + 8, sy - 15, sx + 3, sy - 22)
+            self._hair_strand_paths.append(strand)
+
+        # Nas (profil, doua jumatati)
+        npath = QPainterPath()
+        npath.moveTo(cx - 1, cy - 5)
+        npath.cubicTo(cx + 4, cy + 5, cx + 10, cy + 12, cx + 11, cy + 18)
+        npath.cubicTo(cx + 7, cy + 22, cx + 2, cy + 22, cx, cy + 21)
+        npath2 = QPainterPath()
+        npath2.moveTo(cx, cy + 21)
+        npath2.cubicTo(cx - 2, cy + 22, cx - 7, cy + 22, cx - 11, cy + 18)
+        npath2.cubicTo(cx - 10, cy + 12, cx - 4, cy + 5, cx - 1, cy - 5)
+        self._nose_paths = (npath, npath2)
+
+    def _build_pens(self):
+        """Pen-uri si pensule refolosite la fiecare cadru (nu le reconstruim)."""
+        solid, round_cap = Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap
+
+        # Sprancene: conturul curbei umplut o data (miez) + o margine moale
+        # mai lata si mai transparenta, in loc de 4 treceri cu pen-uri diferite
+        def stroker(width):
+            st = QPainterPathStroker()
+            st.setWidth(width)
+            st.setCapStyle(round_cap)
+            st.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+            return st
+
+        self._brow_stroker      = stroker(4.5)
+        self._brow_soft_stroker = stroker(5.5)
+        self._brow_brush      = QBrush(QColor(BROW_COLOR.red(), BROW_COLOR.green(),
+                                              BROW_COLOR.blue(), 200))
+        self._brow_soft_brush = QBrush(QColor(BROW_COLOR.red(), BROW_COLOR.green(),
+                                              BROW_COLOR.blue(), 80))
+        self._pen_brow_strand = QPen(QColor(BROW_COLOR.red(), BROW_COLOR.green(),
+                                            BROW_COLOR.blue(), 120), 1.0, solid, round_cap)
+
+        # Ochi
+        self._pen_sclera         = QPen(SCLERA_LINE, 1.0)
+        self._brush_eye_white    = QBrush(EYE_WHITE)
+        self._brush_glint_big    = QBrush(GLINT_BIG)
+        self._brush_glint_small  = QBrush(GLINT_SMALL)
+        self._pen_eye_top        = QPen(LID_COLOR, 2.8, solid, round_cap)
+        self._pen_lash           = QPen(LASH_COLOR, 1.2, solid, round_cap)
+        self._pen_lid_low        = QPen(LID_LOW, 1.2)
+
+        # Nas
+        self._pen_nose_hl        = QPen(NOSE_BRIDGE_HL, 2.0, solid, round_cap)
+        self._pen_nose           = QPen(SKIN_SHADOW.darker(110), 1.3, solid, round_cap)
+        self._pen_nostril        = QPen(SKIN_SHADOW.darker(130), 1.2)
+        self._brush_nostril      = QBrush(SKIN_SHADOW.darker(120))
+        self._brush_nose_tip     = QBrush(NOSE_TIP_HL)
+
+        # Gura
+        self._brush_cavity       = QBrush(CAVITY_COLOR)
+        self._brush_teeth        = QBrush(TEETH_COLOR)
+        self._pen_teeth_line     = QPen(TEETH_LINE, 0.8)
+        self._brush_lip          = QBrush(LIP_COLOR)
+        self._brush_lip_closed   = QBrush(LIP_COLOR.darker(108))
+        self._brush_lip_hl       = QBrush(LIP_HL_LOW)
+        self._pen_lip            = QPen(LIP_DARK, 1.6, solid, round_cap)
+        self._pen_dimple         = QPen(SKIN_SHADOW.darker(115), 1.4)
+
+        # Gradienti radiali: opririle de culoare se seteaza o data, iar la
+        # desenare se muta doar centrul (si raza) — vezi _centered()
+        def radial(radius, *stops):
+            g = QRadialGradient(0, 0, radius)
+            for pos, color in stops:
+                g.setColorAt(pos, color)
+            return g
+
+        self._ear_grad        = radial(16, (0, SKIN_BASE.lighter(108)), (1, SKIN_SHADOW))
+        self._side_shade_grad = radial(28, (0, SHADE_SIDE), (1, TRANSPARENT))
+        self._socket_grad     = radial(24, (0, SOCKET_IN), (0.7, SOCKET_MID), (1, SOCKET_OUT))
+        self._iris_grad       = radial(1, (0.00, IRIS_MID.lighter(120)), (0.45, IRIS_MID),
+                                       (0.70, IRIS_OUTER), (0.88, IRIS_INNER),
+                                       (1.00, IRIS_INNER.darker(130)))
+        self._pupil_grad      = radial(1, (0, PUPIL_CENTER), (1, PUPIL_COLOR))
+        self._blush_grad      = radial(22, (0, BLUSH_CENTER), (1, TRANSPARENT))
+
     # ── Componente desenare ───────────────────────────────────────────────
 
     def _draw_neck_shoulders(self, p, cx, cy):
@@ -273,44 +664,28 @@ class FaceAvatarWidget(QWidget):
 
         # Umeri
         shoulder_y = neck_y + neck_h - 8
-        spath = QPainterPath()
-        spath.moveTo(cx - neck_w // 2 - 2, shoulder_y)
-        spath.cubicTo(cx - 50, shoulder_y + 5, cx - 70, shoulder_y + 20, cx - 90, shoulder_y + 28)
-        spath.lineTo(cx + 90, shoulder_y + 28)
-        spath.cubicTo(cx + 70, shoulder_y + 20, cx + 50, shoulder_y + 5, cx + neck_w // 2 + 2, shoulder_y)
-        spath.closeSubpath()
         sg = QLinearGradient(cx - 90, shoulder_y, cx + 90, shoulder_y)
         sg.setColorAt(0, SKIN_SHADOW.darker(110))
         sg.setColorAt(0.5, SKIN_BASE)
         sg.setColorAt(1, SKIN_SHADOW.darker(110))
         p.setBrush(QBrush(sg))
-        p.drawPath(spath)
+        p.drawPath(self._shoulders_path)
 
     def _draw_hair_back(self, p, cx, cy):
         """Strat de par din spate (sub cap)."""
         p.setPen(Qt.PenStyle.NoPen)
 
         # Calota mare
-        hpath = QPainterPath()
-        hpath.moveTo(cx - 78, cy + 15)
-        hpath.cubicTo(cx - 82, cy - 20, cx - 75, cy - 92, cx, cy - 100)
-        hpath.cubicTo(cx + 75, cy - 92, cx + 82, cy - 20, cx + 78, cy + 15)
-        hpath.closeSubpath()
         g = QLinearGradient(cx - 80, cy - 100, cx + 80, cy + 15)
         g.setColorAt(0, HAIR_LIGHT)
         g.setColorAt(0.4, HAIR_BASE)
         g.setColorAt(1, HAIR_DARK)
         p.setBrush(QBrush(g))
-        p.drawPath(hpath)
+        p.drawPath(self._hair_back_path)
 
         # Bucle laterale
-        for side in (-1, 1):
-            lpath = QPainterPath()
-            bx = cx + side * 74
-            lpath.moveTo(bx, cy - 10)
-            lpath.cubicTo(bx + side * 12, cy - 30, bx + side * 15, cy + 10, bx, cy + 30)
-            lpath.cubicTo(bx - side * 5, cy + 15, bx - side * 5, cy, bx, cy - 10)
-            p.setBrush(QBrush(HAIR_DARK))
+        p.setBrush(QBrush(HAIR_DARK))
+        for lpath in self._hair_loop_paths:
             p.drawPath(lpath)
 
     def _draw_ears(self, p, cx, cy):
@@ -320,42 +695,45 @@ class FaceAvatarWidget(QWidget):
             ey = cy + 8
 
             # Urechea exterioara
-            ear_g = QRadialGradient(ex + side * 3, ey, 16)
-            ear_g.setColorAt(0, SKIN_BASE.lighter(108))
-            ear_g.setColorAt(1, SKIN_SHADOW)
-            p.setBrush(QBrush(ear_g))
+            p.setBrush(_centered(self._ear_grad, ex + side * 3, ey))
             p.setPen(QPen(SKIN_SHADOW, 1.5))
             p.drawEllipse(QRectF(ex - 10, ey - 18, 20, 34))
 
             # Detaliu interior (antehelix)
             p.setPen(QPen(SKIN_SHADOW.darker(115), 1.2))
             p.setBrush(Qt.BrushStyle.NoBrush)
-            inner = QPainterPath()
-            inner.moveTo(ex + side * 2, ey - 10)
-            inner.cubicTo(ex + side * 5, ey, ex + side * 4, ey + 10, ex + side * 2, ey + 14)
-            p.drawPath(inner)
-
-    def _draw_face_base(self, p, cx, cy):
-        """Fata - forma de baza cu gradient radial."""
-        rx, ry = 72, 85
-        # Gradient piele: lumina venind din stanga sus
-        grad = QRadialGradient(cx - rx * 0.25, cy - ry * 0.30, max(rx, ry) * 1.6)
-        grad.setColorAt(0.00, SKIN_HIGHLIGHT)
-        grad.setColorAt(0.35, SKIN_BASE)
-        grad.setColorAt(0.70, QColor(230, 175, 120))
-        grad.setColorAt(1.00, SKIN_DEEP)
-
-        p.setPen(QPen(QColor(self._border_color).darker(120), 2.5))
-        p.setBrush(QBrush(grad))
-
+            p.drawPath(self._ear_paths[side])
+
+    def _skin_image(self, dpr: float) -> QImage:
+        """Gradientul radial al pielii, rasterizat o singura data pe un QImage
+        de SKIN_IMG_W x SKIN_IMG_H (coltul lui = (cx-80, cy-85))."""
+        img = self._skin_images.get(dpr)
+        if img is None:
+            rx, ry = 72, 85
+            ox, oy = self.SKIN_IMG_W // 2, ry   # (cx, cy) in coordonatele imaginii
+            # Gradient piele: lumina venind din stanga sus
+            grad = QRadialGradient(ox - rx * 0.25, oy - ry * 0.30, max(rx, ry) * 1.6)
+            grad.setColorAt(0.00, SKIN_HIGHLIGHT)
+            grad.setColorAt(0.35, SKIN_BASE)
+            grad.setColorAt(0.70, SKIN_MID)
+            grad.setColorAt(1.00, SKIN_DEEP)
+            img = self._new_image(self.SKIN_IMG_W, self.SKIN_IMG_H, dpr)
+            ip = QPainter(img)
+            ip.fillRect(0, 0, self.SKIN_IMG_W, self.SKIN_IMG_H, QBrush(grad))
+            ip.end()
+            self._skin_images[dpr] = img
+        return img
+
+    def _draw_face_base(self, p, cx, cy, border_color):
+        """Fata - forma de baza: pielea e un blit decupat dupa conturul fetei."""
         # Forma fata: elipsa usor mai ingusta la barbie
-        fpath = QPainterPath()
-        fpath.moveTo(cx, cy - ry)
-        fpath.cubicTo(cx + rx + 8, cy - ry, cx + rx, cy + ry * 0.3, cx + rx * 0.65, cy + ry)
-        fpath.cubicTo(cx + rx * 0.3, cy + ry + 10, cx - rx * 0.3, cy + ry + 10, cx - rx * 0.65, cy + ry)
-        fpath.cubicTo(cx - rx, cy + ry * 0.3, cx - rx - 8, cy - ry, cx, cy - ry)
-        fpath.closeSubpath()
-        p.drawPath(fpath)
+        p.save()
+        p.setClipPath(self._face_path)
+        skin = self._skin_image(p.device().devicePixelRatioF())
+        p.drawImage(cx - self.SKIN_IMG_W // 2, cy - 85, skin)
+        p.restore()
+        # Conturul (2.5 px) acopera si marginea fara antialiasing a decupajului
+        p.strokePath(self._face_path, QPen(QColor(border_color).darker(120), 2.5))
 
     def _draw_face_shading(self, p, cx, cy):
         """Umbre subtile pe fata (ambient occlusion simulat)."""
@@ -363,24 +741,21 @@ class FaceAvatarWidget(QWidget):
 
         # Umbra sub nas
         nos_sh = QRadialGradient(cx, cy + 22, 18)
-        nos_sh.setColorAt(0, QColor(180, 110, 70, 55))
-        nos_sh.setColorAt(1, QColor(0, 0, 0, 0))
+        nos_sh.setColorAt(0, SHADE_WARM)
+        nos_sh.setColorAt(1, TRANSPARENT)
         p.setBrush(QBrush(nos_sh))
         p.drawEllipse(QRectF(cx - 18, cy + 14, 36, 20))
 
         # Umbra barbie / mandibula
         chin_sh = QRadialGradient(cx, cy + 78, 30)
-        chin_sh.setColorAt(0, QColor(180, 110, 70, 40))
-        chin_sh.setColorAt(1, QColor(0, 0, 0, 0))
+        chin_sh.setColorAt(0, SHADE_CHIN)
+        chin_sh.setColorAt(1, TRANSPARENT)
         p.setBrush(QBrush(chin_sh))
         p.drawEllipse(QRectF(cx - 30, cy + 65, 60, 25))
 
         # Umbra laterala (mandibula stanga/dreapta)
         for side in (-1, 1):
-            side_sh = QRadialGradient(cx + side * 62, cy + 20, 28)
-            side_sh.setColorAt(0, QColor(160, 100, 60, 50))
-            side_sh.setColorAt(1, QColor(0, 0, 0, 0))
-            p.setBrush(QBrush(side_sh))
+            p.setBrush(_centered(self._side_shade_grad, cx + side * 62, cy + 20))
             p.drawEllipse(QRectF(cx + side * 62 - 28, cy + 5, 56, 35))
 
     def _draw_hair_front(self, p, cx, cy):
@@ -389,86 +764,83 @@ class FaceAvatarWidget(QWidget):
         ry = 85
 
         # Freza principala
-        freza = QPainterPath()
-        freza.moveTo(cx - 72, cy - ry * 0.5)
-        freza.cubicTo(cx - 60, cy - ry - 18, cx - 20, cy - ry - 22, cx, cy - ry - 16)
-        freza.cubicTo(cx + 20, cy - ry - 22, cx + 60, cy - ry - 18, cx + 72, cy - ry * 0.5)
-        freza.cubicTo(cx + 55, cy - ry - 8, cx + 30, cy - ry - 12, cx + 10, cy - ry - 6)
-        freza.cubicTo(cx - 10, cy - ry - 12, cx - 40, cy - ry - 8, cx - 72, cy - ry * 0.5)
-        freza.closeSubpath()
         fg = QLinearGradient(cx - 70, cy - ry - 22, cx + 70, cy - ry + 5)
         fg.setColorAt(0, HAIR_LIGHT)
         fg.setColorAt(0.5, HAIR_BASE)
         fg.setColorAt(1, HAIR_DARK)
         p.setBrush(QBrush(fg))
-        p.drawPath(freza)
+        p.drawPath(self._freza_path)
 
         # Suvite de lumina pe par
         p.setPen(QPen(HAIR_LIGHT.lighter(130), 1.5))
-        for dx in [-20, 0, 20]:
-            sx = cx + dx
-            sy = cy - ry - 15
-            strand = QPainterPath()
-            strand.moveTo(sx, sy)
-            strand.cubicTo(sx + 5, sy - 8, sx + 8, sy - 15, sx + 3, sy - 22)
+        for strand in self._hair_strand_paths:
             p.drawPath(strand)
 
     def _draw_eyebrows(self, p, cx, cy, cfg):
-        """Sprancene cu trasaturi fine."""
-        brow_raise = cfg.get("brow_raise", 0.0)
-        brow_angle = cfg.get("brow_angle", 0)
+        """Sprancene cu trasaturi fine (pre-randate pe pixmap, vezi _brow_pixmap)."""
+        # Cuantizare: ridicare in pasi de 0.05 (~0.45 px), unghi in grade intregi
+        q_raise    = round(cfg[BROW_RAISE] * 20) / 20
+        brow_angle = round(cfg[BROW_ANGLE])
 
         for side in (-1, 1):
             bx = cx + side * 26
-            by = cy - 38 - brow_raise * 9
-
-            angle_rad = math.radians(brow_angle * side)
-
-            # Spranceana principala - traseu gros
-            bw = 22
-            bh =  4
-            cos_a = math.cos(angle_rad)
-            sin_a = math.sin(angle_rad)
-
-            x1 = bx - bw / 2 * cos_a
-            y1 = by + bw / 2 * sin_a
-            x2 = bx + bw / 2 * cos_a
-            y2 = by - bw / 2 * sin_a
-            ctrl_x = bx
-            ctrl_y = by - bh - 2
-
-            bpath = QPainterPath()
-            bpath.moveTo(x1, y1)
-            bpath.quadTo(ctrl_x, ctrl_y, x2, y2)
-
-            # Gradient grosime spranceana (mai groasa la coada)
-            for width, alpha in [(4.0, 200), (3.0, 160), (2.0, 100), (1.5, 60)]:
-                p.setPen(QPen(QColor(BROW_COLOR.red(), BROW_COLOR.green(),
-                                     BROW_COLOR.blue(), alpha),
-                              width, Qt.PenStyle.SolidLine,
-                              Qt.PenCapStyle.RoundCap,
-                              Qt.PenJoinStyle.RoundJoin))
-                p.drawPath(bpath)
-
-            # Suvite fine de par in spranceana
-            p.setPen(QPen(QColor(BROW_COLOR.red(), BROW_COLOR.green(),
-                                  BROW_COLOR.blue(), 120), 1.0,
-                          Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
-            for i in range(5):
-                t = i / 4.0
-                hx = x1 + (x2 - x1) * t
-                hy = y1 + (y2 - y1) * t
-                ox = -sin_a * 4
-                oy = -cos_a * 4
-                strand = QPainterPath()
-                strand.moveTo(hx - ox * 0.3, hy - oy * 0.3)
-                strand.lineTo(hx + ox * 0.7, hy + oy * 0.7)
-                p.drawPath(strand)
+            by = cy - 38 - q_raise * 9
+            top = math.floor(by) - self.BROW_PIX_H // 2
+            pix = self._brow_pixmap(q_raise, brow_angle * side, by - math.floor(by))
+            p.drawPixmap(bx - self.BROW_PIX_W // 2, top, pix)
+
+    def _brow_pixmap(self, q_raise: float, angle: int, frac_y: float) -> QPixmap:
+        key = (q_raise, angle, self.devicePixelRatioF())
+        pix = self._brow_cache.get(key)
+        if pix is None:
+            pix = self._new_pixmap(self.BROW_PIX_W, self.BROW_PIX_H)
+            pp = QPainter(pix)
+            pp.setRenderHint(QPainter.RenderHint.Antialiasing)
+            # Partea fractionara a lui Y e inclusa in desen, pixmap-ul se pune la Y intreg
+            self._paint_brow(pp, self.BROW_PIX_W / 2, self.BROW_PIX_H // 2 + frac_y, angle)
+            pp.end()
+            self._brow_cache[key] = pix
+        return pix
+
+    def _paint_brow(self, p, bx, by, angle):
+        """O spranceana centrata in (bx, by), inclinata cu `angle` grade."""
+        # Spranceana principala - traseu gros
+        bw = 22
+        bh =  4
+        cos_a, sin_a = _brow_trig(float(angle))
+
+        x1 = bx - bw / 2 * cos_a
+        y1 = by + bw / 2 * sin_a
+        x2 = bx + bw / 2 * cos_a
+        y2 = by - bw / 2 * sin_a
+        ctrl_x = bx
+        ctrl_y = by - bh - 2
+
+        bpath = QPainterPath()
+        bpath.moveTo(x1, y1)
+        bpath.quadTo(ctrl_x, ctrl_y, x2, y2)
+
+        # Margine moale, apoi miezul spranceanei
+        p.fillPath(self._brow_soft_stroker.createStroke(bpath), self._brow_soft_brush)
+        p.fillPath(self._brow_stroker.createStroke(bpath), self._brow_brush)
+
+        # Suvite fine de par in spranceana
+        p.setPen(self._pen_brow_strand)
+        for i in range(5):
+            t = i / 4.0
+            hx = x1 + (x2 - x1) * t
+            hy = y1 + (y2 - y1) * t
+            ox = -sin_a * 4
+            oy = -cos_a * 4
+            strand = QPainterPath()
+            strand.moveTo(hx - ox * 0.3, hy - oy * 0.3)
+            strand.lineTo(hx + ox * 0.7, hy + oy * 0.7)
+            p.drawPath(strand)
 
     def _draw_eyes(self, p, cx, cy, cfg):
         """Ochi detaliati: sclera, iris gradient, pupila, 2 sclipiri, gene."""
-        eye_open = cfg.get("eye_open", 1.0) * self._blink_state
-        px, py   = cfg.get("pupil", (0, 0))
+        eye_open = cfg[EYE_OPEN] * self._blink_state
+        iris_ox, iris_oy = round(cfg[IRIS_OX]), round(cfg[IRIS_OY])
 
         for side in (-1, 1):
             ex = cx + side * 26
@@ -479,76 +851,62 @@ class FaceAvatarWidget(QWidget):
 
             # Umbra socket ochi
             p.setPen(Qt.PenStyle.NoPen)
-            sock_g = QRadialGradient(ex, ey, ew)
-            sock_g.setColorAt(0, QColor(160, 100, 60, 0))
-            sock_g.setColorAt(0.7, QColor(140,  80, 40, 30))
-            sock_g.setColorAt(1,   QColor(120,  60, 20, 60))
-            p.setBrush(QBrush(sock_g))
+            p.setBrush(_centered(self._socket_grad, ex, ey))
             p.drawEllipse(QRectF(ex - ew * 0.7, ey - eh * 0.7, ew * 1.4, eh * 1.4))
 
             # Sclera (albul ochiului)
-            p.setPen(QPen(QColor(160, 120, 90, 180), 1.0))
-            p.setBrush(QBrush(EYE_WHITE))
+            p.setPen(self._pen_sclera)
+            p.setBrush(self._brush_eye_white)
             p.drawEllipse(QRectF(ex - ew / 2, ey - eh / 2, ew, eh))
 
             if eye_open > 0.12:
                 # --- Iris gradient ---
                 iris_r = min(8.5, eh * 0.45)
-                iris_x = ex + px * min(0.5, iris_r * 0.15)
-                iris_y = ey + py * min(0.5, iris_r * 0.12)
+                iris_x = ex + iris_ox
+                iris_y = ey + iris_oy
 
                 # Iris exterior (inel inchis)
-                ig = QRadialGradient(iris_x - iris_r * 0.25, iris_y - iris_r * 0.25, iris_r * 2.2)
-                ig.setColorAt(0.00, IRIS_MID.lighter(120))
-                ig.setColorAt(0.45, IRIS_MID)
-                ig.setColorAt(0.70, IRIS_OUTER)
-                ig.setColorAt(0.88, IRIS_INNER)
-                ig.setColorAt(1.00, IRIS_INNER.darker(130))
                 p.setPen(Qt.PenStyle.NoPen)
-                p.setBrush(QBrush(ig))
+                p.setBrush(_centered(self._iris_grad, iris_x - iris_r * 0.25,
+                                     iris_y - iris_r * 0.25, iris_r * 2.2))
                 p.drawEllipse(QRectF(iris_x - iris_r, iris_y - iris_r, iris_r * 2, iris_r * 2))
 
                 # Pupila
                 pur = iris_r * 0.52
-                pg = QRadialGradient(iris_x - pur * 0.2, iris_y - pur * 0.2, pur * 1.8)
-                pg.setColorAt(0, QColor(35, 25, 15))
-                pg.setColorAt(1, PUPIL_COLOR)
-                p.setBrush(QBrush(pg))
+                p.setBrush(_centered(self._pupil_grad, iris_x - pur * 0.2,
+                                     iris_y - pur * 0.2, pur * 1.8))
                 p.drawEllipse(QRectF(iris_x - pur, iris_y - pur, pur * 2, pur * 2))
 
                 # Sclipire primara (mare)
-                p.setBrush(QBrush(QColor(255, 255, 255, 220)))
+                p.setBrush(self._brush_glint_big)
                 p.drawEllipse(QRectF(iris_x - pur * 0.25,
                                      iris_y - iris_r * 0.75,
                                      iris_r * 0.45, iris_r * 0.35))
                 # Sclipire secundara (mica)
-                p.setBrush(QBrush(QColor(255, 255, 255, 140)))
+                p.setBrush(self._brush_glint_small)
                 p.drawEllipse(QRectF(iris_x + pur * 0.45,
                                      iris_y + iris_r * 0.15,
                                      iris_r * 0.22, iris_r * 0.18))
 
             # Pleoapa superioara (linie groasa + umbra)
             if eye_open > 0.08:
-                p.setPen(QPen(QColor(60, 35, 20, 200), 2.8,
-                              Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+                p.setPen(self._pen_eye_top)
                 p.setBrush(Qt.BrushStyle.NoBrush)
                 p.drawArc(QRectF(ex - ew / 2, ey - eh / 2, ew, eh), 0, 180 * 16)
 
                 # Gene superioare (linii scurte)
-                p.setPen(QPen(QColor(50, 30, 15, 180), 1.2,
-                              Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
-                for i in range(7):
-                    angle = math.radians(20 + i * 20)
-                    gx = ex - (ew / 2) * math.cos(angle)
-                    gy = ey - (eh / 2) * abs(math.sin(angle))
-                    dir_x = -math.cos(angle) * 0.3
-                    dir_y = -abs(math.sin(angle)) * 0.9 - 0.5
-                    length = 4.5 + abs(math.sin(angle)) * 2
+                p.setPen(self._pen_lash)
+                for ca, _sa, asa in _LASH_TRIG:
+                    gx = ex - (ew / 2) * ca
+                    gy = ey - (eh / 2) * asa
+                    dir_x = -ca * 0.3
+                    dir_y = -asa * 0.9 - 0.5
+                    length = 4.5 + asa * 2
                     p.drawLine(QPointF(gx, gy),
                                QPointF(gx + dir_x * length, gy + dir_y * length))
 
             # Pleoapa inferioara subtila
-            p.setPen(QPen(QColor(160, 110, 80, 80), 1.2))
+            p.setPen(self._pen_lid_low)
             p.setBrush(Qt.BrushStyle.NoBrush)
             p.drawArc(QRectF(ex - ew / 2, ey - eh / 2, ew, eh), 0, -180 * 16)
 
@@ -557,43 +915,53 @@ class FaceAvatarWidget(QWidget):
         p.setBrush(Qt.BrushStyle.NoBrush)
 
         # Highlight pe bridge
-        p.setPen(QPen(QColor(255, 230, 200, 90), 2.0,
-                      Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+        p.setPen(self._pen_nose_hl)
         p.drawLine(QPointF(cx + 1, cy - 8), QPointF(cx + 1, cy + 10))
 
         # Forma nas (profil)
-        p.setPen(QPen(SKIN_SHADOW.darker(110), 1.3,
-                      Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
-        npath = QPainterPath()
-        npath.moveTo(cx - 1, cy - 5)
-        npath.cubicTo(cx + 4, cy + 5, cx + 10, cy + 12, cx + 11, cy + 18)
-        npath.cubicTo(cx + 7, cy + 22, cx + 2, cy + 22, cx, cy + 21)
-        p.drawPath(npath)
-        npath2 = QPainterPath()
-        npath2.moveTo(cx, cy + 21)
-        npath2.cubicTo(cx - 2, cy + 22, cx - 7, cy + 22, cx - 11, cy + 18)
-        npath2.cubicTo(cx - 10, cy + 12, cx - 4, cy + 5, cx - 1, cy - 5)
-        p.drawPath(npath2)
+        p.setPen(self._pen_nose)
+        for npath in self._nose_paths:
+            p.drawPath(npath)
 
         # Narile
-        p.setPen(QPen(SKIN_SHADOW.darker(130), 1.2))
-        p.setBrush(QBrush(QColor(SKIN_SHADOW.darker(120))))
+        p.setPen(self._pen_nostril)
+        p.setBrush(self._brush_nostril)
         for side in (-1, 1):
             p.drawEllipse(QRectF(cx + side * 6 - 4, cy + 16, 8, 6))
 
         # Highlight varf nas
         p.setPen(Qt.PenStyle.NoPen)
-        p.setBrush(QBrush(QColor(255, 240, 220, 100)))
+        p.setBrush(self._brush_nose_tip)
         p.drawEllipse(QRectF(cx - 4, cy + 12, 8, 7))
 
     def _draw_mouth(self, p, cx, cy, cfg):
-        """Gura cu Cupid's bow, highlight buza inferioara."""
-        smile = cfg.get("smile", 0.0)
-        mo    = self._mouth_open
+        """Gura: deschiderea (pasi de 1/6) si zambetul (pasi de 0.05) sunt
+        cuantizate, iar fiecare poza e randata o singura data pe un pixmap."""
+        mo_q    = round(self._mouth_open * 6) / 6
+        smile_q = round(cfg[SMILE] * 20) / 20
+        key = (mo_q, smile_q, self.devicePixelRatioF())
+
+        pix = self._mouth_cache.get(key)
+        if pix is None:
+            pix = self._new_pixmap(self.MOUTH_PIX_W, self.MOUTH_PIX_H)
+            pp = QPainter(pix)
+            pp.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._paint_mouth(pp, self.MOUTH_PIX_W // 2, self.MOUTH_PIX_H // 2,
+                              smile_q, mo_q)
+            pp.end()
+            self._mouth_cache[key] = pix
+            if len(self._mouth_cache) > self.MOUTH_CACHE_MAX:
+                self._mouth_cache.popitem(last=False)
+        else:
+            self._mouth_cache.move_to_end(key)
 
         my = cy + 42    # Y centrul gurii
+        p.drawPixmap(cx - self.MOUTH_PIX_W // 2, my - self.MOUTH_PIX_H // 2, pix)
+
+    def _paint_mouth(self, p, cx, my, smile, mo):
+        """Gura cu Cupid's bow, highlight buza inferioara, centrata in (cx, my)."""
         mw = 28         # semilargime
-        curve = smile * 13   # pozitiv=zambesc, negativ=trist
+        curve = round(smile * 13)   # pozitiv=zambesc, negativ=trist (px intregi)
 
         if mo > 0.05:
             # ── Gura deschisa ──────────────────────────────────────────────
@@ -611,49 +979,32 @@ class FaceAvatarWidget(QWidget):
                              cx - mw + 3, my)
             interior.closeSubpath()
             p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QBrush(QColor(60, 20, 20)))
+            p.setBrush(self._brush_cavity)
             p.drawPath(interior)
 
             # Dinti (daca deschisa suficient)
             if mo > 0.28:
-                p.setBrush(QBrush(QColor(248, 246, 240)))
+                p.setBrush(self._brush_teeth)
                 tooth_h = min(open_h * 0.45, 9)
                 p.drawRoundedRect(
                     QRectF(cx - mw + 6, my + 1, (mw - 6) * 2, tooth_h),
                     2.5, 2.5
                 )
                 # Linie despartitoare dinti
-                p.setPen(QPen(QColor(200, 195, 185, 120), 0.8))
+                p.setPen(self._pen_teeth_line)
                 p.drawLine(QPointF(cx, my + 1), QPointF(cx, my + tooth_h))
 
             # Buza superioara (deasupra gurii deschise)
             p.setPen(Qt.PenStyle.NoPen)
-            upper = QPainterPath()
-            upper.moveTo(cx - mw + 2, my)
-            # Cupid's bow
-            upper.cubicTo(cx - mw * 0.5, my - 5 - curve, cx - mw * 0.15, my - 8 - curve,
-                          cx, my - 7 - curve)
-            upper.cubicTo(cx + mw * 0.15, my - 8 - curve, cx + mw * 0.5, my - 5 - curve,
-                          cx + mw - 2, my)
-            upper.quadTo(cx, my - curve + 2, cx - mw + 2, my)
-            upper.closeSubpath()
-            p.setBrush(QBrush(LIP_COLOR))
-            p.drawPath(upper)
+            p.setBrush(self._brush_lip)
+            p.drawPath(_upper_lip_path(cx, my, mw, curve, True))
 
         else:
             # ── Gura inchisa ───────────────────────────────────────────────
             # Buza superioara cu Cupid's bow
-            upper = QPainterPath()
-            upper.moveTo(cx - mw + 2, my)
-            upper.cubicTo(cx - mw * 0.5, my - 5 - curve,
-                          cx - mw * 0.15, my - 8 - curve, cx, my - 7 - curve)
-            upper.cubicTo(cx + mw * 0.15, my - 8 - curve,
-                          cx + mw * 0.5, my - 5 - curve, cx + mw - 2, my)
-            upper.lineTo(cx, my - curve * 0.3)
-            upper.closeSubpath()
             p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QBrush(LIP_COLOR.darker(108)))
-            p.drawPath(upper)
+            p.setBrush(self._brush_lip_closed)
+            p.drawPath(_upper_lip_path(cx, my, mw, curve, False))
 
             # Buza inferioara
             lower = QPainterPath()
@@ -662,16 +1013,16 @@ class FaceAvatarWidget(QWidget):
                           cx + mw * 0.6, my + 7 - curve * 0.3, cx + mw - 2, my)
             lower.quadTo(cx, my + 5 - curve * 0.2, cx - mw + 2, my)
             lower.closeSubpath()
-            p.setBrush(QBrush(LIP_COLOR))
+            p.setBrush(self._brush_lip)
             p.drawPath(lower)
 
             # Highlight buza inferioara
             p.setPen(Qt.PenStyle.NoPen)
-            p.setBrush(QBrush(QColor(240, 170, 160, 120)))
+            p.setBrush(self._brush_lip_hl)
             p.drawEllipse(QRectF(cx - 8, my + 2 - curve * 0.3, 16, 5))
 
         # Linie gurii
-        p.setPen(QPen(LIP_DARK, 1.6, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap))
+        p.setPen(self._pen_lip)
         p.setBrush(Qt.BrushStyle.NoBrush)
         lpath = QPainterPath()
         lpath.moveTo(cx - mw + 2, my)
@@ -680,7 +1031,7 @@ class FaceAvatarWidget(QWidget):
 
         # Gropituri zambet
         if smile > 0.35:
-            p.setPen(QPen(SKIN_SHADOW.darker(115), 1.4))
+            p.setPen(self._pen_dimple)
             for side in (-1, 1):
                 dx = side * (mw - 1)
                 dim = QPainterPath()
@@ -694,15 +1045,11 @@ class FaceAvatarWidget(QWidget):
         for side in (-1, 1):
             bx = cx + side * 44
             by = cy + 22
-            bg = QRadialGradient(bx, by, 22)
-            bg.setColorAt(0, QColor(SKIN_BLUSH.red(), SKIN_BLUSH.green(),
-                                    SKIN_BLUSH.blue(), 90))
-            bg.setColorAt(1, QColor(0, 0, 0, 0))
-            p.setBrush(QBrush(bg))
+            p.setBrush(_centered(self._blush_grad, bx, by))
             p.drawEllipse(QRectF(bx - 22, by - 14, 44, 28))
 
-    def _draw_label(self, p, W, H):
-        p.setPen(QPen(QColor(self._border_color).darker(110)))
+    def _draw_label(self, p, W, H, border_color, label_text):
+        p.setPen(QPen(QColor(border_color).darker(110)))
         p.setFont(QFont("Arial", 9, QFont.Weight.Bold))
         p.drawText(QRectF(0, H - 22, W, 20),
-                   Qt.AlignmentFlag.AlignCenter, self._label_text)
+                   Qt.AlignmentFlag.AlignCenter, label_text)
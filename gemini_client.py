@@ -1,25 +1,33 @@
 from __future__ import annotations
+import functools
 import os
-from dotenv import load_dotenv
+from typing import Iterator
 
-load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> None:
+    # .env se citește o singură dată, la prima folosire (nu la import)
+    from dotenv import load_dotenv
+    load_dotenv()
 
 def gemini_available() -> bool:
+    _load_env()
     return bool(os.getenv("GEMINI_API_KEY"))
 
+@functools.lru_cache(maxsize=1)
 def make_client():
     # SDK oficial: google-genai (GenAI SDK)  :contentReference[oaicite:2]{index=2}
+    # Importul SDK-ului e lent (~0.2-0.5 s) -> amânat și făcut o singură dată;
+    # clientul (și pool-ul lui HTTP) e refolosit la apelurile următoare.
+    _load_env()
     from google import genai
     api_key = os.getenv("GEMINI_API_KEY", "")
     if not api_key:
         raise RuntimeError("GEMINI_API_KEY lipsă în .env")
     return genai.Client(api_key=api_key)
 
-def generate_quiz_from_text(text: str, n: int = 5) -> str:
-    client = make_client()
-    model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-
-    prompt = f"""
+def _quiz_prompt(text: str, n: int) -> str:
+    return f"""
 Ești un profesor pentru copii (clasa 1-4). Generează {n} întrebări scurte
 din textul de mai jos. Format:
 1) întrebare
@@ -29,8 +37,17 @@ din textul de mai jos. Format:
 TEXT:
 {text}
 """
-    resp = client.models.generate_content(
+
+def generate_quiz_from_text_stream(text: str, n: int = 5) -> Iterator[str]:
+    """Ca generate_quiz_from_text, dar întoarce textul pe bucăți, pe măsură
+    ce sosește — avatarul poate începe să vorbească de la primul fragment."""
+    client = make_client()
+    model = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
+    for chunk in client.models.generate_content_stream(
         model=model,
-        contents=prompt,
-    )
-    return (resp.text or "").strip()
+        contents=_quiz_prompt(text, n),
+    ):
+        yield chunk.text or ""
+
+def generate_quiz_from_text(text: str, n: int = 5) -> str:
+    return "".join(generate_quiz_from_text_stream(text, n)).strip()
@@ -18,27 +18,53 @@ Utilizare:
   python generate_exercises_batch.py --dry-run                # preview fără inserare
   python generate_exercises_batch.py --phase practice         # doar o fază
   python generate_exercises_batch.py --force                  # re-generează chiar dacă există
+  python generate_exercises_batch.py --concurrency 6          # 6 perechi lecție/fază în paralel
+  python generate_exercises_batch.py --no-cache               # ignoră .exercise_cache/
 """
-import argparse, time, sys
+import argparse, contextlib, functools, hashlib, json, logging, os, queue, random, threading, time, sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator, Optional
 
 from database import Database
 from deepseek_client import DeepSeekClient
 from md_library import ManualLibrary, load_md_chunks
 
+# rich (opțional): bară de progres + log-uri afișate deasupra ei
+try:
+    from rich.logging import RichHandler
+    from rich.progress import Progress
+except ImportError:
+    RichHandler = None    # type: ignore[assignment,misc]
+    Progress = None       # type: ignore[assignment,misc]
+
+# Logging în loc de print: thread-safe sub workerii concurenți (liniile nu se
+# mai amestecă) și fără flush per linie; configurat în __main__.
+log = logging.getLogger("exgen")
+
 # ── Configurare ──────────────────────────────────────────────────────────────
 TARGET: dict[str, int] = {"pretest": 3, "practice": 8, "posttest": 5}
-DELAY_BETWEEN_CALLS    = 4    # secunde între apeluri DeepSeek (rate limiting)
+MIN_CALL_INTERVAL      = 1.0  # secunde minim între pornirile apelurilor DeepSeek
+BACKOFF_MAX            = 60   # plafonul pauzei după un batch eșuat
+MAX_BATCH_RETRIES      = 3    # reîncercări ale unui batch gol înainte de a opri faza
 MAX_CHUNKS_CONTEXT     = 3    # câte chunks din manual folosim ca context
 CHUNK_MAX_CHARS        = 900
-BATCH_SIZE             = 3    # max exerciții per apel DeepSeek
+BATCH_SIZE             = 3    # exerciții per apel DeepSeek la pornire (apoi AIMD)
+BATCH_SIZE_MAX         = 12   # plafonul lotului adaptiv
 TIMEOUT_OVERRIDE       = 120  # fallback timeout (streaming nu are read timeout)
+DEFAULT_CONCURRENCY    = 4    # perechi (lecție, fază) în zbor; ≤ OLLAMA_NUM_PARALLEL
+CACHE_DIR              = Path(".exercise_cache")   # generări salvate pe disc
 
 
-def get_theory_context(lib: ManualLibrary, lesson: dict,
-                       max_chunks: int = MAX_CHUNKS_CONTEXT) -> str:
-    """Returnează textul de teorie pentru o lecție (din .md sau din DB fallback)."""
-    entry = lib.get_default(lesson["subject"], lesson["grade"])
+@functools.lru_cache(maxsize=256)
+def _theory_for(lib: ManualLibrary, subject: str, grade: int,
+                max_chunks: int = MAX_CHUNKS_CONTEXT) -> str:
+    """Teoria din manualul .md al materiei/clasei ('' dacă nu există).
+
+    Memoizată per (subject, grade): toate lecțiile și fazele unei materii
+    folosesc același manual, deci îl parsăm o singură dată per rulare.
+    """
+    entry = lib.get_default(subject, grade)
     if entry:
         md_path = Path(lib.manuals_dir) / entry.file
         if md_path.exists():
@@ -47,44 +73,163 @@ def get_theory_context(lib: ManualLibrary, lesson: dict,
                 if chunks:
                     return "\n\n".join(chunks[:max_chunks])
             except Exception as e:
-                print(f"   ⚠️  Nu am putut citi manualul {entry.file}: {e}")
+                log.warning("   ⚠️  Nu am putut citi manualul %s: %s", entry.file, e)
+    return ""
+
+
+# (subject, grade) → Future cu teoria; umplut de prefetch_theory la începutul run()
+_theory_prefetch: dict[tuple[str, int], Future] = {}
+
+
+def prefetch_theory(pool: ThreadPoolExecutor, lib: ManualLibrary,
+                    lessons: list[dict]) -> None:
+    """Parsează manualele în ordinea lecțiilor pe un thread separat.
+
+    Workerii stau cea mai mare parte a timpului după DeepSeek; între timp
+    manualul lecțiilor următoare e deja citit, iar get_theory_context doar
+    ia rezultatul din Future (fără parsare dublă dacă ajunge primul).
+    """
+    for lesson in lessons:
+        key = (lesson["subject"], lesson["grade"])
+        if key not in _theory_prefetch:
+            _theory_prefetch[key] = pool.submit(_theory_for, lib, *key)
+
+
+def get_theory_context(lib: ManualLibrary, lesson: dict,
+                       max_chunks: int = MAX_CHUNKS_CONTEXT) -> str:
+    """Returnează textul de teorie pentru o lecție (din .md sau din DB fallback)."""
+    fut = _theory_prefetch.get((lesson["subject"], lesson["grade"]))
+    if fut is not None and max_chunks == MAX_CHUNKS_CONTEXT:
+        theory = fut.result()   # parsat deja în fundal (sau aproape gata)
+    else:
+        theory = _theory_for(lib, lesson["subject"], lesson["grade"], max_chunks)
+    if theory:
+        return theory
     # fallback: teoria stocată în DB
     return lesson.get("theory") or lesson.get("summary") or ""
 
 
+def _cache_file(cache_dir: Optional[Path], ds: DeepSeekClient, lesson: dict,
+                *parts) -> Optional[Path]:
+    """Fișierul de cache pentru o generare: sha1 peste lecție, model și parts
+    (fază, câte exerciții, batch, teorie). None când cache-ul e dezactivat."""
+    if cache_dir is None:
+        return None
+    raw = "|".join(str(x) for x in (lesson["subject"], lesson["grade"],
+                                    lesson["title"], ds.model, *parts))
+    return cache_dir / f"{hashlib.sha1(raw.encode('utf-8')).hexdigest()}.json"
+
+
+def _cache_load(path: Optional[Path]):
+    """Generarea salvată anterior, sau None (lipsă / fișier corupt)."""
+    if path is None or not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_store(path: Optional[Path], data) -> None:
+    """Salvează atomic (tmp + replace): un worker oprit nu lasă JSON trunchiat."""
+    if path is None or not data:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        log.warning("   ⚠️  Nu am putut salva în cache: %s", e)
+
+
+_pace_lock = threading.Lock()
+_next_call_at = 0.0   # time.monotonic() de la care poate porni următorul apel
+
+
+def pace_calls() -> None:
+    """Distanțează pornirile apelurilor DeepSeek la MIN_CALL_INTERVAL (global,
+    pentru toți workerii). Pe un server sănătos nu se doarme deloc: apelul
+    durează oricum mai mult decât intervalul."""
+    global _next_call_at
+    with _pace_lock:
+        now = time.monotonic()
+        wait = _next_call_at - now
+        _next_call_at = max(now, _next_call_at) + MIN_CALL_INTERVAL
+    if wait > 0:
+        time.sleep(wait)
+
+
+def backoff_delay(retries: int) -> float:
+    """Pauză exponențială cu jitter după al `retries`-lea eșec consecutiv."""
+    return min(BACKOFF_MAX, 2 ** retries + random.uniform(0, 1))
+
+
 def wait_for_cooldown(ds: DeepSeekClient) -> None:
-    """Dacă circuit breaker-ul e activ, așteptăm să expire și resetăm starea."""
-    remaining = ds._cooldown_until - time.time()
-    if remaining > 0:
-        print(f"   ⏳ Circuit breaker activ — aștept {remaining:.0f}s...")
-        time.sleep(remaining + 1)
-        ds._consecutive_timeouts = 0
-        ds._cooldown_until = 0.0
-        ds._available = None   # forțăm re-verificarea la următorul apel
-        print("   ▶️  Reluăm după cooldown")
+    """Dacă circuit breaker-ul e activ, așteptăm să se închidă.
+
+    Workerii dorm pe același threading.Event al clientului și pornesc toți
+    în momentul în care timer-ul breaker-ului îl resetează — fără polling.
+    """
+    if ds._breaker_closed.is_set():
+        return
+    remaining = max(0.0, ds._cooldown_until - time.monotonic())
+    log.info("   ⏳ Circuit breaker activ — aștept %.0fs...", remaining)
+    ds._breaker_closed.wait(timeout=remaining + 5)   # +5: marjă pentru timer
+    log.info("   ▶️  Reluăm după cooldown")
 
 
 def generate_in_batches(ds: DeepSeekClient, lesson: dict, theory: str,
-                        phase: str, needed: int) -> list:
-    """Generează `needed` exerciții în batch-uri de maxim BATCH_SIZE per apel."""
-    all_exercises: list = []
+                        phase: str, needed: int,
+                        cache_dir: Optional[Path] = None) -> Iterator[list]:
+    """Generează `needed` exerciții în batch-uri adaptive (ds._adaptive_batch).
+
+    Mărimea lotului crește cu 1 după fiecare batch reușit (până la
+    BATCH_SIZE_MAX) și se înjumătățește după unul gol, deci pe un model
+    sănătos facem mai puține apeluri, iar sub presiune cerem mai puțin.
+
+    Generator: fiecare exercițiu e dat mai departe (spre writer) imediat ce
+    obiectul lui s-a închis în stream-ul DeepSeek, deci insertul se suprapune
+    cu generarea restului batch-ului. Batch-urile din cache vin întregi.
+    Un batch gol se reîncearcă de MAX_BATCH_RETRIES ori cu backoff exponențial
+    + jitter; după un batch reușit nu se mai doarme (doar pace_calls).
+    Cu cache_dir, fiecare batch reușit se salvează pe disc; o re-rulare (sau
+    un insert eșuat) refolosește generarea fără un nou apel DeepSeek.
+    """
     remaining = needed
     batch_num = 0
+    retries   = 0
 
     while remaining > 0:
-        batch_num += 1
-        count = min(remaining, BATCH_SIZE)
-
+        if not retries:
+            batch_num += 1
+
+        # Cheia nu conține mărimea lotului: _adaptive_batch e comun tuturor
+        # workerilor, deci la re-rulare loturile ar avea alte mărimi și
+        # cache-ul n-ar mai nimeri. (fază, needed, batch) e determinist.
+        cache_path = _cache_file(cache_dir, ds, lesson, phase, needed, batch_num, theory)
+        cached = _cache_load(cache_path)
+        if isinstance(cached, list) and cached:
+            log.info("   → batch %d: %d exerciții din cache", batch_num, len(cached))
+            remaining -= len(cached)
+            yield cached
+            continue
+
+        count = min(remaining, ds._adaptive_batch)
         wait_for_cooldown(ds)
 
         if not ds.available:
-            print(f"   ❌ DeepSeek indisponibil după cooldown — opresc generarea")
+            log.error("   ❌ DeepSeek indisponibil după cooldown — opresc generarea")
             break
 
-        print(f"   → batch {batch_num}: {count} exerciții"
-              f"{' (mai rămân ' + str(remaining - count) + ' după)' if remaining - count > 0 else ''}")
+        log.info("   → batch %d: %d exerciții%s", batch_num, count,
+                 f" (mai rămân {remaining - count} după)" if remaining - count > 0 else "")
 
-        exercises = ds.generate_exercises(
+        pace_calls()
+        exercises: list = []
+        for ex in ds.iter_exercises(
             lesson_title  = lesson["title"],
             grade         = lesson["grade"],
             subject       = lesson["subject"],
@@ -92,20 +237,199 @@ def generate_in_batches(ds: DeepSeekClient, lesson: dict, theory: str,
             count         = count,
             phase         = phase,
             chunk_context = theory,
-            streaming     = True,   # evită read timeout pe modele lente (8b+)
-        )
+            batch         = batch_num,
+        ):
+            # fiecare exercițiu pleacă spre writer cât modelul îl scrie pe următorul
+            exercises.append(ex)
+            yield [ex]
 
         if exercises:
-            all_exercises.extend(exercises)
+            _cache_store(cache_path, exercises)
             remaining -= len(exercises)
-        else:
-            print(f"   ⚠️  Batch {batch_num} a returnat 0 exerciții — opresc faza")
+            retries = 0
+            ds._adaptive_batch = min(BATCH_SIZE_MAX, ds._adaptive_batch + 1)
+            continue
+
+        ds._adaptive_batch = max(1, ds._adaptive_batch // 2)
+        if retries >= MAX_BATCH_RETRIES:
+            log.warning("   ⚠️  Batch %d a returnat 0 exerciții de %d ori — opresc faza",
+                        batch_num, retries + 1)
             break
+        retries += 1
+        delay = backoff_delay(retries)
+        log.warning("   ⚠️  Batch %d a returnat 0 exerciții — reîncerc în %.1fs (lot %d)",
+                    batch_num, delay, ds._adaptive_batch)
+        time.sleep(delay)
+
+
+def _exercise_rows(lesson_id: int, phase: str, exercises: list) -> list[tuple]:
+    """Rândurile pentru add_exercises_bulk (ordinea parametrilor din add_exercise)."""
+    return [
+        (lesson_id, ex["enunt"], ex["raspuns"], phase,
+         "choice" if ex.get("choices") else "text",
+         ex.get("choices"), ex.get("hint1"), ex.get("hint2"), ex.get("hint3"),
+         ex.get("explicatie"), int(ex.get("dificultate", 1)))
+        for ex in exercises
+    ]
+
+
+def db_writer(db: Database, sink: queue.Queue, totals: dict) -> None:
+    """Thread-ul care scrie în SQLite batch-urile puse în `sink` de workeri.
+
+    Elementele sunt (lesson_id, phase, exercises, tag); None oprește thread-ul.
+    La fiecare trezire golește tot ce s-a adunat între timp în coadă și scrie
+    într-o singură tranzacție add_exercises_bulk (care sare enunțurile deja
+    existente pentru aceeași lecție/fază).
+    """
+    done = False
+    while not done:
+        items = [sink.get()]
+        while True:
+            try:
+                items.append(sink.get_nowait())
+            except queue.Empty:
+                break
+        rows: list[tuple] = []
+        for item in items:
+            if item is None:
+                done = True
+                continue
+            lid, phase, exercises, _ = item
+            rows += _exercise_rows(lid, phase, exercises)
+        try:
+            if rows:
+                n = db.add_exercises_bulk(rows)
+                totals["added"] += n
+                tags = {item[3] for item in items if item is not None}
+                label = tags.pop() if len(tags) == 1 else f"{len(tags)} lecții |"
+                dup = f" ({len(rows) - n} duplicate sărite)" if n < len(rows) else ""
+                log.info("   %s 💾 %d exerciții inserate%s", label, n, dup)
+        except Exception as e:
+            log.warning("   ⚠️  Insert error: %s", e)
+            totals["errors"] += 1
+        finally:
+            for _ in items:
+                sink.task_done()
+
+
+def process_lesson_phase(sink: queue.Queue, ds: DeepSeekClient, lib: ManualLibrary,
+                         lesson: dict, phase: str, have: int, tag: str,
+                         args: argparse.Namespace) -> tuple[int, int, int]:
+    """Procesează o pereche (lecție, fază). Returnează (generate, sărite, erori).
+
+    Rulează pe un worker din pool: apelul DeepSeek e I/O pur, deci mai multe
+    perechi pot aștepta modelul simultan. Fiecare batch merge în `sink`, unde
+    db_writer îl inserează cât timp workerul cere deja următorul batch.
+    """
+    lid    = lesson["id"]
+    subj   = lesson["subject"]
+    grade  = lesson["grade"]
+    target = TARGET[phase]
+
+    if have >= target and not args.force:
+        log.info("   %s %s: %d/%d ✅ skip", tag, phase, have, target)
+        return 0, 1, 0
+
+    needed = target - have
+    log.info("   %s %s: %d/%d — generez %d exerciții...", tag, phase, have, target, needed)
+
+    if args.dry_run:
+        log.info("   %s [DRY-RUN] ar genera %d exerciții", tag, needed)
+        return 0, 0, 0
+
+    theory = get_theory_context(lib, lesson)
+    if not theory:
+        log.warning("   ⚠️  Nicio teorie disponibilă pentru %s cls%s, generez generic", subj, grade)
+
+    got = 0
+    for batch in generate_in_batches(ds, lesson, theory, phase, needed,
+                                     None if args.no_cache else CACHE_DIR):
+        sink.put((lid, phase, batch, tag))
+        got += len(batch)
+
+    if not got:
+        log.error("   %s ❌ DeepSeek nu a returnat exerciții pentru %s", tag, phase)
+        return 0, 0, 1
+
+    log.info("   %s ✅ %d/%d exerciții generate (%s)", tag, got, needed, phase)
+    return got, 0, 0
+
+
+def process_lesson(sink: queue.Queue, ds: DeepSeekClient, lib: ManualLibrary,
+                   lesson: dict, phases: list[str], counts: dict[str, int],
+                   tag: str, args: argparse.Namespace) -> tuple[int, int, int]:
+    """Toate fazele unei lecții cu un singur apel DeepSeek (multi-fază).
+
+    Teoria și instrucțiunile trec o singură dată prin prefill; fazele rămase
+    incomplete după apel sunt completate pe calea per-fază (generate_in_batches).
+    Returnează (generate, sărite, erori).
+    """
+    lid   = lesson["id"]
+    subj  = lesson["subject"]
+    grade = lesson["grade"]
+
+    needed: dict[str, int] = {}
+    skipped = 0
+    for phase in phases:
+        target = TARGET[phase]
+        have   = counts.get(phase, 0)
+        if have >= target and not args.force:
+            log.info("   %s %s: %d/%d ✅ skip", tag, phase, have, target)
+            skipped += 1
+            continue
+        needed[phase] = target - have
+        log.info("   %s %s: %d/%d — generez %d exerciții...",
+                 tag, phase, have, target, needed[phase])
+
+    if not needed:
+        return 0, skipped, 0
+    if args.dry_run:
+        log.info("   %s [DRY-RUN] ar genera %d exerciții", tag, sum(needed.values()))
+        return 0, skipped, 0
+
+    theory = get_theory_context(lib, lesson)
+    if not theory:
+        log.warning("   ⚠️  Nicio teorie disponibilă pentru %s cls%s, generez generic", subj, grade)
+
+    cache_dir  = None if args.no_cache else CACHE_DIR
+    cache_path = _cache_file(cache_dir, ds, lesson, "multi",
+                             json.dumps(needed, sort_keys=True), theory)
+    by_phase = _cache_load(cache_path)
+    if isinstance(by_phase, dict) and by_phase:
+        log.info("   %s → din cache: %d exerciții", tag, sum(len(v) for v in by_phase.values()))
+    else:
+        wait_for_cooldown(ds)
+        pace_calls()
+        by_phase = ds.generate_exercises_multiphase(
+            lesson_title  = lesson["title"],
+            grade         = grade,
+            subject       = subj,
+            theory        = theory,
+            counts        = needed,
+            chunk_context = theory,
+        )
+        if all(by_phase.get(ph) for ph in needed):
+            _cache_store(cache_path, by_phase)
 
-        if remaining > 0:
-            time.sleep(DELAY_BETWEEN_CALLS)
-
-    return all_exercises
+    generated = errors = 0
+    for phase, n in needed.items():
+        exercises = list(by_phase.get(phase) or [])[:n]
+        if exercises:
+            sink.put((lid, phase, exercises, tag))
+        got = len(exercises)
+        if got < n:
+            for batch in generate_in_batches(ds, lesson, theory, phase,
+                                             n - got, cache_dir):
+                sink.put((lid, phase, batch, tag))
+                got += len(batch)
+        if not got:
+            log.error("   %s ❌ DeepSeek nu a returnat exerciții pentru %s", tag, phase)
+            errors += 1
+            continue
+        generated += got
+        log.info("   %s ✅ %d/%d exerciții generate (%s)", tag, got, n, phase)
+
+    return generated, skipped, errors
 
 
 def run(args: argparse.Namespace) -> None:
@@ -113,88 +437,114 @@ def run(args: argparse.Namespace) -> None:
     ds  = DeepSeekClient()
     lib = ManualLibrary()
 
+    _theory_for.cache_clear()   # manualele se pot schimba între rulări
+    _theory_prefetch.clear()
+
     # Creștem timeout-ul (deepseek-r1:8B e lent la JSON structurat)
     ds.TIMEOUT_LONG = TIMEOUT_OVERRIDE
+    ds._adaptive_batch = BATCH_SIZE
 
     if not ds.available:
-        print("❌ DeepSeek indisponibil. Pornește Ollama: ollama serve")
+        log.error("❌ DeepSeek indisponibil. Pornește Ollama: ollama serve")
         sys.exit(1)
 
-    lessons = db.get_lessons(
-        grade=args.grade,
-        subject=args.subject,
-    )
-    print(f"📚 {len(lessons)} lecții găsite")
-
     phases = [args.phase] if args.phase else list(TARGET.keys())
-    total_added   = 0
-    total_skipped = 0
-    total_errors  = 0
-
-    for i, lesson in enumerate(lessons, 1):
-        lid   = lesson["id"]
-        title = lesson["title"]
-        subj  = lesson["subject"]
-        grade = lesson["grade"]
-        print(f"\n[{i}/{len(lessons)}] {subj} cls{grade}: {title}")
-
-        for phase in phases:
-            target   = TARGET[phase]
-            existing = db.get_exercises(lid, phase, count=30)
-            have     = len(existing)
-
-            if have >= target and not args.force:
-                print(f"   {phase}: {have}/{target} ✅ skip")
-                total_skipped += 1
+    n_lessons = db.count_lessons(grade=args.grade, subject=args.subject)
+    log.info("📚 %d lecții găsite", n_lessons)
+
+    # Lecțiile vin pe rând din cursor (nu toate în memorie), ordonate pe
+    # materie/clasă: workerii lucrează în același timp pe lecții cu același
+    # manual, deci prompturile lor încep cu același text (system + teorie) și
+    # Ollama refolosește KV-cache-ul prefixului.
+    if args.force:
+        todo = ((l, None) for l in db.iter_lessons(
+            grade=args.grade, subject=args.subject, by_subject=True))
+    else:
+        # Un singur SELECT cu LEFT JOIN: doar lecțiile cu faze sub țintă ies
+        # din SQLite — cele complete nu primesc nici job, nici parsare de manual
+        todo = db.iter_sparse_phases({ph: TARGET[ph] for ph in phases},
+                                     grade=args.grade, subject=args.subject,
+                                     by_subject=True)
+
+    workers = max(1, args.concurrency)
+    log.info("⚙️  %d worker(i) în paralel", workers)
+
+    # Un singur scriitor SQLite: workerii pun batch-urile în coadă și trec la
+    # următorul apel DeepSeek; coada mărginită frânează workerii dacă DB-ul
+    # rămâne în urmă.
+    sink: queue.Queue = queue.Queue(maxsize=2 * workers)
+    # added/errors: doar writer-ul; skipped/failed: callback-urile, sub lock
+    totals = {"added": 0, "errors": 0, "skipped": 0, "failed": 0, "lessons": 0}
+    totals_lock = threading.Lock()
+    writer = threading.Thread(target=db_writer, args=(db, sink, totals),
+                              name="db-writer", daemon=True)
+    writer.start()
+
+    # Cel mult 4 joburi per worker în așteptare: lecțiile citite din cursor
+    # nu se adună în coada pool-ului.
+    window = threading.BoundedSemaphore(4 * workers)
+
+    # Bara de progres (cu rich): un pas per job încheiat; totalul se află
+    # abia la finalul cursorului, până atunci bara e nedeterminată.
+    progress = Progress(transient=True) if Progress and not args.dry_run else None
+    task = progress.add_task("lecții", total=None) if progress else None
+
+    def on_done(fut, tag: str, what: str) -> None:
+        try:
+            _, skipped, errors = fut.result()
+        except Exception as e:
+            log.error("   %s ❌ %s: %s", tag, what, e)
+            skipped, errors = 0, 1
+        with totals_lock:
+            totals["skipped"] += skipped
+            totals["failed"]  += errors
+        if progress:
+            progress.advance(task)
+        window.release()
+
+    def submit(fn, tag: str, what: str, *fn_args) -> None:
+        window.acquire()
+        fut = pool.submit(fn, *fn_args)
+        fut.add_done_callback(lambda f: on_done(f, tag, what))
+
+    with progress or contextlib.nullcontext(), \
+         ThreadPoolExecutor(max_workers=1, thread_name_prefix="theory") as prefetch, \
+         ThreadPoolExecutor(max_workers=workers) as pool:
+        subject = None
+        for i, (lesson, have) in enumerate(todo, 1):
+            totals["lessons"] += 1
+            if lesson["subject"] != subject:
+                subject = lesson["subject"]
+                log.info("   • %s", subject)
+            if have is None:   # --force: numărăm doar pentru lecția curentă
+                have = db.get_exercise_counts_by_phase([lesson["id"]])[lesson["id"]]
+            if not args.dry_run:
+                prefetch_theory(prefetch, lib, [lesson])
+            tag = (f"[{i}/{n_lessons}] {lesson['subject']} "
+                   f"cls{lesson['grade']}: {lesson['title']} |")
+            if len(phases) > 1:
+                # un singur apel DeepSeek pentru toate fazele lecției
+                submit(process_lesson, tag, "/".join(phases),
+                       sink, ds, lib, lesson, phases, have, tag, args)
                 continue
-
-            needed = target - have
-            print(f"   {phase}: {have}/{target} — generez {needed} exerciții...")
-
-            if args.dry_run:
-                print(f"   [DRY-RUN] ar genera {needed} exerciții")
-                continue
-
-            theory = get_theory_context(lib, lesson)
-            if not theory:
-                print(f"   ⚠️  Nicio teorie disponibilă pentru {subj} cls{grade}, generez generic")
-
-            exercises = generate_in_batches(ds, lesson, theory, phase, needed)
-
-            if not exercises:
-                print(f"   ❌ DeepSeek nu a returnat exerciții pentru {phase}")
-                total_errors += 1
-                time.sleep(DELAY_BETWEEN_CALLS)
-                continue
-
-            inserted = 0
-            for ex in exercises:
-                try:
-                    db.add_exercise(
-                        lesson_id   = lid,
-                        enunt       = ex["enunt"],
-                        raspuns     = ex["raspuns"],
-                        phase       = phase,
-                        type        = "choice" if ex.get("choices") else "text",
-                        choices     = ex.get("choices"),
-                        hint1       = ex.get("hint1"),
-                        hint2       = ex.get("hint2"),
-                        hint3       = ex.get("hint3"),
-                        explicatie  = ex.get("explicatie"),
-                        dificultate = int(ex.get("dificultate", 1)),
-                    )
-                    inserted  += 1
-                    total_added += 1
-                except Exception as e:
-                    print(f"   ⚠️  Insert error: {e}")
-                    total_errors += 1
-
-            print(f"   ✅ {inserted}/{needed} exerciții inserate ({phase})")
-            time.sleep(DELAY_BETWEEN_CALLS)
-
-    print(f"\n{'='*55}")
-    print(f"TOTAL: {total_added} exerciții inserate | "
-          f"{total_skipped} faze sărite | {total_errors} erori")
+            for phase in phases:
+                submit(process_lesson_phase, tag, phase,
+                       sink, ds, lib, lesson, phase, have.get(phase, 0), tag, args)
+        if progress:
+            # un job per lecție: multi-fază, sau o singură fază (--phase)
+            progress.update(task, total=totals["lessons"])
+        if not args.force:
+            log.info("🔎 %d lecții au faze incomplete", totals["lessons"])
+
+    sink.put(None)   # workerii au terminat: writer-ul golește coada și iese
+    writer.join()
+    total_added   = totals["added"]
+    total_skipped = totals["skipped"]
+    total_errors  = totals["errors"] + totals["failed"]
+
+    log.info("\n%s", "=" * 55)
+    log.info("TOTAL: %d exerciții inserate | %d faze sărite | %d erori",
+             total_added, total_skipped, total_errors)
 
 
 if __name__ == "__main__":
@@ -220,5 +570,16 @@ Exemple:
                         help="Afișează ce ar genera fără a insera nimic")
     parser.add_argument("--force", action="store_true",
                         help="Re-generează chiar dacă există suficiente exerciții")
-
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Câte perechi lecție/fază se generează în paralel "
+                             f"(implicit {DEFAULT_CONCURRENCY}; nu depăși OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help=f"Nu citi/scrie generările din {CACHE_DIR}/")
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[RichHandler(show_time=False, show_level=False, show_path=False,
+                              markup=False)] if RichHandler else None,
+    )
     run(parser.parse_args())
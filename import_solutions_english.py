@@ -24,16 +24,36 @@ Utilizare:
   python import_solutions_english.py --dry-run            # preview fără inserare în DB
   python import_solutions_english.py --db mydb.db         # alt fișier de bază de date
 
-Cerințe:
-  pip install pywin32   (Microsoft Word trebuie instalat pe acest calculator)
+Cerințe (oricare dintre ele; în ordinea încercată):
+  pip install python-docx                      (.docx)
+  antiword                                     (.doc, Linux/macOS/Windows)
+  LibreOffice (soffice în PATH)                (.doc/.docx, headless)
+  pip install pywin32 + Microsoft Word         (ultimă soluție, Windows)
+Textul extras (.cache/docs/) și exercițiile parsate (.cache/parsed/) se cache-uiesc
+după sha1-ul fișierelor — re-rulările nu mai deschid și nu mai parsează DOC-urile.
 """
 
 import sys
+import os
 import re
 import json
+import shutil
+import hashlib
+import atexit
 import argparse
+import subprocess
+from collections import ChainMap
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# Motorul regex al parser-ului: modulul `regex` (C, mai rapid pe pattern-urile
+# cu alternanțe) dacă e instalat, altfel `re` din stdlib — pattern-urile de mai
+# jos sunt compatibile cu amândouă.
+try:
+    import regex as _rx
+except ImportError:
+    _rx = re
+
 sys.stdout.reconfigure(encoding='utf-8')
 
 # ── Căi de bază ───────────────────────────────────────────────────────────────
@@ -196,39 +216,173 @@ ENGLISH_SKILLS = [
     ("EN4_VOCAB",          "Limba Engleză", 9, "Vocabulary (Upper-Int)",  "Abstract nouns, collocations, formal register",     []),
 ]
 
-# ── DOC text extraction via Word COM ─────────────────────────────────────────
-_word_app = None   # singleton Word COM instance
+# ── Extragere text DOC ───────────────────────────────────────────────────────
+# Ordinea backend-urilor: python-docx (.docx) / antiword (.doc) → LibreOffice
+# headless → Word COM (ultimă soluție, doar Windows cu Word instalat).
+# Textul extras se păstrează în .cache/docs/<sha1>.txt și exercițiile parsate
+# în .cache/parsed/<sha1 test>_<sha1 cheie>.json (sha1 pe conținutul
+# fișierului), deci re-rulările nu mai deschid și nu mai parsează documentele
+# decât dacă un DOC s-a schimbat efectiv.
+try:
+    import docx as _docx            # python-docx
+except ImportError:
+    _docx = None
+
+DOC_CACHE_DIR = Path(".cache") / "docs"
+PARSED_CACHE_DIR = Path(".cache") / "parsed"
+# Crește la orice schimbare de parser care modifică rezultatul parse_test_pair
+PARSER_VERSION = 1
+_EXTRACT_TIMEOUT = 120              # secunde per fișier pentru antiword/soffice
+EXTRACT_WORKERS = 4                 # procese paralele în prefetch_doc_texts
+
+# cale → text, umplut de prefetch_doc_texts înainte de bucla pe unități
+_doc_texts: dict[str, str] = {}
+
+_word_app = None        # singleton Word COM instance
+_word_failed = False    # Word COM indisponibil → nu mai reîncercăm
+
 
 def _get_word():
-    global _word_app
-    if _word_app is None:
+    global _word_app, _word_failed
+    if _word_app is None and not _word_failed:
         try:
             import win32com.client
             _word_app = win32com.client.Dispatch("Word.Application")
             _word_app.Visible = False
             _word_app.DisplayAlerts = False
         except ImportError:
-            print("ERROR: pywin32 nu este instalat. Rulați: pip install pywin32")
-            sys.exit(1)
+            _word_failed = True
+            print("WARN: pywin32 nu este instalat — fără fallback Word COM")
         except Exception as e:
-            print(f"ERROR: Nu pot porni Word COM: {e}")
-            sys.exit(1)
+            _word_failed = True
+            print(f"WARN: Nu pot porni Word COM: {e}")
     return _word_app
 
 
-def extract_doc_text(path: str) -> str:
-    """Extrage textul dintr-un fișier .doc/.docx via Word COM."""
-    abs_path = str(Path(path).resolve())
+def _extract_docx(path: Path) -> str:
+    if _docx is None:
+        return ""
+    return "\n".join(p.text for p in _docx.Document(str(path)).paragraphs)
+
+
+def _extract_antiword(path: Path) -> str:
+    exe = shutil.which("antiword")
+    if not exe:
+        return ""
+    # -w 0: un paragraf per linie (fără wrap), ca la Word COM
+    p = subprocess.run([exe, "-m", "UTF-8.txt", "-w", "0", str(path)],
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                       timeout=_EXTRACT_TIMEOUT, check=False)
+    return p.stdout.decode("utf-8", errors="ignore") if p.returncode == 0 else ""
+
+
+def _extract_soffice(path: Path) -> str:
+    exe = shutil.which("soffice") or shutil.which("libreoffice")
+    if not exe:
+        return ""
+    p = subprocess.run([exe, "--headless", "--cat", str(path)],
+                       stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                       timeout=_EXTRACT_TIMEOUT, check=False)
+    return p.stdout.decode("utf-8", errors="ignore") if p.returncode == 0 else ""
+
+
+def _extract_word_com(path: Path) -> str:
     word = _get_word()
+    if word is None:
+        return ""
+    doc = word.Documents.Open(str(path.resolve()))
     try:
-        doc = word.Documents.Open(abs_path)
-        text = doc.Content.Text
+        return doc.Content.Text
+    finally:
         doc.Close(False)
-        return text
-    except Exception as e:
-        print(f"    WARN: Nu pot deschide {Path(path).name}: {e}")
+
+
+# (cale, mtime, mărime) → sha1 conținut: fiecare fișier e citit o singură dată per rulare
+_sha1_memo: dict[tuple, str] = {}
+
+
+def _file_sha1(path: Path) -> str:
+    st = path.stat()
+    memo_key = (str(path), st.st_mtime_ns, st.st_size)
+    h = _sha1_memo.get(memo_key)
+    if h is None:
+        h = _sha1_memo[memo_key] = hashlib.sha1(path.read_bytes()).hexdigest()
+    return h
+
+
+def _cache_write(cache: Path, data: bytes) -> None:
+    """Scriere atomică (tmp + os.replace); erorile de disc sunt ignorate."""
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_suffix(".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, cache)
+    except OSError:
+        pass
+
+
+def extract_doc_text(path: str) -> str:
+    """Extrage textul dintr-un fișier .doc/.docx (cu cache pe disc)."""
+    if path in _doc_texts:
+        return _doc_texts[path]
+    src = Path(path)
+    try:
+        cache = DOC_CACHE_DIR / f"{_file_sha1(src)}.txt"
+        if cache.exists():
+            return cache.read_bytes().decode("utf-8")
+    except OSError as e:
+        print(f"    WARN: Nu pot citi {src.name}: {e}")
         return ""
 
+    if src.suffix.lower() == ".docx":
+        backends = (_extract_docx, _extract_soffice, _extract_word_com)
+    else:
+        backends = (_extract_antiword, _extract_soffice, _extract_word_com)
+
+    text = ""
+    for backend in backends:
+        try:
+            text = backend(src)
+        except Exception as e:
+            print(f"    WARN: {backend.__name__} a eșuat pe {src.name}: {e}")
+            text = ""
+        if text.strip():
+            break
+    else:
+        print(f"    WARN: Nu pot extrage text din {src.name}")
+        return ""
+
+    _cache_write(cache, text.encode("utf-8"))
+    return text
+
+
+def _init_extract_worker() -> None:
+    """Initializer pentru ProcessPoolExecutor: Word-ul pornit de un proces
+    (la primul .doc care ajunge la fallback-ul COM) rămâne deschis pentru
+    fișierele următoare și se închide o singură dată, la ieșirea procesului."""
+    atexit.register(close_word)
+
+
+def prefetch_doc_texts(paths) -> None:
+    """Extrage în paralel (procese separate) toate fișierele unui nivel.
+
+    Fișierele sunt independente între ele, iar antiword/soffice/Word sunt
+    procese externe — EXTRACT_WORKERS extrageri simultane în loc de una câte
+    una. Rezultatele ajung în _doc_texts (și în cache-ul de pe disc), așa că
+    extract_doc_text din bucla pe unități nu mai așteaptă. La orice eroare a
+    pool-ului se revine la extragerea serială.
+    """
+    todo = list(dict.fromkeys(str(p) for p in paths
+                              if Path(p).exists() and str(p) not in _doc_texts))
+    if len(todo) < 2:
+        return
+    try:
+        with ProcessPoolExecutor(max_workers=min(EXTRACT_WORKERS, len(todo)),
+                                 initializer=_init_extract_worker) as ex:
+            _doc_texts.update(zip(todo, ex.map(extract_doc_text, todo)))
+    except Exception as e:
+        print(f"  WARN: extragere paralelă eșuată ({e}) — continui serial")
+
 
 def close_word():
     global _word_app
@@ -246,28 +400,34 @@ _SKIP = frozenset({"listening", "writing", "tapescript"})
 # Secțiuni de procesat
 _PROCESS = frozenset({"grammar", "vocabulary", "reading", "comprehension", "general"})
 
-# Regex pentru item numerotat: "3 My sister ___ tennis. (love)"
-_ITEM_RE = re.compile(r'^(\d{1,2})\s{1,4}(.{5,150})$')
-
-
-def _split_sections(raw_text: str) -> list[tuple[str, list[str]]]:
-    """Împarte textul în (section_name, [lines]) după header-uri de secțiune."""
-    # Word COM folosește \r ca separator de paragraf, uneori \n sau \x07
-    lines = re.split(r'[\r\n\x07\x0c]+', raw_text)
-
-    sections: list[tuple[str, list[str]]] = [("general", [])]
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        # Header detection: linie scurtă, doar litere și spații
-        if 3 <= len(stripped) <= 30 and re.match(r'^[A-Za-z &/]+$', stripped):
-            norm = stripped.lower().strip()
-            if norm in _SKIP or norm in _PROCESS:
-                sections.append((norm, []))
-                continue
-        sections[-1][1].append(stripped)
-    return sections
+# Un singur regex pe tot documentul, după ce separatorii de paragraf Word
+# (\r, \x07, \x0c) devin \n: o linie e fie header de secțiune ("Grammar"),
+# fie item numerotat ("3 My sister ___ tennis. (love)"); restul liniilor sunt
+# sărite de motorul regex. Spațiile de la capetele liniei rămân în afara
+# grupurilor — echivalent cu line.strip().
+_LINE_SEP_TABLE = str.maketrans({"\r": "\n", "\x07": "\n", "\x0c": "\n"})
+_SCAN_RE = _rx.compile(
+    r'^[^\S\n]*(?:'
+    r'(?P<head>[A-Za-z&/][A-Za-z &/]{1,28}[A-Za-z&/])'
+    r'|(?P<num>\d{1,2})[^\S\n]{1,4}(?P<text>.{4,149}\S)'
+    r')[^\S\n]*$',
+    _rx.MULTILINE,
+)
+# Prima variantă de răspuns din cheie: "went / go", "went or go" → "went"
+_FIRST_ALT_RE   = _rx.compile(r'(.*?)(?:\s*/|\s+(?i:or)\s+|$)')
+# Adnotări de punctaj: "(7 marks)"
+_MARKS_RE       = _rx.compile(r'\(\d+\s*marks?\)')
+# _clean_enunt: blank-uri | "(7 marks)" cu spațiile din jur | whitespace
+_CLEAN_RE       = _rx.compile(r'(_{2,})|(\s*(?:\(\d+\s*marks?\)\s*)+)|\s+')
+
+
+def _clean_repl(m: re.Match) -> str:
+    if m.group(1):
+        return '___'                                # normalizează blank-uri
+    marks = m.group(2)
+    if marks:                                       # elimină "(7 marks)"
+        return ' ' if _MARKS_RE.sub('', marks) else ''
+    return ' '                                      # whitespace redundant
 
 
 # Cuvinte care indică linie de instrucțiune (nu exercițiu)
@@ -280,86 +440,140 @@ _INSTR_WORDS = frozenset({
 
 
 def _is_instruction(text: str) -> bool:
-    words = text.lower().split()
-    return bool(words) and words[0] in _INSTR_WORDS and len(words) < 18
-
-
-def _extract_items(sections: list[tuple[str, list[str]]],
-                   skip_skip_secs: bool) -> list[tuple[str, int, str]]:
-    """Returnează (section, num, text) pentru fiecare item numerotat găsit."""
+    # Doar primul cuvânt (maxsplit=1, lower pe el singur); numărătoarea
+    # completă de cuvinte rulează doar pentru candidații reali
+    head = text.split(None, 1)
+    if not head or head[0].lower() not in _INSTR_WORDS:
+        return False
+    return len(text.split()) < 18
+
+
+def _scan_doc(raw_text: str, skip_skip_secs: bool = False) -> list[tuple[str, int, str]]:
+    """Returnează (section, num, text) pentru fiecare item numerotat găsit.
+
+    O singură trecere peste document: secțiunea curentă e urmărită din
+    header-ele întâlnite de același finditer care găsește item-urile.
+    Cu skip_skip_secs, item-urile din secțiunile _SKIP (listening, writing,
+    tapescript) nu sunt construite deloc; cheia le păstrează, fiindcă
+    fallback-ul pe num din _find_answer ține cont de ele.
+    """
     items = []
-    for sec_name, lines in sections:
-        if skip_skip_secs and sec_name in _SKIP:
+    section = "general"
+    recording = True
+    for m in _SCAN_RE.finditer(raw_text.translate(_LINE_SEP_TABLE)):
+        head = m.group("head")
+        if head is not None:
+            norm = head.lower()
+            if norm in _SKIP or norm in _PROCESS:
+                # Internat: toate tuplurile (section, num, text) împart același
+                # obiect, iar comparațiile din _hints / _SKIP ies pe identitate
+                section = sys.intern(norm)
+                recording = not (skip_skip_secs and section in _SKIP)
+            continue
+        if not recording:
+            continue
+        num = int(m.group("num"))
+        if num > 40:
             continue
-        for line in lines:
-            m = _ITEM_RE.match(line)
-            if not m:
-                continue
-            num = int(m.group(1))
-            text = m.group(2).strip()
-            if num > 40 or _is_instruction(text):
-                continue
-            items.append((sec_name, num, text))
+        # grupul se termină mereu în \S → doar capătul din stânga are spații
+        text = m.group("text").lstrip()
+        if _is_instruction(text):
+            continue
+        items.append((section, num, text))
     return items
 
 
-def _build_key_dict(key_sections: list[tuple[str, list[str]]]) -> dict:
-    """Construiește dict (section, num) → answer_text din textul cheii."""
+def _build_key_dict(key_items: list[tuple[str, int, str]]) -> dict:
+    """Construiește dict (section, num) → answer_text din item-urile cheii."""
     key_dict: dict[tuple, str] = {}
-    for sec, num, text in _extract_items(key_sections, skip_skip_secs=False):
+    for sec, num, text in key_items:
         k = (sec, num)
         if k in key_dict:
             continue
-        # Ia primul fragment (înainte de / sau ,)
-        answer = re.split(r'\s*/\s*|\s*(or|OR)\s*', text)[0].strip()
-        # Elimină adnotări de punctaj
-        answer = re.sub(r'\(\d+\s*marks?\)', '', answer).strip()
+        # Ia primul fragment (înainte de / sau or). Item-ul vine deja fără
+        # spații la capete, iar separatorii își înghit spațiile din stânga,
+        # deci fragmentul nu mai are nevoie de strip().
+        answer = _FIRST_ALT_RE.match(text).group(1)
+        # Elimină adnotări de punctaj (regex-ul rulează doar dacă are ce găsi)
+        if "(" in answer:
+            answer = _MARKS_RE.sub('', answer).strip()
         answer = answer.strip(' .,;')
         if answer and len(answer) <= 80:
             key_dict[k] = answer
     return key_dict
 
 
-def _find_answer(key_dict: dict, section: str, num: int) -> str | None:
-    """Caută răspunsul în cheie — mai întâi exact, apoi fallback pe num."""
+def _index_by_num(key_dict: dict) -> dict[int, set[str]]:
+    """Index num → secțiunile din cheie care au un răspuns pentru acel num."""
+    by_num: dict[int, set[str]] = {}
+    for sec, num in key_dict:
+        by_num.setdefault(num, set()).add(sec)
+    return by_num
+
+
+def _find_answer(key_dict: dict, by_num: dict, section: str, num: int) -> str | None:
+    """Caută răspunsul în cheie — mai întâi exact, apoi fallback pe num.
+
+    by_num vine din _index_by_num(key_dict), construit o dată per cheie.
+    """
     if (section, num) in key_dict:
         return key_dict[(section, num)]
     # Fallback: dacă există un singur răspuns pentru acest num
-    matches = {k: v for k, v in key_dict.items() if k[1] == num}
-    if len(matches) == 1:
-        return next(iter(matches.values()))
+    secs = by_num.get(num, ())
+    if len(secs) == 1:
+        return key_dict[(next(iter(secs)), num)]
     return None
 
 
 def _clean_enunt(text: str) -> str:
-    text = re.sub(r'_{2,}', '___', text)           # normalizează blank-uri
-    text = re.sub(r'\(\d+\s*marks?\)', '', text)    # elimină "(7 marks)"
-    text = re.sub(r'\s+', ' ', text).strip(' .,')   # whitespace redundant
-    return text
+    """Normalizează blank-urile, elimină "(7 marks)" și whitespace-ul redundant.
+
+    O singură trecere cu _CLEAN_RE în loc de trei re.sub succesive.
+    """
+    return _CLEAN_RE.sub(_clean_repl, text).strip(' .,')
+
+
+def _fingerprint(enunt: str) -> tuple[int, int]:
+    """Amprentă pentru deduplicare: (lungime, hash pe forma lowercase).
+
+    Setul de „văzute” ține două int-uri per enunț în loc de o copie
+    lowercase a textului; lungimea face coliziunile practic imposibile.
+    """
+    return len(enunt), hash(enunt.lower())
 
 
 def parse_test_pair(test_path: str, key_path: str) -> list[dict]:
     """Parsează o pereche (test.doc, key.doc) → listă de exerciții.
 
     Returnează dicts cu cheile: enunt, raspuns, section, dificultate.
+    Rezultatul e memorat pe disc după sha1-ul celor două fișiere.
     """
+    try:
+        cache = PARSED_CACHE_DIR / (f"{_file_sha1(Path(test_path))}_"
+                                    f"{_file_sha1(Path(key_path))}_v{PARSER_VERSION}.json")
+    except OSError:
+        cache = None
+    if cache is not None and cache.exists():
+        try:
+            return json.loads(cache.read_bytes())
+        except (OSError, ValueError):
+            pass    # intrare coruptă → re-parsăm și o rescriem
+
     test_text = extract_doc_text(test_path)
     key_text  = extract_doc_text(key_path)
 
     if not test_text or not key_text:
         return []
 
-    test_secs = _split_sections(test_text)
-    key_secs  = _split_sections(key_text)
-
-    test_items = _extract_items(test_secs, skip_skip_secs=True)
-    key_dict   = _build_key_dict(key_secs)
+    test_items = _scan_doc(test_text, skip_skip_secs=True)
+    key_dict   = _build_key_dict(_scan_doc(key_text))
+    by_num     = _index_by_num(key_dict)
 
     exercises: list[dict] = []
-    seen_enunts: set[str] = set()
+    seen_enunts: set[tuple[int, int]] = set()
 
     for sec, num, enunt_raw in test_items:
-        answer = _find_answer(key_dict, sec, num)
+        answer = _find_answer(key_dict, by_num, sec, num)
         if not answer:
             continue
 
@@ -368,7 +582,7 @@ def parse_test_pair(test_path: str, key_path: str) -> list[dict]:
             continue
 
         # Deduplicare
-        key = enunt.lower()
+        key = _fingerprint(enunt)
         if key in seen_enunts:
             continue
         seen_enunts.add(key)
@@ -383,6 +597,8 @@ def parse_test_pair(test_path: str, key_path: str) -> list[dict]:
             "dificultate": diff,
         })
 
+    if cache is not None and exercises:
+        _cache_write(cache, json.dumps(exercises, ensure_ascii=False).encode("utf-8"))
     return exercises
 
 
@@ -412,14 +628,13 @@ def _hints(section: str, grammar_topic: str) -> tuple[str, str, str]:
 # ── Inserare în DB ────────────────────────────────────────────────────────────
 def ensure_english_skills(db):
     """Inserează (INSERT OR IGNORE) toate skill codes pentru engleză."""
-    for code, subj, grade, name, desc, prereq in ENGLISH_SKILLS:
-        db.conn.execute(
-            """INSERT OR IGNORE INTO skills
-               (code, subject, grade, name, description, prereq_codes)
-               VALUES (?,?,?,?,?,?)""",
-            (code, subj, grade, name, desc, json.dumps(prereq)),
-        )
-    db.conn.commit()
+    db.conn.executemany(
+        """INSERT OR IGNORE INTO skills
+           (code, subject, grade, name, description, prereq_codes)
+           VALUES (?,?,?,?,?,?)""",
+        [(code, subj, grade, name, desc, json.dumps(prereq))
+         for code, subj, grade, name, desc, prereq in ENGLISH_SKILLS],
+    )
     print(f"  Skills: {len(ENGLISH_SKILLS)} English skill codes OK")
 
 
@@ -438,33 +653,76 @@ def _get_or_create_lesson(db, title: str, subject: str, grade: int,
            VALUES (?,?,?,?,?,?,?)""",
         (title, subject, grade, unit, 1, theory, summary),
     )
-    db.conn.commit()
     return int(cur.lastrowid)
 
 
+_EXERCISE_COLUMNS = ("lesson_id", "type", "phase", "enunt", "raspuns", "hint1", "hint2",
+                     "hint3", "explicatie", "dificultate", "skill_codes", "enunt_hash")
+
+
 def _insert_exercises(db, lesson_id: int, exercises: list[dict],
                        phase: str, skill_codes: list[str],
                        grammar_topic: str, dry_run: bool) -> int:
-    """Inserează exerciții în DB. Returnează numărul inserat."""
-    count = 0
+    """Inserează exerciții în DB. Returnează numărul inserat.
+
+    Rândurile se construiesc în Python și intră printr-un singur executemany
+    (un statement pregătit, legat de N ori) în tranzacția deschisă de main().
+    Enunțurile deja prezente pentru (lecție, fază) — inclusiv rândurile vechi
+    fără enunt_hash — sunt sărite de Database.insert_new_exercises, deci
+    re-rularea importului nu dublează exercițiile.
+    """
+    from database import enunt_hash
+    skills_json = json.dumps(skill_codes) if skill_codes else None
+    # Hint-urile depind doar de secțiune → calculate o dată per apel
+    hints_by_section = {sec: _hints(sec, grammar_topic)
+                        for sec in ("vocabulary", "reading", "comprehension", "grammar", "general")}
+    default_hints = hints_by_section["grammar"]
+    short_topic = grammar_topic[:50]
+    rows = []
     for ex in exercises:
-        h1, h2, h3 = _hints(ex["section"], grammar_topic)
-        expl = f"Correct answer: {ex['raspuns']}. ({grammar_topic[:50]})"
-        if not dry_run:
-            db.add_exercise(
-                lesson_id=lesson_id,
-                phase=phase,
-                enunt=ex["enunt"],
-                raspuns=ex["raspuns"],
-                hint1=h1,
-                hint2=h2,
-                hint3=h3,
-                explicatie=expl,
-                dificultate=ex.get("dificultate", 2),
-                skill_codes=skill_codes,
-            )
-        count += 1
-    return count
+        h1, h2, h3 = hints_by_section.get(ex["section"], default_hints)
+        expl = f"Correct answer: {ex['raspuns']}. ({short_topic})"
+        rows.append((
+            int(lesson_id), "text", phase, ex["enunt"], ex["raspuns"],
+            h1, h2, h3, expl, int(ex.get("dificultate", 2)), skills_json,
+            enunt_hash(ex["enunt"]),
+        ))
+    if dry_run or not rows:
+        return len(rows)
+    return db.insert_new_exercises(_EXERCISE_COLUMNS, rows)
+
+
+class _DryRunDB:
+    """Înlocuitor de Database pentru --dry-run: nu deschide SQLite deloc.
+
+    Joacă atât rolul conexiunii (db.conn) cât și al cursorului: SELECT-urile
+    nu găsesc nimic, iar fiecare INSERT primește un lastrowid fictiv nou,
+    deci _get_or_create_lesson „creează” lecții fără să scrie nimic.
+    """
+    in_transaction = False
+
+    def __init__(self):
+        self.lastrowid = 0
+        self.rowcount = 0
+
+    @property
+    def conn(self):
+        return self
+
+    def execute(self, sql, params=()):
+        self.lastrowid += 1
+        return self
+
+    def executemany(self, sql, rows):
+        return self
+
+    def fetchone(self):
+        return None
+
+    def commit(self):
+        pass
+
+    rollback = close = commit
 
 
 # ── Import Elementary ─────────────────────────────────────────────────────────
@@ -481,9 +739,19 @@ def import_elementary(db, dry_run: bool = False) -> tuple[int, int]:
 
     total_lessons = total_exercises = 0
 
+    prefetch_doc_texts(
+        f for unit in range(1, 11) for f in (
+            prog / f"sol_elem_progresstest_{unit}.doc",
+            prog / f"sol_elem_progresstest_{unit}_key.doc",
+            short / f"sol_elem_shorttest_{unit:02d}.doc",
+            short / f"sol_elem_shorttest_{unit:02d}_key.doc",
+        )
+    )
+
     for unit in range(1, 11):
         title  = ELEM_UNITS[unit]
         theory = ELEM_THEORY[unit]
+        topic  = theory[:80]
         skills = ELEM_SKILLS[unit]
 
         print(f"  Unit {unit:2d}: {title}")
@@ -499,8 +767,8 @@ def import_elementary(db, dry_run: bool = False) -> tuple[int, int]:
         if pt.exists() and ptk.exists():
             exs = parse_test_pair(str(pt), str(ptk))
             mid = max(1, len(exs) * 2 // 3)
-            n = _insert_exercises(db, lesson_id, exs[:mid],  "practice", skills, theory[:80], dry_run)
-            m = _insert_exercises(db, lesson_id, exs[mid:],  "posttest", skills, theory[:80], dry_run)
+            n = _insert_exercises(db, lesson_id, exs[:mid],  "practice", skills, topic, dry_run)
+            m = _insert_exercises(db, lesson_id, exs[mid:],  "posttest", skills, topic, dry_run)
             print(f"          progress: {n} practice + {m} posttest")
             total_exercises += n + m
         else:
@@ -511,7 +779,7 @@ def import_elementary(db, dry_run: bool = False) -> tuple[int, int]:
         stk = short / f"sol_elem_shorttest_{unit:02d}_key.doc"
         if st.exists() and stk.exists():
             exs = parse_test_pair(str(st), str(stk))
-            n = _insert_exercises(db, lesson_id, exs, "pretest", skills, theory[:80], dry_run)
+            n = _insert_exercises(db, lesson_id, exs, "pretest", skills, topic, dry_run)
             print(f"          short:    {n} pretest")
             total_exercises += n
         else:
@@ -540,6 +808,8 @@ def import_pre_intermediate(db, dry_run: bool = False) -> tuple[int, int]:
         print("  WARN: fișierele DOC Pre-Int lipsesc")
         return 0, 0
 
+    prefetch_doc_texts([test_file, key_file])
+
     theory = (
         "Pre-Intermediate grammar covers: past continuous (was/were + -ing), "
         "modal verbs (can/could/must/should), future (will / going to), "
@@ -547,6 +817,7 @@ def import_pre_intermediate(db, dry_run: bool = False) -> tuple[int, int]:
         "present perfect continuous (have/has been + -ing), "
         "passive voice (be + past participle)."
     )
+    topic   = theory[:80]
     skills  = ["EN2_PAST_CONT", "EN2_MODALS", "EN2_FUTURE", "EN2_COND_1", "EN2_VOCAB"]
 
     lesson_id = _get_or_create_lesson(
@@ -556,8 +827,8 @@ def import_pre_intermediate(db, dry_run: bool = False) -> tuple[int, int]:
 
     exs = parse_test_pair(str(test_file), str(key_file))
     mid = max(1, len(exs) * 2 // 3)
-    n = _insert_exercises(db, lesson_id, exs[:mid], "practice", skills, theory[:80], dry_run)
-    m = _insert_exercises(db, lesson_id, exs[mid:], "posttest", skills, theory[:80], dry_run)
+    n = _insert_exercises(db, lesson_id, exs[:mid], "practice", skills, topic, dry_run)
+    m = _insert_exercises(db, lesson_id, exs[mid:], "posttest", skills, topic, dry_run)
     print(f"  Pre-Int: {n} practice + {m} posttest")
 
     return 1, n + m
@@ -579,15 +850,21 @@ def import_upper_intermediate(db, dry_run: bool = False) -> tuple[int, int]:
         # try without double space
         key_file = folder / "Sol Upper Int short tests answer key.doc"
 
+    prefetch_doc_texts(
+        [key_file] + [folder / f"Sol Upper Int tests short tests unit {unit}.doc"
+                      for unit in range(1, 11)]
+    )
+
     key_text = extract_doc_text(str(key_file)) if key_file.exists() else ""
     if not key_text:
         print("  WARN: Upper-Int answer key lipsă sau nu poate fi citit")
         # Proceed without a global key — individual unit files may still work
-        key_secs = []
+        key_items = []
     else:
-        key_secs = _split_sections(key_text)
+        key_items = _scan_doc(key_text)
 
-    global_key_dict = _build_key_dict(key_secs)
+    global_key_dict = _build_key_dict(key_items)
+    global_by_num   = _index_by_num(global_key_dict)
 
     total_lessons = total_exercises = 0
 
@@ -595,6 +872,7 @@ def import_upper_intermediate(db, dry_run: bool = False) -> tuple[int, int]:
         title  = UPINT_TITLES.get(unit, f"Unit {unit}")
         skills = UPINT_SKILLS.get(unit, ["EN4_VOCAB"])
         theory = f"Upper-Intermediate Unit {unit}: {title}. Advanced grammar and vocabulary."
+        topic  = theory[:80]
 
         print(f"  Unit {unit:2d}: {title}")
 
@@ -608,29 +886,41 @@ def import_upper_intermediate(db, dry_run: bool = False) -> tuple[int, int]:
         if st.exists():
             test_text = extract_doc_text(str(st))
             if test_text:
-                test_secs  = _split_sections(test_text)
-                test_items = _extract_items(test_secs, skip_skip_secs=True)
+                # O singură scanare servește și cheia locală (care include
+                # secțiunile _SKIP) și item-urile de test (fără ele)
+                all_items  = _scan_doc(test_text)
+                test_items = [it for it in all_items if it[0] not in _SKIP]
 
                 # Combină cheia globală cu cea din fișierul de test (dacă există și în el răspunsuri)
-                local_key  = _build_key_dict(test_secs)
-                combined_key = {**global_key_dict, **local_key}
+                local_key  = _build_key_dict(all_items)
+                # ChainMap: cheia locală are prioritate, fără copie a celei globale;
+                # în index se copiază doar num-urile locale (reunite cu globalul)
+                combined_key = ChainMap(local_key, global_key_dict)
+                combined_by_num = ChainMap(
+                    {n: secs | global_by_num.get(n, set())
+                     for n, secs in _index_by_num(local_key).items()},
+                    global_by_num,
+                )
 
                 exs: list[dict] = []
-                seen: set[str] = set()
+                seen: set[tuple[int, int]] = set()
                 for sec, num, raw in test_items:
-                    answer = _find_answer(combined_key, sec, num)
+                    answer = _find_answer(combined_key, combined_by_num, sec, num)
                     if not answer:
                         continue
                     enunt = _clean_enunt(raw)
-                    if len(enunt) < 8 or enunt.lower() in seen:
+                    if len(enunt) < 8:
                         continue
-                    seen.add(enunt.lower())
+                    fp = _fingerprint(enunt)
+                    if fp in seen:
+                        continue
+                    seen.add(fp)
                     exs.append({"enunt": enunt, "raspuns": answer,
                                 "section": sec, "dificultate": 3})
 
                 mid = max(1, len(exs) * 2 // 3)
-                n = _insert_exercises(db, lesson_id, exs[:mid], "practice", skills, theory[:80], dry_run)
-                m = _insert_exercises(db, lesson_id, exs[mid:], "posttest", skills, theory[:80], dry_run)
+                n = _insert_exercises(db, lesson_id, exs[:mid], "practice", skills, topic, dry_run)
+                m = _insert_exercises(db, lesson_id, exs[mid:], "posttest", skills, topic, dry_run)
                 print(f"          {n} practice + {m} posttest")
                 total_exercises += n + m
         else:
@@ -668,33 +958,60 @@ def main():
     print(f"  Dry-run: {args.dry_run}")
     print("=" * 60)
 
-    from database import Database
-    db = Database(args.db)
+    if args.dry_run:
+        # Preview fără I/O pe DB: merge și fără un fișier .db scriibil
+        db = _DryRunDB()
+    else:
+        from database import Database
+        db = Database(args.db)
 
-    ensure_english_skills(db)
+    if not args.dry_run:
+        # journal_mode=WAL + synchronous=NORMAL le setează deja Database;
+        # pentru import adăugăm cache mare de pagini, temp în RAM și mmap.
+        db.conn.execute("PRAGMA cache_size=-65536")     # 64 MB page cache
+        db.conn.execute("PRAGMA temp_store=MEMORY")
+        db.conn.execute("PRAGMA mmap_size=268435456")   # 256 MB mmap
 
     total_l = total_e = 0
 
-    if args.level in ("all", "elementary"):
-        print("\n── Elementary (grade 6, A1-A2) ──────────────────────────")
-        l, e = import_elementary(db, args.dry_run)
-        total_l += l; total_e += e
-        print(f"  → {l} lecții, {e} exerciții")
-
-    if args.level in ("all", "pre-intermediate"):
-        print("\n── Pre-Intermediate (grade 7, A2-B1) ───────────────────")
-        l, e = import_pre_intermediate(db, args.dry_run)
-        total_l += l; total_e += e
-        print(f"  → {l} lecții, {e} exerciții")
-
-    if args.level in ("all", "upper-intermediate"):
-        print("\n── Upper-Intermediate (grade 9, B2-C1) ─────────────────")
-        l, e = import_upper_intermediate(db, args.dry_run)
-        total_l += l; total_e += e
-        print(f"  → {l} lecții, {e} exerciții")
-
-    close_word()
-    db.close()
+    # O singură tranzacție pentru tot importul: skills, lecții și exerciții
+    # ajung pe disc cu un singur commit (un fsync), nu unul per rând.
+    # lastrowid din _get_or_create_lesson e vizibil pe aceeași conexiune
+    # înainte de commit. La --dry-run sau la eroare → ROLLBACK.
+    if db.conn.in_transaction:
+        db.conn.commit()
+    db.conn.execute("BEGIN IMMEDIATE")
+    try:
+        ensure_english_skills(db)
+
+        if args.level in ("all", "elementary"):
+            print("\n── Elementary (grade 6, A1-A2) ──────────────────────────")
+            l, e = import_elementary(db, args.dry_run)
+            total_l += l; total_e += e
+            print(f"  → {l} lecții, {e} exerciții")
+
+        if args.level in ("all", "pre-intermediate"):
+            print("\n── Pre-Intermediate (grade 7, A2-B1) ───────────────────")
+            l, e = import_pre_intermediate(db, args.dry_run)
+            total_l += l; total_e += e
+            print(f"  → {l} lecții, {e} exerciții")
+
+        if args.level in ("all", "upper-intermediate"):
+            print("\n── Upper-Intermediate (grade 9, B2-C1) ─────────────────")
+            l, e = import_upper_intermediate(db, args.dry_run)
+            total_l += l; total_e += e
+            print(f"  → {l} lecții, {e} exerciții")
+    except BaseException:
+        db.conn.rollback()
+        raise
+    else:
+        if args.dry_run:
+            db.conn.rollback()
+        else:
+            db.conn.commit()
+    finally:
+        close_word()
+        db.close()
 
     print("\n" + "=" * 60)
     print(f"TOTAL: {total_l} lecții, {total_e} exerciții importate")
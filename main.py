@@ -758,6 +758,8 @@ class MainWindow(QMainWindow):
                 ew._mic_ctrl.cleanup()
         self.attention.stop()
         self.tts.stop()
+        # Opreste stream-urile DeepSeek in curs (altfel iesirea asteapta generarea)
+        self.deepseek.close()
         self.db.close()
         event.accept()
 